@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Autosave
+========================
+Fasst schnell aufeinanderfolgende Änderungen zusammen und schreibt die
+Framework-Datei in einem Hintergrund-Thread. Geschrieben wird atomar
+(temporäre Datei + os.replace), sodass nach einem Absturz immer der letzte
+vollständige Stand auf der Platte liegt.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def atomic_write_text(path: Path, text: str, backup: bool = True):
+    """Schreibt eine Datei atomar; der vorherige Stand bleibt als .bak erhalten"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+    if backup and path.exists():
+        backup_path = path.with_name(path.name + ".bak")
+        try:
+            if backup_path.exists():
+                backup_path.unlink()
+            # Harter Link: kostet keine Kopie, die Hauptdatei existiert durchgehend
+            os.link(path, backup_path)
+        except OSError:
+            pass
+
+    os.replace(tmp_path, path)
+
+
+def recovery_candidates(path: Path):
+    """Dateien, aus denen nach einem Absturz geladen werden kann (in dieser Reihenfolge)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        # Unvollständiger Schreibvorgang, wird nie geladen
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return [path, path.with_name(path.name + ".bak")]
+
+
+class AutosaveScheduler:
+    """Debounced Autosave: schreibt erst, wenn für `delay` Sekunden Ruhe war
+
+    Spätestens nach `max_delay` Sekunden wird trotzdem geschrieben, damit
+    Dauer-Bearbeitung nicht unbegrenzt ungespeichert bleibt.
+    """
+
+    def __init__(self, write: Callable[[], None], delay: float = 1.0, max_delay: float = 10.0):
+        self.write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._first_change: Optional[float] = None
+        self._last_change: Optional[float] = None
+        self._stopped = False
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self):
+        """Merkt eine Änderung vor (kehrt sofort zurück)"""
+        with self._condition:
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_change = now
+            self._dirty = True
+            self._last_change = now
+            self._condition.notify()
+
+    def _deadline(self) -> float:
+        return min(self._last_change + self.delay, self._first_change + self.max_delay)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._dirty:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                remaining = self._deadline() - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+            self._write_now()
+
+    def _write_now(self):
+        with self._write_lock:
+            with self._condition:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            try:
+                self.write()
+                self.writes += 1
+            except Exception as e:
+                print(f"Fehler beim automatischen Speichern: {e}")
+                self.mark_dirty()
+
+    def flush(self):
+        """Schreibt ausstehende Änderungen sofort (blockierend)"""
+        self._write_now()
+
+    def stop(self, flush: bool = True):
+        """Beendet den Hintergrund-Thread (schreibt vorher ausstehende Änderungen)"""
+        if flush:
+            self.flush()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Kategorie-Klassifikator
+=======================================
+Multinomialer Naive Bayes über gehashte Wortstämme, trainiert auf den Items,
+die bereits in den Kategorien liegen. Das Modell besteht nur aus Zählern und
+lässt sich deshalb bei jeder Änderung exakt nachführen (Hinzufügen und
+Entfernen). Mit numpy werden viele Texte auf einmal vektorisiert klassifiziert,
+ohne numpy Text für Text.
+"""
+
+import math
+import zlib
+from typing import Dict, List, Any, Optional, Tuple
+
+from codebook_model import is_item_list
+from codebook_search import tokenize, item_texts, stem
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist optional
+    np = None
+
+FEATURE_BITS = 16
+SMOOTHING = 0.1
+MIN_TRAINING_ITEMS = 6
+SKIP_CATEGORIES = ("meta", "category_meta", "unknown")
+# Füllwörter tragen nichts zur Kategorie bei (Fragewörter bleiben erhalten)
+STOPWORDS = frozenset("""
+    der die das den dem des ein eine einen einem einer eines und oder aber mit von
+    fuer auf aus bei nach zum zur ist sind wird werden hat haben sich auch als
+    noch nur the and for with
+""".split())
+
+
+def hashed_features(text: str, bits: int = FEATURE_BITS) -> Dict[int, int]:
+    """Häufigkeit je gehashtem Wortstamm"""
+    mask = (1 << bits) - 1
+    counts: Dict[int, int] = {}
+    for token in tokenize(text):
+        if len(token) > 2 and token not in STOPWORDS:
+            feature = zlib.crc32(stem(token).encode("utf-8")) & mask
+            counts[feature] = counts.get(feature, 0) + 1
+    return counts
+
+
+class CategoryClassifier:
+    """Naive Bayes, inkrementell über learn/unlearn trainiert"""
+
+    def __init__(self, bits: int = FEATURE_BITS, smoothing: float = SMOOTHING):
+        self.bits = bits
+        self.smoothing = smoothing
+        self._feature_counts: Dict[str, Dict[int, int]] = {}
+        self._token_totals: Dict[str, int] = {}
+        self._document_counts: Dict[str, int] = {}
+        self._vocabulary: Dict[int, int] = {}
+        # Vorberechnete Log-Wahrscheinlichkeiten (numpy), bei Änderungen verworfen
+        self._model: Optional[Tuple[List[str], Any, Any]] = None
+
+    @classmethod
+    def from_framework(cls, framework_data: Dict[str, Any]) -> "CategoryClassifier":
+        classifier = cls()
+        for category, items in _trainable_categories(framework_data):
+            for item in items:
+                classifier.learn(category, item)
+        return classifier
+
+    @property
+    def categories(self) -> List[str]:
+        return [category for category, count in self._document_counts.items() if count > 0]
+
+    @property
+    def training_size(self) -> int:
+        return sum(self._document_counts.values())
+
+    def is_ready(self) -> bool:
+        """Genug Trainingsdaten für eine sinnvolle Vorhersage?"""
+        return len(self.categories) >= 2 and self.training_size >= MIN_TRAINING_ITEMS
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def learn(self, category: str, item: Any, weight: int = 1):
+        """Nimmt ein Item in das Modell auf (weight=-1 entfernt es wieder)"""
+        if category in SKIP_CATEGORIES:
+            return
+        features = hashed_features(" ".join(item_texts(item)), self.bits)
+        counts = self._feature_counts.setdefault(category, {})
+        for feature, count in features.items():
+            counts[feature] = counts.get(feature, 0) + weight * count
+            if counts[feature] <= 0:
+                del counts[feature]
+            self._vocabulary[feature] = self._vocabulary.get(feature, 0) + weight
+            if self._vocabulary[feature] <= 0:
+                del self._vocabulary[feature]
+        self._token_totals[category] = self._token_totals.get(category, 0) + weight * sum(features.values())
+        self._document_counts[category] = self._document_counts.get(category, 0) + weight
+        self._model = None
+
+    def unlearn(self, category: str, item: Any):
+        self.learn(category, item, weight=-1)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener für den CodebookLIFEAssistant"""
+        if action == "add":
+            self.learn(category, new_item)
+        elif action == "update":
+            self.unlearn(category, old_item)
+            self.learn(category, new_item)
+        elif action == "delete":
+            self.unlearn(category, old_item)
+        elif action == "remove_category" and isinstance(old_item[0], list):
+            for item in old_item[0]:
+                self.unlearn(category, item)
+        elif action == "restore_category" and isinstance(new_item[0], list):
+            for item in new_item[0]:
+                self.learn(category, item)
+
+    # ------------------------------------------------------------------
+    # Vorhersage
+    # ------------------------------------------------------------------
+
+    def _log_prior(self, category: str) -> float:
+        return math.log(self._document_counts[category] / self.training_size)
+
+    def _denominator(self, category: str) -> float:
+        return self._token_totals[category] + self.smoothing * (len(self._vocabulary) + 1)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Log-Posterior (bis auf eine Konstante) je Kategorie, leer ohne bekannte Wörter"""
+        features = {feature: count for feature, count in hashed_features(text, self.bits).items()
+                    if feature in self._vocabulary}
+        if not features:
+            return {}
+        result = {}
+        for category in self.categories:
+            counts = self._feature_counts[category]
+            denominator = self._denominator(category)
+            score = self._log_prior(category)
+            for feature, count in features.items():
+                score += count * math.log((counts.get(feature, 0) + self.smoothing) / denominator)
+            result[category] = score
+        return result
+
+    def predict(self, text: str) -> Optional[str]:
+        """Wahrscheinlichste Kategorie oder None (kein Modell, keine bekannten Wörter)"""
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: List[str]) -> List[Optional[str]]:
+        """Klassifiziert viele Texte (mit numpy als eine Matrixoperation)"""
+        if not self.is_ready():
+            return [None] * len(texts)
+        if np is None:
+            predictions = []
+            for text in texts:
+                scores = self.scores(text)
+                predictions.append(max(scores, key=scores.get) if scores else None)
+            return predictions
+
+        categories, log_priors, log_likelihoods = self._numpy_model()
+        columns: List[int] = []
+        values: List[int] = []
+        offsets: List[int] = []
+        for text in texts:
+            offsets.append(len(columns))
+            for feature, count in hashed_features(text, self.bits).items():
+                if feature in self._vocabulary:
+                    columns.append(feature)
+                    values.append(count)
+
+        predictions: List[Optional[str]] = [None] * len(texts)
+        if not columns:
+            return predictions
+        # Beiträge aller Wörter aller Texte, dann pro Text aufsummiert
+        contributions = log_likelihoods[:, columns] * np.asarray(values, dtype=np.float64)
+        lengths = np.diff(offsets + [len(columns)])
+        non_empty = np.flatnonzero(lengths)
+        totals = np.add.reduceat(contributions, np.asarray(offsets)[non_empty], axis=1)
+        best = np.argmax(totals + log_priors[:, None], axis=0)
+        for position, category_index in zip(non_empty.tolist(), best.tolist()):
+            predictions[position] = categories[category_index]
+        return predictions
+
+    def _numpy_model(self):
+        if self._model is None:
+            categories = self.categories
+            log_likelihoods = np.empty((len(categories), 1 << self.bits), dtype=np.float64)
+            for row, category in enumerate(categories):
+                denominator = self._denominator(category)
+                log_likelihoods[row] = math.log(self.smoothing / denominator)
+                counts = self._feature_counts[category]
+                if counts:
+                    features = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+                    values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+                    log_likelihoods[row, features] = np.log((values + self.smoothing) / denominator)
+            log_priors = np.array([self._log_prior(category) for category in categories])
+            self._model = (categories, log_priors, log_likelihoods)
+        return self._model
+
+
+def _trainable_categories(framework_data: Dict[str, Any]):
+    framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+    for category, items in framework.items():
+        if category not in SKIP_CATEGORIES and is_item_list(items):
+            yield category, items
+
+
+def evaluate_classifier(framework_data: Dict[str, Any], holdout: float = 0.2) -> Dict[str, Any]:
+    """Trefferquote auf einem zurückgehaltenen Teil der Items
+
+    Die Aufteilung ist deterministisch (Hash des Item-Texts), damit sich
+    Ergebnisse zwischen Läufen vergleichen lassen.
+    """
+    classifier = CategoryClassifier()
+    test_texts: List[str] = []
+    test_labels: List[str] = []
+    threshold = int(holdout * 100)
+    for category, items in _trainable_categories(framework_data):
+        for item in items:
+            text = " ".join(item_texts(item))
+            if zlib.crc32(text.encode("utf-8")) % 100 < threshold:
+                test_texts.append(text)
+                test_labels.append(category)
+            else:
+                classifier.learn(category, item)
+
+    predictions = classifier.predict_batch(test_texts)
+    correct = sum(1 for predicted, label in zip(predictions, test_labels) if predicted == label)
+    return {
+        "accuracy": correct / len(test_labels) if test_labels else None,
+        "train_size": classifier.training_size,
+        "test_size": len(test_labels),
+        "correct": correct,
+    }
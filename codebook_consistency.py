@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Konsistenzprüfung
+=================================
+Regelbasierte Prüfung des Frameworks. Jede Regel prüft einzelne Items
+(``check_item``) und/oder sammelt pro Item Fakten (``item_facts``), die sie
+anschließend über alle Items hinweg auswertet (``check_facts``), z.B. doppelte
+IDs. Die Item-Prüfung läuft bei vielen Items kategorieweise in einem
+Prozess-Pool; im inkrementellen Modus werden nur geänderte Items neu geprüft.
+"""
+
+import math
+import os
+import pickle
+import re
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple, NamedTuple
+
+import yaml
+
+from codebook_model import is_item_list
+from codebook_references import normalize_key
+
+# Skalen der Marker (framework_markers mit name/typ/skala)
+MARKER_SCALE_FILE = Path(__file__).with_name("PORJECT_MANAGEMENT_INDICATORS_FORCHANGE.txt")
+SKIP_CATEGORIES = ("meta", "category_meta")
+# Unterhalb dieser Anzahl lohnt sich der Start eines Prozess-Pools nicht
+PARALLEL_MIN_ITEMS = 2000
+MIN_CHUNK_SIZE = 500
+SEVERITY_ICONS = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}
+
+RANGE_PATTERN = re.compile(r"(-?\d+(?:[.,]\d+)?)\s*(?:\([^)]*\))?\s*-\s*(-?\d+(?:[.,]\d+)?)")
+CHOICES_PATTERN = re.compile(r"^([^\W\d_]+(?:/[^\W\d_]+)+)(?:\s|$)")
+NUMBER_PATTERN = re.compile(r"^-?\d+(?:[.,]\d+)?")
+
+
+class Issue(NamedTuple):
+    rule: str
+    severity: str
+    category: str
+    index: int
+    message: str
+
+
+def _number(text: str, leading: bool = False) -> Optional[float]:
+    """Zahl aus einem String ("4", "2,5"; mit leading auch "2 Tage")"""
+    match = NUMBER_PATTERN.match(text.strip())
+    if match is None or (not leading and match.end() != len(text.strip())):
+        return None
+    return float(match.group(0).replace(",", "."))
+
+
+class MarkerScale(NamedTuple):
+    name: str
+    text: str
+    minimum: Optional[float]
+    maximum: Optional[float]
+    choices: Tuple[str, ...]
+    quantitative: bool
+
+    def accepts(self, value: Any) -> bool:
+        """Liegt der Wert innerhalb der Skala?"""
+        if isinstance(value, bool):
+            # YAML liest yes/no als bool
+            value = "ja" if value else "nein"
+        if isinstance(value, (int, float)):
+            number, text = float(value), None
+        elif isinstance(value, str):
+            text = value.strip().casefold()
+            if text in self.choices:
+                return True
+            number = _number(text)
+        else:
+            return False
+
+        if self.minimum is not None:
+            return number is not None and self.minimum <= number <= self.maximum
+        if self.choices:
+            return False
+        if self.quantitative:
+            # Freie Mengenangaben ("2", "2 Tage"), aber nicht negativ
+            if number is None and text is not None:
+                number = _number(text, leading=True)
+            return number is not None and number >= 0
+        return True
+
+
+def parse_scale(name: str, text: str, typ: str = "") -> MarkerScale:
+    """Liest eine Skala wie "1 (gering) - 5 (sehr hoch)" oder "ja/nein oder 1-5" """
+    text = str(text or "")
+    minimum = maximum = None
+    match = RANGE_PATTERN.search(text)
+    if match:
+        low, high = (float(group.replace(",", ".")) for group in match.groups())
+        minimum, maximum = min(low, high), max(low, high)
+    choices_match = CHOICES_PATTERN.match(text.strip())
+    choices = tuple(choices_match.group(1).casefold().split("/")) if choices_match else ()
+    return MarkerScale(name, text, minimum, maximum, choices, "quantitativ" in str(typ).casefold())
+
+
+def load_marker_scales(path: Path = MARKER_SCALE_FILE) -> Dict[str, MarkerScale]:
+    """Skalen je Marker-Name (leer, wenn die Datei fehlt oder unlesbar ist)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError):
+        return {}
+    scales = {}
+    markers = data.get("framework_markers", []) if isinstance(data, dict) else []
+    for marker in markers if isinstance(markers, list) else []:
+        if isinstance(marker, Mapping) and marker.get("name"):
+            name = str(marker["name"])
+            scales[name] = parse_scale(name, marker.get("skala", ""), marker.get("typ", ""))
+    return scales
+
+
+# ----------------------------------------------------------------------
+# Regeln
+# ----------------------------------------------------------------------
+
+class ConsistencyRule:
+    """Basisklasse für Regeln (alle Methoden optional)
+
+    Regeln werden für die parallele Prüfung an andere Prozesse übergeben und
+    sollten deshalb auf Modulebene definiert sein.
+    """
+
+    name = "rule"
+    description = ""
+
+    def check_item(self, category: str, item: Any) -> List[Tuple[str, str]]:
+        """(Schweregrad, Meldung) für ein einzelnes Item"""
+        return []
+
+    def item_facts(self, category: str, item: Any) -> Dict[str, List[str]]:
+        """Fakten eines Items für die übergreifende Prüfung"""
+        return {}
+
+    def check_facts(self, facts: Dict[int, Tuple[str, Dict[str, List[str]]]]) -> List[Tuple[int, str, str]]:
+        """(Dokument, Schweregrad, Meldung) aus den Fakten aller Items"""
+        return []
+
+
+class DuplicateIdRule(ConsistencyRule):
+    name = "duplicate_id"
+    description = "IDs müssen über alle Kategorien hinweg eindeutig sein"
+
+    def item_facts(self, category, item):
+        key = normalize_key(item.get("id")) if isinstance(item, Mapping) else None
+        return {"id": [key]} if key else {}
+
+    def check_facts(self, facts):
+        locations: Dict[str, List[Tuple[int, str]]] = {}
+        for doc, (category, item_facts) in facts.items():
+            for key in item_facts.get("id", ()):
+                locations.setdefault(key, []).append((doc, category))
+        problems = []
+        for key, entries in locations.items():
+            if len(entries) > 1:
+                categories = sorted({category for _, category in entries})
+                for doc, _ in entries:
+                    problems.append((doc, "error", f"ID '{key}' kommt {len(entries)}-mal vor "
+                                                   f"({', '.join(categories)})"))
+        return problems
+
+
+def _empty_fields(value: Any, path: str = ""):
+    if isinstance(value, str):
+        if value == "":
+            yield path
+    elif isinstance(value, list):
+        for position, entry in enumerate(value):
+            yield from _empty_fields(entry, f"{path}[{position}]")
+    elif isinstance(value, Mapping):
+        for key, entry in value.items():
+            yield from _empty_fields(entry, f"{path}.{key}" if path else str(key))
+
+
+class EmptyFieldRule(ConsistencyRule):
+    name = "empty_field"
+    description = "Template-Felder, die noch leer (\"\") sind"
+
+    def check_item(self, category, item):
+        paths = list(_empty_fields(item))
+        if not paths:
+            return []
+        shown = ", ".join(paths[:8]) + (f" (+{len(paths) - 8})" if len(paths) > 8 else "")
+        return [("warning", f"Leere Felder: {shown}")]
+
+
+def _markers(value: Any):
+    """(Name, Wert) aller Marker eines Items, auch in verschachtelten Einträgen"""
+    if isinstance(value, str):
+        return
+    if isinstance(value, Mapping):
+        for key, entry in value.items():
+            if key == "marker":
+                entries = entry if isinstance(entry, list) else [entry]
+                for marker in entries:
+                    if isinstance(marker, Mapping):
+                        yield from marker.items()
+            else:
+                yield from _markers(entry)
+    elif isinstance(value, list):
+        for entry in value:
+            yield from _markers(entry)
+
+
+class MarkerScaleRule(ConsistencyRule):
+    name = "marker_scale"
+    description = "Marker-Werte müssen innerhalb der definierten Skala liegen"
+
+    def __init__(self, scales: Optional[Dict[str, MarkerScale]] = None):
+        self.scales = load_marker_scales() if scales is None else scales
+
+    def check_item(self, category, item):
+        problems = []
+        for name, value in _markers(item):
+            scale = self.scales.get(str(name))
+            if scale is None:
+                problems.append(("info", f"Marker '{name}' hat keine definierte Skala"))
+            elif not scale.accepts(value):
+                problems.append(("error", f"Marker '{name}' = {value!r} liegt außerhalb der Skala "
+                                          f"\"{scale.text}\""))
+        return problems
+
+
+class RoleReferenceRule(ConsistencyRule):
+    name = "dangling_role"
+    description = "Beteiligte in Prozessen müssen als Rolle existieren"
+
+    def item_facts(self, category, item):
+        if not isinstance(item, Mapping):
+            return {}
+        if category == "rollen":
+            key = normalize_key(item.get("name"))
+            return {"provides": [key]} if key else {}
+        if category == "prozesse" and isinstance(item.get("beteiligte"), list):
+            roles = []
+            for entry in item["beteiligte"]:
+                key = normalize_key(entry.get("name") if isinstance(entry, Mapping) else entry)
+                if key:
+                    roles.append(key)
+            return {"requires": roles} if roles else {}
+        return {}
+
+    def check_facts(self, facts):
+        available = set()
+        for _, item_facts in facts.values():
+            available.update(item_facts.get("provides", ()))
+        problems = []
+        for doc, (_, item_facts) in facts.items():
+            for role in item_facts.get("requires", ()):
+                if role not in available:
+                    problems.append((doc, "warning", f"Rolle '{role}' ist nicht definiert"))
+        return problems
+
+
+class NestingRule(ConsistencyRule):
+    name = "nesting"
+    description = "Items dürfen ihre Kategorie nicht noch einmal enthalten"
+
+    def check_item(self, category, item):
+        if isinstance(item, list):
+            return [("error", "Item ist eine Liste statt eines Eintrags")]
+        if isinstance(item, Mapping) and isinstance(item.get(category), list):
+            return [("error", f"Item enthält selbst '{category}' mit {len(item[category])} Einträgen "
+                              f"(Einträge eine Ebene höher ziehen)")]
+        return []
+
+
+def default_rules() -> List[ConsistencyRule]:
+    return [DuplicateIdRule(), EmptyFieldRule(), MarkerScaleRule(), RoleReferenceRule(), NestingRule()]
+
+
+# ----------------------------------------------------------------------
+# Prüfung
+# ----------------------------------------------------------------------
+
+ItemResult = Tuple[List[Tuple[str, str, str]], Dict[str, Dict[str, List[str]]]]
+
+
+def check_items(rules: List[ConsistencyRule], category: str, items: List[Any]) -> List[ItemResult]:
+    """Prüft Items einer Kategorie: je Item (Befunde, Fakten je Regel)"""
+    results = []
+    for item in items:
+        problems = []
+        facts = {}
+        for rule in rules:
+            for severity, message in rule.check_item(category, item):
+                problems.append((rule.name, severity, message))
+            item_facts = rule.item_facts(category, item)
+            if item_facts:
+                facts[rule.name] = item_facts
+        results.append((problems, facts))
+    return results
+
+
+class ConsistencyChecker:
+    """Prüft das Framework und merkt sich die Ergebnisse je Item
+
+    Über ``on_change`` werden geänderte Items als ungeprüft markiert; ``check``
+    prüft dann nur diese erneut. Die übergreifenden Regeln werten die
+    gespeicherten Fakten aller Items aus und laufen deshalb immer komplett.
+    """
+
+    def __init__(self, rules: Optional[List[ConsistencyRule]] = None, workers: Optional[int] = None):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.workers = workers or os.cpu_count() or 1
+        self._docs: Dict[int, Tuple[str, Any]] = {}
+        # Dokument-IDs je Kategorie in Listenreihenfolge (Index = Item-Position)
+        self._category_docs: Dict[str, List[int]] = {}
+        self._results: Dict[int, ItemResult] = {}
+        self._dirty: Set[int] = set()
+        self._next_doc = 0
+        self.checked_items = 0
+
+    def register(self, rule: ConsistencyRule):
+        """Fügt eine Regel hinzu; beim nächsten Lauf wird alles neu geprüft"""
+        self.rules.append(rule)
+        self._dirty.update(self._docs)
+
+    def load(self, framework_data: Dict[str, Any]):
+        """Übernimmt alle Items (alle gelten als ungeprüft)"""
+        self._docs.clear()
+        self._category_docs.clear()
+        self._results.clear()
+        self._dirty.clear()
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        for category, items in framework.items():
+            if category in SKIP_CATEGORIES or not is_item_list(items):
+                continue
+            for position, item in enumerate(items):
+                self.add_item(category, position, item)
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def add_item(self, category: str, position: int, item: Any):
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[doc] = (category, item)
+        self._category_docs.setdefault(category, []).insert(position, doc)
+        self._dirty.add(doc)
+
+    def remove_item(self, category: str, position: int):
+        docs = self._category_docs.get(category)
+        if not docs or not 0 <= position < len(docs):
+            return
+        doc = docs.pop(position)
+        del self._docs[doc]
+        self._results.pop(doc, None)
+        self._dirty.discard(doc)
+
+    def update_item(self, category: str, position: int, item: Any):
+        self.remove_item(category, position)
+        self.add_item(category, position, item)
+
+    def remove_category(self, category: str):
+        for position in range(len(self._category_docs.get(category, [])) - 1, -1, -1):
+            self.remove_item(category, position)
+        self._category_docs.pop(category, None)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener für den CodebookLIFEAssistant"""
+        if action == "add":
+            self.add_item(category, index, new_item)
+        elif action == "update":
+            self.update_item(category, index, new_item)
+        elif action == "delete":
+            self.remove_item(category, index)
+        elif action == "remove_category":
+            self.remove_category(category)
+        elif action == "restore_category" and isinstance(new_item[0], list):
+            for position, item in enumerate(new_item[0]):
+                self.add_item(category, position, item)
+
+    # ------------------------------------------------------------------
+    # Prüfung
+    # ------------------------------------------------------------------
+
+    def check(self, framework_data: Optional[Dict[str, Any]] = None, parallel: bool = True) -> List[Issue]:
+        """Prüft ungeprüfte Items (mit framework_data: alles neu) und liefert alle Befunde"""
+        if framework_data is not None:
+            self.load(framework_data)
+
+        chunks = self._dirty_chunks()
+        self.checked_items = len(self._dirty)
+        results = None
+        if parallel and self.workers > 1 and self.checked_items >= PARALLEL_MIN_ITEMS:
+            results = self._run_parallel(chunks)
+        if results is None:
+            results = [check_items(self.rules, category, [self._docs[doc][1] for doc in docs])
+                       for category, docs in chunks]
+        for (_, docs), chunk_results in zip(chunks, results):
+            self._results.update(zip(docs, chunk_results))
+        self._dirty.clear()
+        return self.issues()
+
+    def _dirty_chunks(self) -> List[Tuple[str, List[int]]]:
+        """Ungeprüfte Dokumente, nach Kategorie gruppiert und in Arbeitspakete geteilt"""
+        by_category: Dict[str, List[int]] = {}
+        for doc in sorted(self._dirty):
+            by_category.setdefault(self._docs[doc][0], []).append(doc)
+        chunk_size = max(MIN_CHUNK_SIZE, math.ceil(len(self._dirty) / (self.workers * 4)))
+        return [(category, docs[start:start + chunk_size])
+                for category, docs in by_category.items()
+                for start in range(0, len(docs), chunk_size)]
+
+    def _run_parallel(self, chunks) -> Optional[List[List[ItemResult]]]:
+        # Prozesse statt Threads: die Regeln sind reiner Python-Code (GIL)
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+                futures = [executor.submit(check_items, self.rules, category,
+                                           [self._docs[doc][1] for doc in docs])
+                           for category, docs in chunks]
+                return [future.result() for future in futures]
+        except (OSError, RuntimeError, pickle.PicklingError, AttributeError) as e:
+            # Kein Pool möglich (z.B. nicht übertragbare Regel): seriell prüfen
+            print(f"Parallele Konsistenzprüfung nicht möglich, prüfe seriell: {e}")
+            return None
+
+    def issues(self) -> List[Issue]:
+        """Alle Befunde des letzten Laufs, nach Kategorie und Position sortiert"""
+        locations = {doc: (category, position)
+                     for category, docs in self._category_docs.items()
+                     for position, doc in enumerate(docs)}
+        found = []
+        for doc, (problems, _) in self._results.items():
+            category, position = locations[doc]
+            for rule, severity, message in problems:
+                found.append(Issue(rule, severity, category, position, message))
+
+        for rule in self.rules:
+            facts = {doc: (locations[doc][0], item_facts[rule.name])
+                     for doc, (_, item_facts) in self._results.items() if rule.name in item_facts}
+            for doc, severity, message in rule.check_facts(facts):
+                category, position = locations[doc]
+                found.append(Issue(rule.name, severity, category, position, message))
+
+        order = {category: position for position, category in enumerate(self._category_docs)}
+        found.sort(key=lambda issue: (order[issue.category], issue.index, issue.rule))
+        return found
+
+
+def format_issues(issues: List[Issue]) -> str:
+    """Textbericht für die GUI bzw. die Konsole"""
+    if not issues:
+        return "✅ Keine Inkonsistenzen gefunden\n"
+    counts: Dict[str, int] = {}
+    for issue in issues:
+        counts[issue.severity] = counts.get(issue.severity, 0) + 1
+    lines = [", ".join(f"{SEVERITY_ICONS.get(severity, '•')} {count} {severity}"
+                       for severity, count in counts.items()), ""]
+    for issue in issues:
+        lines.append(f"{SEVERITY_ICONS.get(issue.severity, '•')} {issue.category}[{issue.index}] "
+                     f"({issue.rule}): {issue.message}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Detailansicht
+=============================
+Zeigt Items mit großen Textfeldern (``raw_content``, ``code`` aus dem
+Datei-Import) ohne die GUI zu blockieren: Die Struktur des Items wird sofort
+gerendert, große Felder stehen darin als Platzhalter und werden beim Scrollen
+abschnittsweise nachgeladen. Ein Pager zeigt ein großes Feld seitenweise an;
+das Text-Widget enthält dabei immer nur die aktuelle Seite.
+"""
+
+import re
+import tkinter as tk
+from bisect import bisect_right
+from collections.abc import Mapping
+from tkinter import ttk, scrolledtext
+from typing import List, Any, Callable, Optional, Tuple, NamedTuple
+
+import yaml
+
+# Strings ab dieser Länge gelten als großes Feld
+LARGE_FIELD_CHARS = 2000
+CHUNK_CHARS = 16384
+# Mehr wird in der Detailansicht nicht nachgeladen, der Rest steht im Pager
+STREAM_LIMIT_CHARS = 262144
+PAGE_CHARS = 65536
+
+
+class LargeField(NamedTuple):
+    path: str
+    placeholder: str
+    value: str
+
+
+def _placeholder(path: str, length: int) -> str:
+    # Tausenderpunkt nur in der Zahl, der Feldpfad bleibt unverändert
+    count = f"{length:,}".replace(",", ".")
+    return f"⟪{path}: {count} Zeichen⟫"
+
+
+def split_large_fields(item: Any, limit: int = LARGE_FIELD_CHARS) -> Tuple[Any, List[LargeField]]:
+    """Kopie der Item-Struktur, in der große Strings durch Platzhalter ersetzt sind
+
+    Kopiert werden nur Dicts und Listen, die Strings selbst werden geteilt.
+    """
+    fields: List[LargeField] = []
+
+    def replace(value: Any, path: str) -> Any:
+        if isinstance(value, str):
+            if len(value) > limit:
+                field = LargeField(path or "inhalt", _placeholder(path or "inhalt", len(value)), value)
+                fields.append(field)
+                return field.placeholder
+            return value
+        if isinstance(value, list):
+            return [replace(entry, f"{path}[{position}]") for position, entry in enumerate(value)]
+        if isinstance(value, Mapping):
+            return {key: replace(entry, f"{path}.{key}" if path else str(key)) for key, entry in value.items()}
+        return value
+
+    return replace(item, ""), fields
+
+
+def render_outline(item: Any, limit: int = LARGE_FIELD_CHARS) -> Tuple[str, List[LargeField]]:
+    """YAML-Darstellung des Items ohne große Felder plus die ausgelassenen Felder"""
+    outline, fields = split_large_fields(item, limit)
+    if isinstance(outline, Mapping):
+        return yaml.dump(outline, default_flow_style=False, allow_unicode=True), fields
+    return str(outline), fields
+
+
+def restore_large_fields(value: Any, fields: List[LargeField]) -> Any:
+    """Setzt nach dem Bearbeiten unveränderte Platzhalter wieder durch den Originaltext"""
+    originals = {field.placeholder: field.value for field in fields}
+    if not originals:
+        return value
+
+    def restore(entry: Any) -> Any:
+        if isinstance(entry, str):
+            return originals.get(entry, entry)
+        if isinstance(entry, list):
+            return [restore(element) for element in entry]
+        if isinstance(entry, dict):
+            return {key: restore(element) for key, element in entry.items()}
+        return entry
+
+    return restore(value)
+
+
+def chunk_end(text: str, start: int, size: int) -> int:
+    """Ende des Abschnitts ab start (möglichst direkt nach einem Zeilenumbruch)"""
+    end = min(len(text), start + size)
+    if end < len(text):
+        newline = text.rfind("\n", start + size // 2, end)
+        if newline != -1:
+            end = newline + 1
+    return end
+
+
+class FieldStream:
+    """Liefert die großen Felder eines Items Stück für Stück
+
+    ``next_chunk`` gibt (Feldnummer, Art, Text) zurück; Art ist "header" (Beginn
+    eines Feldes), "text" (Abschnitt) oder "more" (Rest nur im Pager).
+    """
+
+    def __init__(self, fields: List[LargeField], chunk_chars: int = CHUNK_CHARS,
+                 limit: int = STREAM_LIMIT_CHARS):
+        self.fields = fields
+        self.chunk_chars = chunk_chars
+        self.limit = limit
+        self._field = 0
+        self._offset: Optional[int] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._field >= len(self.fields)
+
+    def next_chunk(self) -> Optional[Tuple[int, str, str]]:
+        if self.exhausted:
+            return None
+        field_number = self._field
+        value = self.fields[field_number].value
+        if self._offset is None:
+            self._offset = 0
+            return field_number, "header", f"\n── {self.fields[field_number].placeholder} ──\n"
+        if self._offset >= min(len(value), self.limit):
+            self._field += 1
+            self._offset = None
+            if len(value) > self.limit:
+                rest = len(value) - self.limit
+                return field_number, "more", f"\n… {rest:,} weitere Zeichen im Pager\n".replace(",", ".")
+            return self.next_chunk()
+        end = chunk_end(value, self._offset, self.chunk_chars)
+        chunk = value[self._offset:end]
+        self._offset = end
+        return field_number, "text", chunk
+
+
+class TextPager:
+    """Seitenweiser Zugriff auf einen großen Text (Seiten enden an Zeilenumbrüchen)"""
+
+    def __init__(self, text: str, page_chars: int = PAGE_CHARS):
+        self.text = text
+        self.offsets = [0]
+        while self.offsets[-1] < len(text):
+            self.offsets.append(chunk_end(text, self.offsets[-1], page_chars))
+        if len(self.offsets) == 1:
+            self.offsets.append(0)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def page(self, number: int) -> str:
+        return self.text[self.offsets[number]:self.offsets[number + 1]]
+
+    def page_of(self, offset: int) -> int:
+        return min(self.page_count - 1, bisect_right(self.offsets, offset) - 1)
+
+    def find(self, term: str, start: int = 0) -> Optional[int]:
+        """Position des nächsten Vorkommens ab start (ohne Groß-/Kleinschreibung, mit Umlauf)"""
+        if not term:
+            return None
+        pattern = re.compile(re.escape(term), re.IGNORECASE)
+        match = pattern.search(self.text, start) or pattern.search(self.text, 0, start + len(term))
+        return match.start() if match else None
+
+
+# ----------------------------------------------------------------------
+# Widgets
+# ----------------------------------------------------------------------
+
+class DetailView:
+    """Detailansicht in einem ScrolledText: Struktur sofort, große Felder beim Scrollen"""
+
+    def __init__(self, text_widget: scrolledtext.ScrolledText,
+                 open_field: Optional[Callable[[LargeField], None]] = None):
+        self.text = text_widget
+        self.open_field = open_field or (lambda field: PagerWindow(self.text, field.path, field.value))
+        self.fields: List[LargeField] = []
+        self._stream: Optional[FieldStream] = None
+        self._pending = False
+        self._scroll_set = text_widget.vbar.set
+        text_widget.configure(yscrollcommand=self._on_scroll)
+        text_widget.tag_configure("field_link", foreground="#2980b9", underline=True)
+        text_widget.tag_bind("field_link", "<Button-1>", self._on_link)
+        text_widget.tag_bind("field_link", "<Enter>", lambda event: self.text.configure(cursor="hand2"))
+        text_widget.tag_bind("field_link", "<Leave>", lambda event: self.text.configure(cursor=""))
+
+    def show(self, item: Any):
+        self.clear()
+        outline, self.fields = render_outline(item)
+        self.text.insert(tk.END, outline)
+        if self.fields:
+            self._stream = FieldStream(self.fields)
+            self._load_more()
+
+    def clear(self):
+        self._stream = None
+        self.fields = []
+        self.text.delete(1.0, tk.END)
+
+    def _on_scroll(self, first, last):
+        self._scroll_set(first, last)
+        # Nachladen, sobald das Ende des geladenen Textes sichtbar wird
+        if self._stream is not None and not self._pending and float(last) > 0.9:
+            self._pending = True
+            self.text.after_idle(self._load_more)
+
+    def _load_more(self):
+        self._pending = False
+        if self._stream is None:
+            return
+        chunk = self._stream.next_chunk()
+        if chunk is None:
+            self._stream = None
+            return
+        field_number, kind, content = chunk
+        tags = ("field_link", f"field:{field_number}") if kind != "text" else ()
+        self.text.insert(tk.END, content, tags)
+        # Passt alles ins Fenster, kommt kein Scroll-Ereignis mehr: selbst weitermachen
+        if float(self.text.yview()[1]) >= 1.0 and self._stream is not None and not self._pending:
+            self._pending = True
+            self.text.after_idle(self._load_more)
+
+    def _on_link(self, event):
+        for tag in self.text.tag_names(f"@{event.x},{event.y}"):
+            if tag.startswith("field:"):
+                self.open_field(self.fields[int(tag.split(":", 1)[1])])
+                return "break"
+
+
+class PagerWindow:
+    """Schreibgeschützter Pager für ein großes Textfeld (nur die aktuelle Seite im Widget)"""
+
+    def __init__(self, master: tk.Misc, title: str, text: str, page_chars: int = PAGE_CHARS):
+        self.pager = TextPager(text, page_chars)
+        self.current = 0
+        self._search_position = 0
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Pager: {title}")
+        self.window.geometry("800x600")
+
+        control_frame = ttk.Frame(self.window)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(control_frame, text="◀", width=3, command=lambda: self.show_page(self.current - 1)).pack(side=tk.LEFT)
+        self.page_label = ttk.Label(control_frame, width=18, anchor=tk.CENTER)
+        self.page_label.pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="▶", width=3, command=lambda: self.show_page(self.current + 1)).pack(side=tk.LEFT)
+
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(control_frame, textvariable=self.search_var, width=25)
+        search_entry.pack(side=tk.RIGHT)
+        search_entry.bind('<Return>', self.search_next)
+        ttk.Button(control_frame, text="Suchen", command=self.search_next).pack(side=tk.RIGHT, padx=5)
+
+        self.text = scrolledtext.ScrolledText(self.window, wrap=tk.NONE)
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.text.tag_configure("match", background="#f1c40f")
+        self.window.bind('<Prior>', lambda event: self.show_page(self.current - 1))
+        self.window.bind('<Next>', lambda event: self.show_page(self.current + 1))
+        self.show_page(0)
+
+    def show_page(self, number: int, highlight: Optional[Tuple[int, int]] = None):
+        number = max(0, min(self.pager.page_count - 1, number))
+        self.current = number
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, self.pager.page(number))
+        if highlight is not None:
+            start = f"1.0 + {highlight[0] - self.pager.offsets[number]} chars"
+            end = f"{start} + {highlight[1] - highlight[0]} chars"
+            self.text.tag_add("match", start, end)
+            self.text.see(start)
+        self.text.configure(state=tk.DISABLED)
+        self.page_label.configure(text=f"Seite {number + 1} / {self.pager.page_count}")
+
+    def search_next(self, event=None):
+        term = self.search_var.get()
+        position = self.pager.find(term, self._search_position)
+        if position is None:
+            self.page_label.configure(text="Nicht gefunden")
+            return
+        self._search_position = position + 1
+        self.show_page(self.pager.page_of(position), highlight=(position, position + len(term)))
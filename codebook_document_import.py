@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Dokument-Import
+===============================
+Zerlegt PDF-Dokumente (benötigt ``pypdf``) und Textexporte von Folien und
+Dokumenten in Kandidaten-Items. Der Text wird seitenweise extrahiert – bei
+PDFs in einem Prozess-Pool – und an Überschriften (Markdown, nummeriert,
+Großbuchstaben, unterstrichen) geteilt. Die Kandidaten werden Seite für Seite
+in Seitenreihenfolge geliefert, sobald eine Seite fertig ist; die
+Kategorisierung übernimmt der Assistent.
+"""
+
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf ist optional
+    PdfReader = None
+
+PDF_EXTENSIONS = (".pdf",)
+# Darunter lohnt sich der Prozess-Pool nicht
+PARALLEL_MIN_PAGES = 8
+PAGES_PER_TASK = 4
+MAX_HEADING_CHARS = 80
+MIN_BODY_CHARS = 20
+SUMMARY_CHARS = 300
+
+# Seiten-/Folientrenner in Textexporten, z.B. "--- Folie 3 ---" oder "Seite 2 von 10"
+PAGE_MARKER = re.compile(r"^[ \t]*[-=#*_ \t]*(?:Folie|Slide|Seite|Page)[ \t]+\d+"
+                         r"(?:[ \t]*(?:/|von|of)[ \t]*\d+)?[ \t]*[-=#*_ \t]*$",
+                         re.IGNORECASE | re.MULTILINE)
+MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+([A-ZÄÖÜ].*)$")
+UNDERLINE = re.compile(r"^(=+|-+)$")
+PAGE_NUMBER = re.compile(r"^\s*(?:-\s*)?\d+(?:\s*-)?\s*$")
+
+
+def require_pypdf():
+    if PdfReader is None:
+        raise RuntimeError("Der PDF-Import benötigt pypdf (pip install pypdf)")
+
+
+def split_pages(text: str) -> List[str]:
+    """Teilt einen Textexport in Seiten (Seitenvorschub oder Folien-/Seitenmarken)"""
+    if "\f" in text:
+        pages = text.split("\f")
+    else:
+        starts = [match.start() for match in PAGE_MARKER.finditer(text)]
+        if not starts:
+            return [text]
+        bounds = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+        pages = [PAGE_MARKER.sub("", text[start:end]) for start, end in zip(bounds, bounds[1:])]
+    # Leerer Rest nach dem letzten Seitenvorschub ist keine Seite
+    while len(pages) > 1 and not pages[-1].strip():
+        pages.pop()
+    return pages
+
+
+# ----------------------------------------------------------------------
+# Dokumente
+# ----------------------------------------------------------------------
+
+class TextDocument:
+    """Textexport, beim Öffnen vollständig gelesen und in Seiten geteilt"""
+
+    # Die Seiten liegen schon vor, Extraktion in Prozessen brächte nichts
+    parallel = False
+
+    def __init__(self, path: str):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            self.pages = split_pages(f.read())
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page_text(self, number: int) -> str:
+        return self.pages[number]
+
+
+class PdfDocument:
+    """PDF-Dokument, Text wird erst beim Zugriff auf eine Seite extrahiert"""
+
+    parallel = True
+
+    def __init__(self, path: str):
+        require_pypdf()
+        self._reader = PdfReader(str(path))
+
+    @property
+    def page_count(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, number: int) -> str:
+        return self._reader.pages[number].extract_text() or ""
+
+
+def open_document(path: str):
+    if Path(path).suffix.lower() in PDF_EXTENSIONS:
+        return PdfDocument(path)
+    return TextDocument(path)
+
+
+# Im Pool öffnet jeder Prozess das Dokument einmal (Initializer)
+_worker_document = None
+
+
+def _open_worker_document(path: str):
+    global _worker_document
+    _worker_document = open_document(path)
+
+
+def _extract_pages(numbers: List[int]) -> List[Tuple[int, str]]:
+    return [(number, _worker_document.page_text(number)) for number in numbers]
+
+
+def iter_pages(path: str, parallel: bool = True, workers: Optional[int] = None,
+               cancel: Optional[threading.Event] = None) -> Iterator[Tuple[int, int, str]]:
+    """Liefert (Seitennummer ab 0, Seitenzahl, Text) in Seitenreihenfolge"""
+    document = open_document(path)
+    count = document.page_count
+    workers = workers or os.cpu_count() or 1
+    next_page = 0
+    if parallel and document.parallel and workers > 1 and count >= PARALLEL_MIN_PAGES:
+        try:
+            for number, text in _iter_parallel(path, count, workers, cancel):
+                yield number, count, text
+                next_page = number + 1
+        except (OSError, RuntimeError) as e:
+            # Kein Pool möglich: ab der nächsten fehlenden Seite seriell weiter
+            print(f"Parallele Extraktion nicht möglich, extrahiere seriell: {e}")
+    for number in range(next_page, count):
+        if cancel is not None and cancel.is_set():
+            return
+        yield number, count, document.page_text(number)
+
+
+def _iter_parallel(path: str, count: int, workers: int,
+                   cancel: Optional[threading.Event]) -> Iterator[Tuple[int, str]]:
+    # Prozesse statt Threads: die PDF-Extraktion ist reiner Python-Code (GIL)
+    chunks = [list(range(start, min(count, start + PAGES_PER_TASK)))
+              for start in range(0, count, PAGES_PER_TASK)]
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                   initializer=_open_worker_document, initargs=(str(path),))
+    futures = []
+    try:
+        futures = [executor.submit(_extract_pages, chunk) for chunk in chunks]
+        # Fertige Seiten puffern, bis alle Seiten davor da sind
+        finished: Dict[int, str] = {}
+        next_page = 0
+        for future in as_completed(futures):
+            finished.update(future.result())
+            while next_page in finished:
+                yield next_page, finished.pop(next_page)
+                next_page += 1
+            if cancel is not None and cancel.is_set():
+                return
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+# ----------------------------------------------------------------------
+# Kandidaten
+# ----------------------------------------------------------------------
+
+def _is_uppercase_heading(line: str) -> bool:
+    letters = [char for char in line if char.isalpha()]
+    return (len(letters) >= 4 and len(line) <= MAX_HEADING_CHARS
+            and all(char.isupper() for char in letters) and line[-1] not in ".,;:")
+
+
+def _numbered_depth(line: str) -> Optional[int]:
+    match = NUMBERED_HEADING.match(line)
+    if match is None or len(line) > MAX_HEADING_CHARS or line[-1] in ".,;:":
+        return None
+    return match.group(1).count(".") + 1
+
+
+def find_heading(lines: List[str], position: int) -> Optional[Tuple[str, int, int]]:
+    """(Titel, Ebene, Anzahl Zeilen), wenn an dieser Position eine Überschrift beginnt"""
+    line = lines[position].strip()
+    if not line:
+        return None
+    match = MARKDOWN_HEADING.match(line)
+    if match:
+        return match.group(2), len(match.group(1)), 1
+    following = lines[position + 1].strip() if position + 1 < len(lines) else ""
+    if UNDERLINE.match(following) and len(following) >= 3 and len(line) <= MAX_HEADING_CHARS:
+        return line, 1 if following[0] == "=" else 2, 2
+    depth = _numbered_depth(line)
+    if depth is not None:
+        # Aufeinanderfolgende nummerierte Zeilen gleicher Tiefe sind eine Liste
+        previous = lines[position - 1].strip() if position > 0 else ""
+        if depth not in (_numbered_depth(previous), _numbered_depth(following)):
+            return NUMBERED_HEADING.match(line).group(2), depth, 1
+        return None
+    if _is_uppercase_heading(line):
+        return line.title(), 1, 1
+    return None
+
+
+class DocumentSplitter:
+    """Teilt Seiten an Überschriften in Kandidaten
+
+    Seiten müssen in Reihenfolge kommen: Text vor der ersten Überschrift einer
+    Seite setzt den letzten Abschnitt fort und wird ein eigener Kandidat
+    ("… (Forts.)"), damit jede Seite sofort fertig ist.
+    """
+
+    def __init__(self, document_title: str):
+        self.document_title = document_title
+        self._title: Optional[str] = None
+        self._level = 1
+
+    def split(self, page_number: int, text: str) -> List[Dict[str, Any]]:
+        """Kandidaten einer Seite (Seitennummer ab 1)"""
+        lines = [line for line in text.splitlines() if not PAGE_NUMBER.match(line)]
+        candidates = []
+        body: List[str] = []
+        title, level, continued = self._title, self._level, True
+        position = 0
+        while position < len(lines):
+            heading = find_heading(lines, position)
+            if heading is None:
+                body.append(lines[position])
+                position += 1
+                continue
+            self._add(candidates, page_number, title, level, continued, body)
+            title, level, span = heading
+            continued, body = False, []
+            position += span
+        self._add(candidates, page_number, title, level, continued, body)
+        self._title, self._level = title, level
+        return candidates
+
+    def _add(self, candidates: List[Dict[str, Any]], page_number: int, title: Optional[str],
+             level: int, continued: bool, body: List[str]):
+        text = "\n".join(body).strip()
+        if len(text) < MIN_BODY_CHARS:
+            return
+        if title is None:
+            title = f"{self.document_title}, Seite {page_number}"
+        elif continued:
+            title = f"{title} (Forts.)"
+        candidates.append({"title": title, "text": text, "page": page_number,
+                           "level": level, "continued": continued})
+
+
+def iter_candidates(path: str, parallel: bool = True, workers: Optional[int] = None,
+                    cancel: Optional[threading.Event] = None) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+    """Liefert (Seite ab 1, Seitenzahl, Kandidaten) für jede fertige Seite"""
+    splitter = DocumentSplitter(Path(path).stem)
+    for number, count, text in iter_pages(path, parallel, workers, cancel):
+        yield number + 1, count, splitter.split(number + 1, text)
+
+
+def summarize(text: str, limit: int = SUMMARY_CHARS) -> str:
+    """Erster Absatz, auf limit Zeichen gekürzt"""
+    paragraph = " ".join(text.strip().split("\n\n", 1)[0].split())
+    if len(paragraph) <= limit:
+        return paragraph
+    return paragraph[:limit].rsplit(" ", 1)[0] + " …"
+
+
+def candidate_item(candidate: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Item-Daten für einen Kandidaten (wie beim Datei-Import)"""
+    return {
+        "name": candidate["title"],
+        "beschreibung": summarize(candidate["text"]),
+        "raw_content": candidate["text"],
+        "original_file": str(source),
+        "original_page": candidate["page"],
+        "import_date": datetime.now().isoformat(),
+    }
+
+
+class DocumentImportWorker:
+    """Extrahiert und teilt ein Dokument in einem Hintergrund-Thread
+
+    ``poll`` reicht jede fertige Seite als (Seite, Seitenzahl, Kandidaten) an
+    den Callback weiter, am Ende ``None`` bzw. die aufgetretene Exception.
+    """
+
+    def __init__(self, path: str, parallel: bool = True, workers: Optional[int] = None):
+        self.path = str(path)
+        self.parallel = parallel
+        self.workers = workers
+        self.results: "queue.Queue" = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "DocumentImportWorker":
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _run(self):
+        try:
+            for page in iter_candidates(self.path, self.parallel, self.workers, self._cancel):
+                self.results.put(page)
+            self.results.put(None)
+        except Exception as e:
+            self.results.put(e)
+
+    def poll(self, root: Any, callback: Callable[[Any], None], interval: int = 50):
+        """Fragt im Tk-Loop per after() nach fertigen Seiten, ohne zu blockieren"""
+        while not self._cancel.is_set():
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                root.after(interval, self.poll, root, callback, interval)
+                return
+            callback(result)
+            if result is None or isinstance(result, Exception):
+                return
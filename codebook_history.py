@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Undo/Redo
+=========================
+Änderungshistorie auf Basis inverser Operationen. Jeder Schritt speichert nur
+Referenzen auf das alte und neue Item (keine Kopie des Frameworks), der
+Speicherbedarf pro Schritt ist also proportional zur Änderung.
+"""
+
+from collections import deque
+from typing import Any, Deque, NamedTuple, Optional
+
+
+class Change(NamedTuple):
+    """Eine aufgezeichnete Änderung (wie vom Change-Listener gemeldet)"""
+    action: str
+    category: Optional[str]
+    index: Optional[int]
+    old_item: Any
+    new_item: Any
+
+
+class UndoHistory:
+    """Undo/Redo-Stack für einen CodebookLIFEAssistant"""
+
+    def __init__(self, assistant, max_depth: int = 100):
+        self.assistant = assistant
+        self.max_depth = max_depth
+        self._undo: Deque[Change] = deque(maxlen=max_depth)
+        self._redo: Deque[Change] = deque(maxlen=max_depth)
+        self._applying = False
+        assistant.add_change_listener(self.record)
+
+    def record(self, action: str, category: Optional[str], index: Optional[int],
+               old_item: Any, new_item: Any):
+        """Change-Listener: zeichnet Änderungen auf, die nicht von Undo/Redo stammen"""
+        if self._applying or self.max_depth <= 0:
+            return
+        self._undo.append(Change(action, category, index, old_item, new_item))
+        self._redo.clear()
+
+    def set_max_depth(self, max_depth: int):
+        """Ändert die maximale Anzahl gespeicherter Schritte"""
+        self.max_depth = max_depth
+        self._undo = deque(self._undo, maxlen=max_depth)
+        self._redo = deque(self._redo, maxlen=max_depth)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def undo(self) -> bool:
+        """Macht die letzte Änderung rückgängig"""
+        if not self._undo:
+            return False
+        change = self._undo.pop()
+        self._apply(self._inverse(change))
+        self._redo.append(change)
+        return True
+
+    def redo(self) -> bool:
+        """Wiederholt die zuletzt rückgängig gemachte Änderung"""
+        if not self._redo:
+            return False
+        change = self._redo.pop()
+        self._apply(change)
+        self._undo.append(change)
+        return True
+
+    @staticmethod
+    def _inverse(change: Change) -> Change:
+        """Bildet die inverse Operation einer Änderung"""
+        inverse_actions = {
+            "add": "delete",
+            "delete": "add",
+            "update": "update",
+            "reset": "reset",
+            "add_category": "remove_category",
+            "remove_category": "restore_category",
+            "restore_category": "remove_category",
+            "meta": "meta",
+            "category_meta": "category_meta",
+        }
+        return Change(inverse_actions[change.action], change.category, change.index,
+                      change.new_item, change.old_item)
+
+    def _apply(self, change: Change):
+        """Führt eine Änderung über die API des Assistants aus"""
+        assistant = self.assistant
+        self._applying = True
+        try:
+            if change.action == "add":
+                assistant.insert_item_into_category(change.category, change.index, change.new_item)
+            elif change.action == "delete":
+                assistant.delete_item_from_category(change.category, change.index)
+            elif change.action == "update":
+                assistant.update_item_in_category(change.category, change.index, change.new_item)
+            elif change.action == "reset":
+                assistant._replace_framework_data(change.new_item)
+            elif change.action in ("meta", "category_meta"):
+                assistant._set_framework_section(change.action, change.new_item)
+            elif change.action == "add_category":
+                assistant._restore_category(change.category, [], change.new_item)
+            elif change.action == "remove_category":
+                assistant.remove_category(change.category)
+            elif change.action == "restore_category":
+                items, category_meta = change.new_item
+                assistant._restore_category(change.category, items, category_meta)
+        finally:
+            self._applying = False
@@ -15,29 +15,139 @@ import re
 import yaml
 import json
 import os
-from typing import Dict, List, Any, Optional
+import queue
+import shutil
+import threading
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Callable, Iterator
+from collections.abc import Mapping
 from difflib import SequenceMatcher
 import mimetypes
 
+from codebook_model import CATEGORY_TEMPLATES, DEFAULT_TEMPLATE, compact_framework, compact_value, is_item_list, to_plain
+from codebook_references import ReferenceGraph
+from codebook_consistency import ConsistencyChecker, Issue, format_issues
+from codebook_search import FuzzyIndex
+from codebook_query import QueryEngine, QueryError, is_query, parse_query, format_plan
+from codebook_history import UndoHistory
+from codebook_revisions import RevisionStore, format_diff
+from codebook_merge import merge_frameworks, format_merge_report
+from codebook_watch import FileWatcher, compute_changes, file_signature
+from codebook_autosave import AutosaveScheduler, atomic_write_text, recovery_candidates
+from codebook_startup import StartupTimer
+from codebook_snapshot import Snapshot, SnapshotError, compile_snapshot
+from codebook_document_import import DocumentImportWorker, PDF_EXTENSIONS, candidate_item, iter_candidates
+from codebook_detail import DetailView, PagerWindow, render_outline, restore_large_fields
+from codebook_visualization import (build_tree, compute_layout, export_svg, export_dot,
+                                    LayoutWorker, FrameworkCanvas)
+
+if TYPE_CHECKING:  # numpy-abhängige Module werden erst bei Bedarf importiert
+    from codebook_similarity import SimilarityIndex
+    from codebook_classifier import CategoryClassifier
+    from codebook_timeseries import AssessmentStore
+
+# libyaml-Parser, falls vorhanden (um ein Vielfaches schneller)
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class CodebookLIFEAssistant:
-    def __init__(self, codebook_directory="./codebook_data"):
+    def __init__(self, codebook_directory="./codebook_data", undo_depth: int = 100,
+                 compact_items: bool = True, autosave_delay: Optional[float] = None,
+                 load: bool = True, snapshot: Optional[str] = None):
         self.codebook_dir = Path(codebook_directory)
         self.codebook_dir.mkdir(exist_ok=True)
+        self.compact_items = compact_items
         self.pending_changes = []
         self.framework_file = self.codebook_dir / "life_framework.yaml"
-        self.framework_data = self._load_framework_data()
+        self._saved_signature = file_signature(self.framework_file)
+        # Mit load=False startet der Assistent leer, die Daten kommen über
+        # iter_framework_file/apply_loaded_section (z.B. aus einem Hintergrund-Thread)
+        self.framework_data = self._load_framework_data() if load and snapshot is None else {"framework": {}}
+        self.loaded = load
+        # Mit snapshot wird ein kompilierter Snapshot schreibgeschützt per mmap geöffnet
+        self.snapshot_file = self.codebook_dir / "life_framework.snapshot"
+        self.snapshot: Optional[Snapshot] = None
+        self.read_only = snapshot is not None
+        if snapshot is not None:
+            self.snapshot = Snapshot(snapshot)
+            self.framework_data = {"framework": self.snapshot.framework}
+            self.loaded = True
+        self._change_listeners: List[Callable] = []
+        self._generation = 0
+        self._watcher: Optional[FileWatcher] = None
+        self._reference_graph: Optional[ReferenceGraph] = None
+        self._fuzzy_index: Optional[FuzzyIndex] = self.snapshot.search_index() if self.snapshot else None
+        self._query_engine = QueryEngine()
+        self._consistency_checker: Optional[ConsistencyChecker] = None
+        # Ähnlichkeitssuche und Klassifikator (numpy) werden erst bei Bedarf importiert
+        self._similarity_index: Optional["SimilarityIndex"] = None
+        self._category_classifier: Optional["CategoryClassifier"] = None
+        self.vectors_file = self.codebook_dir / "item_vectors.npz"
+        # Bewertungsrunden der Change-Indikatoren (numpy, ebenfalls bei Bedarf)
+        self._assessment_store: Optional["AssessmentStore"] = None
+        self.assessments_file = self.codebook_dir / "assessments.npz"
+        self.history = UndoHistory(self, max_depth=undo_depth)
+        self.revisions = RevisionStore(self.codebook_dir)
+        # Mit autosave_delay wird verzögert im Hintergrund gespeichert, sonst sofort
+        self.autosave: Optional[AutosaveScheduler] = None
+        if autosave_delay is not None:
+            self.autosave = AutosaveScheduler(self._write_framework_file, delay=autosave_delay)
         
     def _load_framework_data(self) -> Dict[str, Any]:
-        """Lädt die LIFE Framework Daten"""
-        if self.framework_file.exists():
+        """Lädt die LIFE Framework Daten (nach einem Absturz ggf. aus der Sicherung)"""
+        framework_data = self._read_framework_file()
+        if framework_data is None:
+            return self._create_default_framework()
+        return self._prepare_framework(framework_data)
+    
+    def _read_framework_file(self) -> Optional[Dict[str, Any]]:
+        """Parst die Framework-Datei oder ihre Sicherung (None, falls keine lesbar ist)"""
+        for candidate in recovery_candidates(self.framework_file):
+            if not candidate.exists():
+                continue
             try:
-                with open(self.framework_file, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
+                with open(candidate, 'r', encoding='utf-8') as f:
+                    framework_data = yaml.load(f, Loader=YAML_LOADER) or {}
+                if candidate != self.framework_file:
+                    print(f"Framework-Daten aus {candidate.name} wiederhergestellt")
+                return framework_data
             except Exception as e:
                 print(f"Fehler beim Laden der Framework-Daten: {e}")
-                return self._create_default_framework()
+        return None
+    
+    def iter_framework_file(self):
+        """Liest die Framework-Datei abschnittsweise (für einen Hintergrund-Thread)
+        
+        Liefert (Abschnitt, Wert) je Eintrag unter "framework", Items bereits
+        vorbereitet. Der Assistent selbst wird nicht verändert; übernommen
+        werden die Abschnitte im GUI-Thread mit apply_loaded_section.
+        """
+        framework_data = self._read_framework_file() or self._create_default_framework()
+        framework = framework_data.get("framework") if isinstance(framework_data, dict) else None
+        for section, value in (framework or {}).items():
+            if section not in ("meta", "category_meta") and isinstance(value, list):
+                value = [self._prepare_item(section, item) for item in value]
+            yield section, value
+    
+    def apply_loaded_section(self, section: str, value: Any):
+        """Übernimmt einen geladenen Abschnitt; Indizes erfahren davon über die Listener"""
+        framework = self.framework_data.setdefault("framework", {})
+        framework[section] = value
+        if section in ("meta", "category_meta"):
+            self._notify_change(section, None, None, None, value)
         else:
-            return self._create_default_framework()
+            self._notify_change("restore_category", section, None, None, (value, None))
+    
+    def finish_loading(self):
+        """Schließt das abschnittsweise Laden ab (Laden ist nicht rückgängig zu machen)"""
+        self.loaded = True
+        self.history.clear()
+    
+    def _prepare_framework(self, framework_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Wandelt Items in kompakte Slot-Objekte um (falls aktiviert)"""
+        return compact_framework(framework_data) if self.compact_items else framework_data
+    
+    def _prepare_item(self, category: str, item: Any) -> Any:
+        """Wandelt ein einzelnes Item in ein kompaktes Slot-Objekt um (falls aktiviert)"""
+        return compact_value(item, category) if self.compact_items else item
     
     def _create_default_framework(self) -> Dict[str, Any]:
         """Erstellt die Standard LIFE Framework Struktur"""
@@ -64,13 +174,99 @@ class CodebookLIFEAssistant:
         }
     
     def _save_framework_data(self):
-        """Speichert die Framework Daten"""
+        """Speichert die Framework Daten (bei aktivem Autosave verzögert im Hintergrund)"""
+        if self.read_only:
+            return
+        if self.autosave is not None:
+            self.autosave.mark_dirty()
+        else:
+            try:
+                self._write_framework_file()
+            except Exception as e:
+                print(f"Fehler beim Speichern der Framework-Daten: {e}")
+    
+    def _write_framework_file(self):
+        """Schreibt die Framework Daten atomar auf die Platte
+        
+        Fehler werden weitergereicht, damit der Autosave es später erneut versucht.
+        """
+        # Kategorielisten kopieren, damit parallele Änderungen im GUI-Thread
+        # den Schreibvorgang nicht stören (Items werden ersetzt, nicht verändert)
+        framework = self.framework_data.get("framework")
+        snapshot = dict(self.framework_data)
+        if isinstance(framework, dict):
+            snapshot["framework"] = {key: list(value) if isinstance(value, list) else value
+                                     for key, value in list(framework.items())}
+        content = yaml.dump(snapshot, default_flow_style=False, 
+                            allow_unicode=True, sort_keys=False)
+        
+        # Extern geändert und noch nicht übernommen: Stand sichern statt ihn zu überschreiben
+        current_signature = file_signature(self.framework_file)
+        if self._saved_signature is not None and current_signature not in (None, self._saved_signature):
+            conflict_file = self.framework_file.with_name(
+                f"{self.framework_file.stem}.conflict-{datetime.now().strftime('%Y%m%d-%H%M%S')}.yaml")
+            shutil.copy2(self.framework_file, conflict_file)
+            print(f"Externe Änderungen gesichert nach {conflict_file.name}")
+        
+        atomic_write_text(self.framework_file, content)
+        self._saved_signature = file_signature(self.framework_file)
+    
+    def flush(self):
+        """Schreibt ausstehende Änderungen sofort"""
+        if self.autosave is not None:
+            self.autosave.flush()
+    
+    def close(self):
+        """Beendet Dateibeobachtung und Autosave (ausstehende Änderungen werden geschrieben)"""
+        self.stop_watching()
+        if self.autosave is not None:
+            self.autosave.stop()
+            self.autosave = None
+        self.save_similarity_index()
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+    
+    def _require_writable(self):
+        if self.read_only:
+            raise RuntimeError("Der Snapshot ist schreibgeschützt (Änderungen nur in der YAML-Datei)")
+    
+    def compile_snapshot(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Kompiliert das Framework in einen binären Snapshot für rein lesende Nutzer"""
+        self.flush()
+        return compile_snapshot(self.framework_data, Path(path) if path else self.snapshot_file,
+                                None if self.read_only else file_signature(self.framework_file))
+    
+    def is_snapshot_current(self, path: Optional[str] = None) -> bool:
+        """Passt der Snapshot noch zur Framework-Datei?"""
         try:
-            with open(self.framework_file, 'w', encoding='utf-8') as f:
-                yaml.dump(self.framework_data, f, default_flow_style=False, 
-                         allow_unicode=True, sort_keys=False)
-        except Exception as e:
-            print(f"Fehler beim Speichern der Framework-Daten: {e}")
+            snapshot = self.snapshot or Snapshot(Path(path) if path else self.snapshot_file)
+        except (OSError, SnapshotError):
+            return False
+        try:
+            return snapshot.is_current(file_signature(self.framework_file))
+        finally:
+            if snapshot is not self.snapshot:
+                snapshot.close()
+    
+    def add_change_listener(self, listener: Callable):
+        """Registriert einen Callback (action, category, index, old_item, new_item)"""
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable):
+        """Entfernt einen registrierten Callback"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+    
+    def _notify_change(self, action: str, category: Optional[str] = None, index: Optional[int] = None,
+                       old_item: Any = None, new_item: Any = None):
+        """Benachrichtigt alle Listener über eine Änderung der Framework-Daten"""
+        self._generation += 1
+        for listener in list(self._change_listeners):
+            try:
+                listener(action, category, index, old_item, new_item)
+            except Exception as e:
+                print(f"Fehler in Change-Listener: {e}")
     
     def get_framework_categories(self) -> List[str]:
         """Gibt alle Kategorien des Frameworks zurück"""
@@ -86,59 +282,265 @@ class CodebookLIFEAssistant:
     
     def add_item_to_category(self, category: str, item: Dict[str, Any]):
         """Fügt ein Item zu einer Kategorie hinzu"""
+        self._require_writable()
         if "framework" not in self.framework_data:
             self.framework_data = self._create_default_framework()
         
         if category not in self.framework_data["framework"]:
             self.framework_data["framework"][category] = []
         
+        item = self._prepare_item(category, item)
         self.framework_data["framework"][category].append(item)
+        self._notify_change("add", category, len(self.framework_data["framework"][category]) - 1, None, item)
+        self._save_framework_data()
+    
+    def insert_item_into_category(self, category: str, index: int, item: Dict[str, Any]):
+        """Fügt ein Item an einer bestimmten Position einer Kategorie ein"""
+        self._require_writable()
+        if "framework" not in self.framework_data:
+            self.framework_data = self._create_default_framework()
+        
+        items = self.framework_data["framework"].setdefault(category, [])
+        item = self._prepare_item(category, item)
+        index = max(0, min(index, len(items)))
+        items.insert(index, item)
+        self._notify_change("add", category, index, None, item)
         self._save_framework_data()
     
     def update_item_in_category(self, category: str, index: int, item: Dict[str, Any]):
         """Aktualisiert ein Item in einer Kategorie"""
+        self._require_writable()
         if ("framework" in self.framework_data and 
             category in self.framework_data["framework"] and 
             0 <= index < len(self.framework_data["framework"][category])):
             
+            old_item = self.framework_data["framework"][category][index]
+            item = self._prepare_item(category, item)
             self.framework_data["framework"][category][index] = item
+            self._notify_change("update", category, index, old_item, item)
             self._save_framework_data()
     
     def delete_item_from_category(self, category: str, index: int):
         """Löscht ein Item aus einer Kategorie"""
+        self._require_writable()
         if ("framework" in self.framework_data and 
             category in self.framework_data["framework"] and 
             0 <= index < len(self.framework_data["framework"][category])):
             
-            del self.framework_data["framework"][category][index]
+            old_item = self.framework_data["framework"][category].pop(index)
+            self._notify_change("delete", category, index, old_item, None)
             self._save_framework_data()
     
     def export_framework_to_yaml(self, output_file: str = "life_framework_export.yaml"):
         """Exportiert das Framework als YAML"""
         try:
             export_path = self.codebook_dir / output_file
+            # Snapshot-Abschnitte sind keine Dicts/Listen und werden vorher umgewandelt
+            framework_data = to_plain(self.framework_data) if self.read_only else self.framework_data
             with open(export_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.framework_data, f, default_flow_style=False, 
+                yaml.dump(framework_data, f, default_flow_style=False, 
                          allow_unicode=True, sort_keys=False)
             return str(export_path)
         except Exception as e:
             print(f"Fehler beim Export: {e}")
             return None
     
+    def export_framework_visualization(self, output_file: str = "life_framework.svg", fmt: str = "svg"):
+        """Exportiert die Framework-Struktur als SVG oder DOT (ohne GUI)"""
+        try:
+            export_path = self.codebook_dir / output_file
+            tree = build_tree(self.framework_data)
+            if fmt == "dot":
+                return export_dot(tree, str(export_path))
+            return export_svg(compute_layout(tree), str(export_path))
+        except Exception as e:
+            print(f"Fehler beim Visualisierungs-Export: {e}")
+            return None
+    
     def import_framework_from_yaml(self, yaml_file: str):
         """Importiert Framework-Daten aus YAML"""
         try:
             with open(yaml_file, 'r', encoding='utf-8') as f:
-                imported_data = yaml.safe_load(f)
+                imported_data = yaml.load(f, Loader=YAML_LOADER)
             
             if "framework" in imported_data:
-                self.framework_data = imported_data
-                self._save_framework_data()
+                # Bisherigen Stand sichern, bevor er ersetzt wird
+                if self.analyze_framework_structure().get("total_items"):
+                    self.create_revision(f"Vor Import von {Path(yaml_file).name}")
+                self._replace_framework_data(imported_data)
                 return True
         except Exception as e:
             print(f"Fehler beim Import: {e}")
         return False
     
+    def merge_framework_from_yaml(self, yaml_file: str, strategy: str = "theirs") -> Optional[Dict[str, Any]]:
+        """Führt Framework-Daten aus YAML mit dem aktuellen Stand zusammen
+        
+        Gibt einen Bericht (neue/aktualisierte Items, Konflikte) zurück.
+        """
+        try:
+            with open(yaml_file, 'r', encoding='utf-8') as f:
+                imported_data = yaml.load(f, Loader=YAML_LOADER)
+            
+            if isinstance(imported_data, dict) and "framework" in imported_data:
+                if "framework" not in self.framework_data:
+                    self.framework_data = self._create_default_framework()
+                merged_data, report = merge_frameworks(self.framework_data, imported_data, strategy)
+                if report["added"] or report["updated"] or report["categories_added"] or report["meta_updated"]:
+                    if self.analyze_framework_structure().get("total_items"):
+                        self.create_revision(f"Vor Merge-Import von {Path(yaml_file).name}")
+                    self._replace_framework_data(merged_data)
+                return report
+        except Exception as e:
+            print(f"Fehler beim Merge-Import: {e}")
+        return None
+    
+    def _replace_framework_data(self, new_data: Dict[str, Any]):
+        """Ersetzt die kompletten Framework-Daten"""
+        self._require_writable()
+        old_data = self.framework_data
+        self.framework_data = self._prepare_framework(new_data)
+        new_data = self.framework_data
+        self._notify_change("reset", None, None, old_data, new_data)
+        self._save_framework_data()
+    
+    def create_revision(self, message: str = "") -> Dict[str, Any]:
+        """Speichert den aktuellen Stand als Revision"""
+        return self.revisions.commit(self.framework_data, message)
+    
+    def list_revisions(self) -> List[Dict[str, Any]]:
+        """Gibt alle gespeicherten Revisionen zurück (älteste zuerst)"""
+        return self.revisions.list_revisions()
+    
+    def diff_revisions(self, old_revision: str, new_revision: str) -> Dict[str, Any]:
+        """Vergleicht zwei gespeicherte Revisionen"""
+        return self.revisions.diff(old_revision, new_revision)
+    
+    def compare_with_revision(self, revision_id: str) -> Dict[str, Any]:
+        """Vergleicht den aktuellen Stand mit einer Revision"""
+        return self.revisions.diff_with_working(revision_id, self.framework_data)
+    
+    def restore_revision(self, revision_id: str):
+        """Stellt eine Revision wieder her (rückgängig machbar)"""
+        self._replace_framework_data(self.revisions.checkout(revision_id))
+    
+    def _set_framework_section(self, section: str, value: Any, save: bool = True):
+        """Setzt meta bzw. category_meta"""
+        self._require_writable()
+        framework = self.framework_data.setdefault("framework", {})
+        old_value = framework.get(section)
+        if value is None:
+            framework.pop(section, None)
+        else:
+            framework[section] = value
+        self._notify_change(section, None, None, old_value, value)
+        if save:
+            self._save_framework_data()
+    
+    def start_watching(self, on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+                       interval: float = 1.0) -> FileWatcher:
+        """Beobachtet die Framework-Datei auf externe Änderungen
+        
+        Ohne on_update werden Änderungen direkt übernommen, sonst wird das
+        Update (aus dem Watcher-Thread) übergeben und muss mit
+        apply_external_changes angewendet werden (z.B. im GUI-Thread).
+        Im Snapshot-Modus nicht verfügbar (RuntimeError).
+        """
+        self._require_writable()
+        self.stop_watching()
+        
+        def on_change():
+            update = self.check_external_changes()
+            if update is None:
+                return
+            if on_update is not None:
+                on_update(update)
+            else:
+                self.apply_external_changes(update)
+        
+        self._watcher = FileWatcher(self.framework_file, on_change, interval=interval).start()
+        return self._watcher
+    
+    def stop_watching(self):
+        """Beendet die Dateibeobachtung"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
+    def check_external_changes(self) -> Optional[Dict[str, Any]]:
+        """Parst die Framework-Datei neu und difft gegen den Stand im Speicher
+        
+        Gibt None zurück, wenn die Datei unverändert oder ungültig ist.
+        """
+        signature = file_signature(self.framework_file)
+        if signature is None or signature == self._saved_signature:
+            return None
+        if self.autosave is not None and self.autosave.dirty:
+            # Lokale Änderungen stehen noch aus; sie werden geschrieben und
+            # der externe Stand dabei als Konfliktkopie gesichert
+            return None
+        
+        generation = self._generation
+        try:
+            with open(self.framework_file, 'r', encoding='utf-8') as f:
+                new_data = yaml.load(f, Loader=YAML_LOADER)
+        except Exception as e:
+            print(f"Fehler beim Neuladen der Framework-Daten: {e}")
+            return None
+        if not isinstance(new_data, dict) or "framework" not in new_data:
+            return None
+        
+        new_data = self._prepare_framework(new_data)
+        return {
+            "changes": compute_changes(self.framework_data, new_data),
+            "signature": signature,
+            "generation": generation,
+        }
+    
+    def apply_external_changes(self, update: Dict[str, Any]) -> bool:
+        """Übernimmt extern geänderte Items, ohne die Datei neu zu schreiben
+        
+        Gibt False zurück, wenn sich der Stand im Speicher seit dem Diff
+        geändert hat; dann muss check_external_changes erneut laufen.
+        """
+        if update["generation"] != self._generation:
+            return False
+        
+        framework = self.framework_data.setdefault("framework", {})
+        for change in update["changes"]:
+            if change.action in ("meta", "category_meta"):
+                self._set_framework_section(change.action, change.new_item, save=False)
+                continue
+            
+            if change.action == "add":
+                framework[change.category].insert(change.index, change.new_item)
+            elif change.action == "update":
+                framework[change.category][change.index] = change.new_item
+            elif change.action == "delete":
+                framework[change.category].pop(change.index)
+            elif change.action == "remove_category":
+                framework.pop(change.category, None)
+            elif change.action == "restore_category":
+                framework[change.category] = change.new_item[0]
+            self._notify_change(*change)
+        
+        self._saved_signature = update["signature"]
+        return True
+    
+    def undo(self) -> bool:
+        """Macht die letzte Änderung rückgängig"""
+        return self.loaded and self.history.undo()
+    
+    def redo(self) -> bool:
+        """Stellt die zuletzt rückgängig gemachte Änderung wieder her"""
+        return self.loaded and self.history.redo()
+    
+    def can_undo(self) -> bool:
+        return self.history.can_undo()
+    
+    def can_redo(self) -> bool:
+        return self.history.can_redo()
+    
     def analyze_framework_structure(self) -> Dict[str, Any]:
         """Analysiert die Framework-Struktur"""
         if "framework" not in self.framework_data:
@@ -155,7 +557,7 @@ class CodebookLIFEAssistant:
             if category == "meta":
                 continue
                 
-            if isinstance(items, list):
+            if is_item_list(items):
                 analysis["categories"][category] = len(items)
                 analysis["total_items"] += len(items)
             else:
@@ -176,7 +578,7 @@ class CodebookLIFEAssistant:
             if category == "meta":
                 continue
                 
-            if isinstance(items, list):
+            if is_item_list(items):
                 for i, item in enumerate(items):
                     if self._item_matches_search(item, search_term):
                         results.append({
@@ -188,9 +590,120 @@ class CodebookLIFEAssistant:
         
         return results
     
+    def fuzzy_search_in_framework(self, search_term: str, max_results: int = 100) -> List[Dict[str, Any]]:
+        """Tippfehler-tolerante Suche (Umlaute/ß egal, Teilwörter in Komposita)"""
+        return self.get_fuzzy_index().search(search_term, max_results)
+    
+    def get_fuzzy_index(self) -> FuzzyIndex:
+        """Gibt den Trigramm-Index zurück (wird beim ersten Zugriff aufgebaut)"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex.from_framework(self.framework_data)
+            self.add_change_listener(self._update_fuzzy_index)
+        return self._fuzzy_index
+    
+    def _update_fuzzy_index(self, action, category, index, old_item, new_item):
+        """Hält den Suchindex bei Änderungen aktuell"""
+        if action == "reset":
+            self._fuzzy_index = FuzzyIndex.from_framework(self.framework_data)
+        else:
+            self._fuzzy_index.on_change(action, category, index, old_item, new_item)
+    
+    def query_framework(self, query: str) -> List[Dict[str, Any]]:
+        """Strukturierte Abfrage, z.B. "prinzipien where team_cohesion >= 4" (QueryError bei Fehlern)"""
+        return self._query_engine.run(self.framework_data, parse_query(query))
+    
+    def explain_query(self, query: str) -> str:
+        """Zeigt, ob eine Abfrage Indizes nutzt oder die Kategorie durchsucht"""
+        return format_plan(self._query_engine.plan(self.framework_data, parse_query(query)))
+    
+    def create_query_index(self, category: str, field: str, kind: str = "hash"):
+        """Legt einen Sekundärindex an ("hash" für Gleichheit, "sorted" auch für Bereiche)"""
+        if not self._query_engine.has_indexes():
+            self.add_change_listener(self._update_query_indexes)
+        self._query_engine.create_index(self.framework_data, category, field, kind)
+    
+    def drop_query_index(self, category: str, field: str) -> bool:
+        """Entfernt einen Sekundärindex"""
+        removed = self._query_engine.drop_index(category, field)
+        if not self._query_engine.has_indexes():
+            self.remove_change_listener(self._update_query_indexes)
+        return removed
+    
+    def list_query_indexes(self) -> List[tuple]:
+        """Alle Sekundärindizes als (Kategorie, Feld, Typ)"""
+        return self._query_engine.list_indexes()
+    
+    def _update_query_indexes(self, action, category, index, old_item, new_item):
+        """Hält die Sekundärindizes bei Änderungen aktuell"""
+        if action == "reset":
+            self._query_engine.rebuild(self.framework_data)
+        else:
+            self._query_engine.on_change(action, category, index, old_item, new_item)
+    
+    def get_similarity_index(self) -> "SimilarityIndex":
+        """Gibt den Vektor-Index zurück (benötigt numpy, wird beim ersten Zugriff aufgebaut)"""
+        from codebook_similarity import SimilarityIndex
+        if self._similarity_index is None:
+            self._similarity_index = SimilarityIndex.from_framework(self.framework_data,
+                                                                    cache_file=self.vectors_file)
+            self.add_change_listener(self._update_similarity_index)
+            self.save_similarity_index()
+        return self._similarity_index
+    
+    def _update_similarity_index(self, action, category, index, old_item, new_item):
+        """Hält den Vektor-Index bei Änderungen aktuell"""
+        if action == "reset":
+            from codebook_similarity import SimilarityIndex
+            self.save_similarity_index()
+            self._similarity_index = SimilarityIndex.from_framework(self.framework_data,
+                                                                    cache_file=self.vectors_file)
+        else:
+            self._similarity_index.on_change(action, category, index, old_item, new_item)
+    
+    def save_similarity_index(self):
+        """Schreibt die Item-Vektoren nach codebook_data (nur bei Änderungen)
+        
+        Im Snapshot-Modus wird nichts geschrieben: Viele Leser teilen sich das Verzeichnis.
+        """
+        if self.read_only:
+            return
+        if self._similarity_index is not None and self._similarity_index.modified:
+            try:
+                self._similarity_index.save(self.vectors_file)
+            except OSError as e:
+                print(f"Fehler beim Speichern der Item-Vektoren: {e}")
+    
+    def find_similar_items(self, category: str, index: int, top_k: int = 10,
+                           categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Inhaltlich ähnliche Items zu einem Item (ohne das Item selbst)"""
+        return self.find_similar_items_batch([(category, index)], top_k, categories)[0]
+    
+    def find_similar_items_batch(self, references: List[tuple], top_k: int = 10,
+                                 categories: Optional[List[str]] = None) -> List[List[Dict[str, Any]]]:
+        """Ähnliche Items für mehrere (Kategorie, Index)-Paare in einem Durchgang"""
+        similarity = self.get_similarity_index()
+        rows = [similarity.row_of(category, index) for category, index in references]
+        matches = similarity.top_k(similarity.vectors_of(rows), top_k, exclude_rows=rows, categories=categories)
+        return [self._similarity_results(similarity, entries) for entries in matches]
+    
+    def find_similar_to_text(self, text: str, top_k: int = 10,
+                             categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Items, die einem freien Text inhaltlich ähneln"""
+        similarity = self.get_similarity_index()
+        matches = similarity.top_k(similarity.vectorize_text(text), top_k, categories=categories)
+        return self._similarity_results(similarity, matches[0])
+    
+    def _similarity_results(self, similarity: "SimilarityIndex", entries) -> List[Dict[str, Any]]:
+        results = []
+        for row, score in entries:
+            category, index, item = similarity.resolve(row)
+            results.append({"category": category, "index": index, "item": item,
+                            "match_type": "similar", "score": round(score, 3)})
+        return results
+    
     def _item_matches_search(self, item: Dict[str, Any], search_term: str) -> bool:
         """Prüft ob ein Item den Suchbegriff enthält"""
-        if isinstance(item, dict):
+        if isinstance(item, Mapping):
             for key, value in item.items():
                 if isinstance(value, str) and search_term in value.lower():
                     return True
@@ -203,8 +716,104 @@ class CodebookLIFEAssistant:
         
         return False
     
+    def get_assessment_store(self) -> "AssessmentStore":
+        """Gibt die Indikator-Zeitreihen zurück (benötigt numpy, beim ersten Zugriff geladen)"""
+        from codebook_timeseries import AssessmentStore
+        if self._assessment_store is None:
+            self._assessment_store = AssessmentStore.load(self.assessments_file)
+        return self._assessment_store
+    
+    def record_assessment_round(self, label: str, assessments: Dict[str, Dict[str, Any]]) -> int:
+        """Hängt eine Bewertungsrunde {Projekt: {Indikator: Wert}} an und speichert sie"""
+        store = self.get_assessment_store()
+        round_number = store.add_round(label, assessments)
+        store.save(self.assessments_file)
+        return round_number
+    
+    def get_indicator_trends(self, indicator: str, window: int = 3, direction: str = "up",
+                             limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """Projekte mit dem stärksten Anstieg bzw. Rückgang eines Indikators"""
+        return self.get_assessment_store().trend_query(indicator, window, direction, limit=limit)
+    
+    def get_reference_graph(self) -> ReferenceGraph:
+        """Gibt den Referenz-Graphen zurück (wird beim ersten Zugriff aufgebaut)"""
+        if self._reference_graph is None:
+            self._reference_graph = ReferenceGraph.from_framework(self.framework_data)
+            self.add_change_listener(self._update_reference_graph)
+        return self._reference_graph
+    
+    def _update_reference_graph(self, action, category, index, old_item, new_item):
+        """Hält den Referenz-Graphen bei Änderungen aktuell"""
+        if action == "reset":
+            self._reference_graph = ReferenceGraph.from_framework(self.framework_data)
+        else:
+            self._reference_graph.on_change(action, category, index, old_item, new_item)
+    
+    def find_referencing_items(self, category: str, key: str) -> List[tuple]:
+        """Welche Items verweisen auf das angegebene Item? (z.B. Prinzipien einer Regel)"""
+        return self.get_reference_graph().referenced_by(category, key)
+    
+    def find_dangling_references(self) -> List[tuple]:
+        """Findet Referenzen auf nicht existierende Items"""
+        return self.get_reference_graph().dangling_references()
+    
+    def get_change_impact(self, category: str, key: str, max_depth: Optional[int] = None) -> Dict[tuple, int]:
+        """Ermittelt transitiv alle Items, die von einer Änderung betroffen wären"""
+        return self.get_reference_graph().impact_of(category, key, max_depth)
+    
+    def check_consistency(self, parallel: bool = True) -> List[Issue]:
+        """Prüft das Framework auf Inkonsistenzen (ab dem zweiten Aufruf nur geänderte Items)"""
+        if self._consistency_checker is None:
+            self._consistency_checker = ConsistencyChecker()
+            self._consistency_checker.load(self.framework_data)
+            self.add_change_listener(self._update_consistency_checker)
+        return self._consistency_checker.check(parallel=parallel)
+    
+    def _update_consistency_checker(self, action, category, index, old_item, new_item):
+        """Markiert geänderte Items für die nächste Prüfung"""
+        if action == "reset":
+            self._consistency_checker.load(self.framework_data)
+        else:
+            self._consistency_checker.on_change(action, category, index, old_item, new_item)
+    
+    def get_category_classifier(self) -> "CategoryClassifier":
+        """Gibt den Klassifikator zurück (wird beim ersten Zugriff trainiert)"""
+        from codebook_classifier import CategoryClassifier
+        if self._category_classifier is None:
+            self._category_classifier = CategoryClassifier.from_framework(self.framework_data)
+            self.add_change_listener(self._update_category_classifier)
+        return self._category_classifier
+    
+    def _update_category_classifier(self, action, category, index, old_item, new_item):
+        """Trainiert den Klassifikator bei Änderungen inkrementell nach"""
+        if action == "reset":
+            from codebook_classifier import CategoryClassifier
+            self._category_classifier = CategoryClassifier.from_framework(self.framework_data)
+        else:
+            self._category_classifier.on_change(action, category, index, old_item, new_item)
+    
+    def evaluate_category_classifier(self, holdout: float = 0.2) -> Dict[str, Any]:
+        """Trefferquote des Klassifikators auf zurückgehaltenen Items"""
+        from codebook_classifier import evaluate_classifier
+        return evaluate_classifier(self.framework_data, holdout)
+    
+    def suggest_categories(self, contents: List[str], file_extensions: Optional[List[str]] = None) -> List[str]:
+        """Kategorie-Vorschläge für viele Inhalte auf einmal (z.B. Massenimport)"""
+        file_extensions = file_extensions or [""] * len(contents)
+        predictions = self.get_category_classifier().predict_batch(contents)
+        return [prediction or self._analyze_content_by_keywords(content, extension)
+                for prediction, content, extension in zip(predictions, contents, file_extensions)]
+    
     def analyze_content_for_category(self, content: str, file_extension: str = "") -> str:
-        """Analysiert Inhalt und schlägt passende Kategorie vor"""
+        """Analysiert Inhalt und schlägt passende Kategorie vor
+        
+        Vorrangig entscheidet der auf den vorhandenen Items trainierte
+        Klassifikator; ohne ausreichende Trainingsdaten die Schlüsselwörter.
+        """
+        return self.suggest_categories([content], [file_extension])[0]
+    
+    def _analyze_content_by_keywords(self, content: str, file_extension: str = "") -> str:
+        """Schlüsselwort-basierte Kategorisierung (Fallback)"""
         content_lower = content.lower()
         
         # Keyword-basierte Kategorisierung
@@ -291,8 +900,28 @@ class CodebookLIFEAssistant:
         except Exception as e:
             raise Exception(f"Fehler beim Importieren der Datei: {str(e)}")
     
+    def classify_document_candidates(self, candidates: List[Dict[str, Any]],
+                                     file_extension: str = "") -> List[Dict[str, Any]]:
+        """Ergänzt Kandidaten eines Dokuments um "suggested_category" (eine Seite auf einmal)"""
+        contents = [f"{candidate['title']}\n{candidate['text']}" for candidate in candidates]
+        categories = self.suggest_categories(contents, [file_extension] * len(contents))
+        for candidate, category in zip(candidates, categories):
+            candidate["suggested_category"] = category
+        return candidates
+    
+    def import_document(self, file_path: str, parallel: bool = True) -> Iterator[tuple]:
+        """Kandidaten-Items aus PDF oder Textexport, seitenweise mit Kategorie-Vorschlag
+        
+        Liefert (Seite, Seitenzahl, Kandidaten) je fertiger Seite; übernommen
+        werden Kandidaten mit ``candidate_item`` und ``add_item_to_category``.
+        """
+        extension = Path(file_path).suffix.lower()
+        for page, page_count, candidates in iter_candidates(file_path, parallel):
+            yield page, page_count, self.classify_document_candidates(candidates, extension)
+    
     def add_category(self, category_name: str, description: str = ""):
         """Fügt eine neue Kategorie hinzu"""
+        self._require_writable()
         if "framework" not in self.framework_data:
             self.framework_data = self._create_default_framework()
         
@@ -312,19 +941,108 @@ class CodebookLIFEAssistant:
                 "custom": True
             }
             
+            self._notify_change("add_category", category_key, None, None,
+                                self.framework_data["framework"]["category_meta"][category_key])
             self._save_framework_data()
             return True
         
         return False
+    
+    def remove_category(self, category_key: str) -> bool:
+        """Entfernt eine Kategorie samt Items und Meta-Information"""
+        self._require_writable()
+        framework = self.framework_data.get("framework", {})
+        if category_key in ("meta", "category_meta") or category_key not in framework:
+            return False
+        
+        items = framework.pop(category_key)
+        category_meta = framework.get("category_meta", {}).pop(category_key, None)
+        self._notify_change("remove_category", category_key, None, (items, category_meta), None)
+        self._save_framework_data()
+        return True
+    
+    def _restore_category(self, category_key: str, items: List[Any], category_meta: Optional[Dict[str, Any]]):
+        """Stellt eine entfernte Kategorie wieder her (für Undo)"""
+        framework = self.framework_data.setdefault("framework", {})
+        framework[category_key] = items
+        if category_meta is not None:
+            framework.setdefault("category_meta", {})[category_key] = category_meta
+        self._notify_change("restore_category", category_key, None, None, (items, category_meta))
+        self._save_framework_data()
 
 class CodebookLIFEGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.assistant = CodebookLIFEAssistant()
+    def __init__(self, root: Optional[tk.Tk] = None, startup_timer: Optional[StartupTimer] = None):
+        self.root = root or tk.Tk()
+        self.startup_timer = startup_timer
+        # Daten werden erst nach dem ersten Zeichnen im Hintergrund geladen
+        self.assistant = CodebookLIFEAssistant(autosave_delay=1.0, load=False)
         self.current_category = None
         self.current_item_index = None
         self.category_mapping = {}
+        self.external_updates = queue.Queue()
+        self.loaded_sections = queue.Queue()
         self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.start_loading()
+    
+    def start_loading(self):
+        """Zeigt das Fenster sofort und lädt das Framework im Hintergrund"""
+        self.set_controls_enabled(False)
+        self.update_status("⏳ Lade Framework...")
+        self.root.update()
+        if self.startup_timer is not None:
+            self.startup_timer.mark("Erstes Bild")
+        threading.Thread(target=self._load_in_background, daemon=True).start()
+        self.root.after(10, self.process_loaded_sections)
+    
+    def _load_in_background(self):
+        try:
+            for section in self.assistant.iter_framework_file():
+                self.loaded_sections.put(section)
+        except Exception as e:
+            print(f"Fehler beim Laden der Framework-Daten: {e}")
+        self.loaded_sections.put(None)
+    
+    def process_loaded_sections(self):
+        """Übernimmt geladene Abschnitte im GUI-Thread, Kategorien erscheinen nacheinander"""
+        try:
+            while True:
+                section = self.loaded_sections.get_nowait()
+                if section is None:
+                    self.finish_loading()
+                    return
+                name, value = section
+                self.assistant.apply_loaded_section(name, value)
+                if name != "meta":
+                    display_name = name.replace("_", " ").title()
+                    self.category_listbox.insert(tk.END, display_name)
+                    self.category_mapping[display_name] = name
+        except queue.Empty:
+            pass
+        self.root.after(10, self.process_loaded_sections)
+    
+    def finish_loading(self):
+        """Gibt die Bedienung frei, sobald alle Daten geladen sind"""
+        self.assistant.finish_loading()
+        self.refresh_categories()
+        if self.current_category:
+            self.refresh_items()
+        self.set_controls_enabled(True)
+        self.update_status("Codebook LIFE bereit")
+        self.assistant.start_watching(self.external_updates.put)
+        self.root.after(500, self.process_external_changes)
+        if self.startup_timer is not None:
+            self.startup_timer.mark("Daten bereit")
+            print(self.startup_timer.report())
+    
+    def set_controls_enabled(self, enabled: bool):
+        """Sperrt Buttons und Suchfeld (z.B. während des Ladens)"""
+        pending = [self.root]
+        while pending:
+            widget = pending.pop()
+            pending.extend(widget.winfo_children())
+            if isinstance(widget, (ttk.Button, ttk.Entry)):
+                widget.state(["!disabled"] if enabled else ["disabled"])
         
     def setup_gui(self):
         """Erstellt die GUI"""
@@ -359,9 +1077,13 @@ class CodebookLIFEGUI:
         
         ttk.Button(button_frame, text="Neues Item", command=self.create_new_item).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="📁 Datei importieren", command=self.import_file).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="📄 Dokument importieren", command=self.import_document).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="➕ Neue Kategorie", command=self.add_new_category).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="Item bearbeiten", command=self.edit_current_item).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="Item löschen", command=self.delete_current_item).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="🧭 Ähnliche Items", command=self.show_similar_items).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="↶ Rückgängig (Strg+Z)", command=self.undo_last_change).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="↷ Wiederholen (Strg+Y)", command=self.redo_last_change).pack(fill=tk.X, pady=2)
         
         # Mittlere Spalte - Hauptinhalt
         middle_frame = ttk.Frame(main_frame)
@@ -383,6 +1105,7 @@ class CodebookLIFEGUI:
         
         self.content_text = scrolledtext.ScrolledText(content_frame, wrap=tk.WORD, height=25)
         self.content_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.detail_view = DetailView(self.content_text)
         
         # Rechte Spalte - Tools
         right_frame = ttk.Frame(main_frame)
@@ -396,6 +1119,9 @@ class CodebookLIFEGUI:
         
         ttk.Button(tools_frame, text="📤 YAML Export", command=self.export_framework).pack(fill=tk.X, pady=2)
         ttk.Button(tools_frame, text="📥 YAML Import", command=self.import_framework).pack(fill=tk.X, pady=2)
+        ttk.Button(tools_frame, text="🔀 YAML Merge-Import", command=self.merge_import_framework).pack(fill=tk.X, pady=2)
+        ttk.Button(tools_frame, text="🕘 Revisionen", command=self.show_revisions).pack(fill=tk.X, pady=2)
+        ttk.Button(tools_frame, text="📦 Snapshot kompilieren", command=self.compile_snapshot).pack(fill=tk.X, pady=2)
         
         # Analyse Tools
         analysis_frame = ttk.LabelFrame(right_frame, text="Analyse")
@@ -403,6 +1129,8 @@ class CodebookLIFEGUI:
         
         ttk.Button(analysis_frame, text="📊 Struktur-Analyse", command=self.analyze_structure).pack(fill=tk.X, pady=2)
         ttk.Button(analysis_frame, text="🔍 Lücken-Analyse", command=self.analyze_gaps).pack(fill=tk.X, pady=2)
+        ttk.Button(analysis_frame, text="🗺️ Visualisierung", command=self.show_visualization).pack(fill=tk.X, pady=2)
+        ttk.Button(analysis_frame, text="📈 Indikator-Trends", command=self.show_indicator_trends).pack(fill=tk.X, pady=2)
         
         # Semantic Grabber Tools
         grabber_frame = ttk.LabelFrame(right_frame, text="Semantic Grabber")
@@ -416,9 +1144,11 @@ class CodebookLIFEGUI:
         status_label = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN)
         status_label.pack(side=tk.BOTTOM, fill=tk.X)
         
-        # Daten laden
-        self.refresh_categories()
-    
+        # Tastenkürzel
+        self.root.bind('<Control-z>', self.undo_last_change)
+        self.root.bind('<Control-y>', self.redo_last_change)
+        self.root.bind('<Control-Shift-Z>', self.redo_last_change)
+        
     def refresh_categories(self):
         """Aktualisiert die Kategorienliste"""
         self.category_listbox.delete(0, tk.END)
@@ -452,7 +1182,7 @@ class CodebookLIFEGUI:
             items = self.assistant.get_category_items(self.current_category)
             
             for i, item in enumerate(items):
-                if isinstance(item, dict):
+                if isinstance(item, Mapping):
                     name = item.get('name', item.get('id', f'Item {i+1}'))
                 else:
                     name = str(item)[:50] + "..." if len(str(item)) > 50 else str(item)
@@ -472,16 +1202,62 @@ class CodebookLIFEGUI:
             items = self.assistant.get_category_items(self.current_category)
             
             if 0 <= self.current_item_index < len(items):
-                item = items[self.current_item_index]
-                
-                self.content_text.delete(1.0, tk.END)
-                
-                if isinstance(item, dict):
-                    content = yaml.dump(item, default_flow_style=False, allow_unicode=True)
-                else:
-                    content = str(item)
-                
-                self.content_text.insert(tk.END, content)
+                # Große Felder werden beim Scrollen nachgeladen
+                self.detail_view.show(items[self.current_item_index])
+    
+    def show_similar_items(self):
+        """Zeigt inhaltlich ähnliche Items zum ausgewählten Item"""
+        if not self.current_category or self.current_item_index is None:
+            messagebox.showwarning("Warnung", "Bitte wählen Sie zuerst ein Item aus.")
+            return
+        
+        try:
+            results = self.assistant.find_similar_items(self.current_category, self.current_item_index)
+        except RuntimeError as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+        
+        if not results:
+            messagebox.showinfo("Ähnliche Items", "Keine ähnlichen Items gefunden.")
+            return
+        
+        similar_window = tk.Toplevel(self.root)
+        similar_window.title("Ähnliche Items")
+        similar_window.geometry("600x400")
+        
+        ttk.Label(similar_window, text="Doppelklick öffnet das Item", font=("Arial", 10)).pack(pady=5)
+        result_listbox = tk.Listbox(similar_window)
+        result_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        for result in results:
+            item = result["item"]
+            if isinstance(item, Mapping):
+                name = item.get('name', item.get('id', f"Item {result['index'] + 1}"))
+            else:
+                name = str(item)[:50]
+            result_listbox.insert(tk.END, f"{result['score']:.2f}  {result['category']}: {name}")
+        
+        def open_result(event=None):
+            selection = result_listbox.curselection()
+            if selection:
+                result = results[selection[0]]
+                self.select_item(result["category"], result["index"])
+        
+        result_listbox.bind('<Double-Button-1>', open_result)
+    
+    def select_item(self, category: str, index: int):
+        """Wählt Kategorie und Item in den Listen aus und zeigt es an"""
+        self.current_category = category
+        display_name = category.replace("_", " ").title()
+        names = list(self.category_listbox.get(0, tk.END))
+        if display_name in names:
+            self.category_listbox.selection_clear(0, tk.END)
+            self.category_listbox.selection_set(names.index(display_name))
+        self.refresh_items()
+        self.item_listbox.selection_set(index)
+        self.item_listbox.see(index)
+        self.current_item_index = index
+        self.show_item_content()
     
     def create_new_item(self):
         """Erstellt ein neues Item"""
@@ -505,8 +1281,9 @@ class CodebookLIFEGUI:
         editor_window.title("Item Editor")
         editor_window.geometry("800x600")
         
-        # Aktueller Inhalt
+        # Aktueller Inhalt (große Felder als Platzhalter, siehe codebook_detail)
         current_item = {}
+        large_fields = []
         if edit_mode and self.current_item_index is not None:
             items = self.assistant.get_category_items(self.current_category)
             if 0 <= self.current_item_index < len(items):
@@ -525,7 +1302,8 @@ class CodebookLIFEGUI:
         
         # Vorbefüllen mit Template oder aktuellem Inhalt
         if current_item:
-            editor_text.insert(tk.END, yaml.dump(current_item, default_flow_style=False, allow_unicode=True))
+            outline, large_fields = render_outline(current_item)
+            editor_text.insert(tk.END, outline)
         else:
             template = self.get_template_for_category(self.current_category)
             editor_text.insert(tk.END, template)
@@ -537,7 +1315,7 @@ class CodebookLIFEGUI:
         def save_item():
             try:
                 yaml_content = editor_text.get(1.0, tk.END).strip()
-                item_data = yaml.safe_load(yaml_content)
+                item_data = restore_large_fields(yaml.safe_load(yaml_content), large_fields)
                 
                 if edit_mode:
                     self.assistant.update_item_in_category(self.current_category, self.current_item_index, item_data)
@@ -553,85 +1331,17 @@ class CodebookLIFEGUI:
         
         ttk.Button(button_frame, text="Speichern", command=save_item).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Abbrechen", command=editor_window.destroy).pack(side=tk.LEFT, padx=5)
+        self.add_large_field_buttons(button_frame, large_fields)
+    
+    def add_large_field_buttons(self, frame: ttk.Frame, large_fields: List[Any]):
+        """Buttons, die große Felder (im Editor nur Platzhalter) im Pager öffnen"""
+        for field in large_fields[:5]:
+            ttk.Button(frame, text=f"📄 {field.path}",
+                       command=lambda field=field: PagerWindow(self.root, field.path, field.value)).pack(side=tk.RIGHT, padx=5)
     
     def get_template_for_category(self, category: str) -> str:
         """Gibt ein Template für die jeweilige Kategorie zurück"""
-        templates = {
-            "prinzipien": """id: ""
-name: ""
-beschreibung: ""
-hauptziele:
-  - ""
-schritte:
-  - ""
-regeln:
-  - id: ""
-    text: ""
-heuristiken:
-  - ""
-narrative_beispiele:
-  - ""
-transferbeispiele:
-  - kontext: ""
-    regel: ""
-    beispiel: ""
-semantic_gaps:
-  - beschreibung: ""
-    schwellenwert: ""
-    lösung: ""
-lessons_learned:
-  - ""
-""",
-            "regeln": """id: ""
-text: ""
-kontext: ""
-beispiel: ""
-""",
-            "heuristiken": """regel: ""
-wann: ""
-beispiel: ""
-""",
-            "rollen": """name: ""
-aufgaben:
-  - ""
-verantwortlichkeiten:
-  - ""
-interaktionen:
-  - ""
-""",
-            "prozesse": """name: ""
-schritte:
-  - ""
-beteiligte:
-  - ""
-ziele:
-  - ""
-""",
-            "beispiele": """name: ""
-ausgangslage: ""
-transformation: ""
-lessons_learned:
-  - ""
-""",
-            "transferbeispiele": """kontext: ""
-regel: ""
-beispiel: ""
-""",
-            "semantic_gaps": """beschreibung: ""
-schwellenwert: ""
-lösung: ""
-""",
-            "lessons_learned": """kategorie: ""
-erfahrung: ""
-empfehlung: ""
-""",
-            "open_questions": """frage: ""
-kontext: ""
-priorität: ""
-"""
-        }
-        
-        return templates.get(category, "# Neues Item\nname: \"\"\nbeschreibung: \"\"\n")
+        return CATEGORY_TEMPLATES.get(category, DEFAULT_TEMPLATE)
     
     def delete_current_item(self):
         """Löscht das aktuelle Item"""
@@ -642,17 +1352,61 @@ priorität: ""
         if messagebox.askyesno("Bestätigung", "Möchten Sie das ausgewählte Item wirklich löschen?"):
             self.assistant.delete_item_from_category(self.current_category, self.current_item_index)
             self.refresh_items()
-            self.content_text.delete(1.0, tk.END)
+            self.detail_view.clear()
             self.current_item_index = None
             self.update_status("Item gelöscht")
     
+    def undo_last_change(self, event=None):
+        """Macht die letzte Änderung rückgängig"""
+        if self.assistant.undo():
+            self.refresh_after_history_change()
+            self.update_status("Änderung rückgängig gemacht")
+        else:
+            self.update_status("Nichts rückgängig zu machen")
+        return "break"
+    
+    def redo_last_change(self, event=None):
+        """Stellt die zuletzt rückgängig gemachte Änderung wieder her"""
+        if self.assistant.redo():
+            self.refresh_after_history_change()
+            self.update_status("Änderung wiederhergestellt")
+        else:
+            self.update_status("Nichts wiederherzustellen")
+        return "break"
+    
+    def refresh_after_history_change(self):
+        """Aktualisiert Listen und Detailansicht nach Undo/Redo"""
+        self.refresh_categories()
+        self.refresh_items()
+        items = self.assistant.get_category_items(self.current_category) if self.current_category else []
+        if self.current_item_index is not None and self.current_item_index < len(items):
+            self.show_item_content()
+        else:
+            self.current_item_index = None
+            self.detail_view.clear()
+    
     def search_framework(self, event=None):
         """Sucht im Framework"""
         search_term = self.search_entry.get().strip()
         if not search_term:
             return
         
+        if is_query(search_term, self.assistant.get_framework_categories()):
+            try:
+                results = self.assistant.query_framework(search_term)
+            except QueryError as e:
+                messagebox.showerror("Abfrage", f"Ungültige Abfrage: {e}")
+                return
+            if results:
+                self.show_search_results(results)
+            else:
+                messagebox.showinfo("Abfrage", f"Keine Items erfüllen '{search_term}'.")
+            return
+        
         results = self.assistant.search_in_framework(search_term)
+        if not results:
+            # Keine exakten Treffer: Tippfehler und Umlaut-Schreibweisen zulassen
+            results = self.assistant.fuzzy_search_in_framework(search_term)
         
         if results:
             self.show_search_results(results)
@@ -679,10 +1433,13 @@ priorität: ""
             category = result["category"]
             item = result["item"]
             
-            results_text.insert(tk.END, f"Kategorie: {category}\n")
+            if result.get("match_type") == "fuzzy":
+                results_text.insert(tk.END, f"Kategorie: {category} (ähnlich, Score {result['score']:.2f})\n")
+            else:
+                results_text.insert(tk.END, f"Kategorie: {category}\n")
             results_text.insert(tk.END, "-" * 50 + "\n")
             
-            if isinstance(item, dict):
+            if isinstance(item, Mapping):
                 content = yaml.dump(item, default_flow_style=False, allow_unicode=True)
             else:
                 content = str(item)
@@ -704,6 +1461,17 @@ priorität: ""
             else:
                 messagebox.showerror("Fehler", "Fehler beim Export")
     
+    def compile_snapshot(self):
+        """Kompiliert den binären Snapshot für rein lesende Nutzer"""
+        try:
+            info = self.assistant.compile_snapshot()
+        except OSError as e:
+            messagebox.showerror("Fehler", f"Fehler beim Kompilieren: {str(e)}")
+            return
+        messagebox.showinfo("Snapshot", f"{info['items']} Items, {info['tokens']} Suchbegriffe\n"
+                                        f"gespeichert in {self.assistant.snapshot_file}")
+        self.update_status("Snapshot kompiliert")
+    
     def import_framework(self):
         """Importiert ein Framework"""
         filename = filedialog.askopenfilename(
@@ -718,6 +1486,99 @@ priorität: ""
             else:
                 messagebox.showerror("Fehler", "Fehler beim Import")
     
+    def merge_import_framework(self):
+        """Führt ein Framework mit dem aktuellen zusammen"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("YAML files", "*.yaml"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            strategy = "theirs" if messagebox.askyesno(
+                "Merge-Import", "Bei Konflikten die importierten Werte übernehmen?\n"
+                "(Nein = aktuelle Werte behalten)") else "ours"
+            report = self.assistant.merge_framework_from_yaml(filename, strategy)
+            if report is None:
+                messagebox.showerror("Fehler", "Fehler beim Merge-Import")
+                return
+            
+            self.refresh_after_history_change()
+            
+            report_window = tk.Toplevel(self.root)
+            report_window.title("Merge-Bericht")
+            report_window.geometry("700x500")
+            
+            report_text = scrolledtext.ScrolledText(report_window, wrap=tk.WORD)
+            report_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            report_text.insert(tk.END, format_merge_report(report))
+            
+            self.update_status(f"Merge-Import: {len(report['added'])} neu, "
+                               f"{len(report['updated'])} aktualisiert, {len(report['conflicts'])} Konflikte")
+    
+    def show_revisions(self):
+        """Zeigt die Revisionen und vergleicht sie mit dem aktuellen Stand"""
+        revision_window = tk.Toplevel(self.root)
+        revision_window.title("Revisionen")
+        revision_window.geometry("900x600")
+        
+        ttk.Label(revision_window, text="Framework-Revisionen", 
+                 font=("Arial", 14, "bold")).pack(pady=10)
+        
+        main_frame = ttk.Frame(revision_window)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        left_frame = ttk.Frame(main_frame)
+        left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+        
+        revision_listbox = tk.Listbox(left_frame, width=40, height=20)
+        revision_listbox.pack(pady=(0, 10))
+        
+        diff_text = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD)
+        diff_text.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        
+        revisions = []
+        
+        def refresh_revisions():
+            revisions[:] = list(reversed(self.assistant.list_revisions()))
+            revision_listbox.delete(0, tk.END)
+            for entry in revisions:
+                label = f"{entry['created']}  {entry['id'][:8]}  {entry['message']}"
+                revision_listbox.insert(tk.END, label)
+        
+        def selected_revision():
+            selection = revision_listbox.curselection()
+            if not selection:
+                messagebox.showwarning("Warnung", "Bitte wählen Sie zuerst eine Revision aus.", parent=revision_window)
+                return None
+            return revisions[selection[0]]["id"]
+        
+        def create_revision():
+            self.assistant.create_revision("Manuell gespeichert")
+            refresh_revisions()
+            self.update_status("Revision gespeichert")
+        
+        def compare_revision():
+            revision_id = selected_revision()
+            if revision_id:
+                diff = self.assistant.compare_with_revision(revision_id)
+                diff_text.delete(1.0, tk.END)
+                diff_text.insert(tk.END, f"Revision {revision_id} → aktueller Stand\n")
+                diff_text.insert(tk.END, "=" * 50 + "\n")
+                diff_text.insert(tk.END, format_diff(diff))
+        
+        def restore_revision():
+            revision_id = selected_revision()
+            if revision_id and messagebox.askyesno(
+                    "Bestätigung", f"Revision {revision_id} wiederherstellen?", parent=revision_window):
+                self.assistant.restore_revision(revision_id)
+                self.refresh_after_history_change()
+                self.update_status(f"Revision {revision_id} wiederhergestellt")
+        
+        ttk.Button(left_frame, text="Revision anlegen", command=create_revision).pack(fill=tk.X, pady=2)
+        ttk.Button(left_frame, text="Mit Revision vergleichen", command=compare_revision).pack(fill=tk.X, pady=2)
+        ttk.Button(left_frame, text="Wiederherstellen", command=restore_revision).pack(fill=tk.X, pady=2)
+        
+        refresh_revisions()
+    
     def analyze_structure(self):
         """Analysiert die Framework-Struktur"""
         analysis = self.assistant.analyze_framework_structure()
@@ -751,12 +1612,22 @@ priorität: ""
                 analysis_text.insert(tk.END, f"⚠️ {category}: Keine Items vorhanden\n")
             elif count < 3:
                 analysis_text.insert(tk.END, f"💡 {category}: Könnte mehr Items vertragen ({count} vorhanden)\n")
+        
+        # Güte der automatischen Kategorie-Vorschläge
+        evaluation = self.assistant.evaluate_category_classifier()
+        analysis_text.insert(tk.END, "\nKategorie-Vorschläge:\n")
+        analysis_text.insert(tk.END, "=" * 30 + "\n")
+        if evaluation["accuracy"] is None:
+            analysis_text.insert(tk.END, "Zu wenige Items für eine Bewertung\n")
+        else:
+            analysis_text.insert(tk.END, f"Trefferquote: {evaluation['accuracy']:.0%} "
+                                         f"({evaluation['correct']}/{evaluation['test_size']} zurückgehaltene Items)\n")
     
     def analyze_gaps(self):
         """Analysiert Lücken im Framework"""
         gap_window = tk.Toplevel(self.root)
         gap_window.title("Lücken-Analyse")
-        gap_window.geometry("600x400")
+        gap_window.geometry("700x500")
         
         ttk.Label(gap_window, text="Framework Lücken-Analyse", 
                  font=("Arial", 14, "bold")).pack(pady=10)
@@ -791,30 +1662,162 @@ priorität: ""
             if len(items) < 2:
                 gap_text.insert(tk.END, f"⚠️ {category}: Nur {len(items)} Item(s)\n")
         
+        gap_text.insert(tk.END, "\nKonsistenzprüfung:\n")
+        gap_text.insert(tk.END, "=" * 35 + "\n")
+        issues = self.assistant.check_consistency()
+        gap_text.insert(tk.END, format_issues(issues))
+        
         gap_text.insert(tk.END, "\nEmpfohlene nächste Schritte:\n")
         gap_text.insert(tk.END, "=" * 35 + "\n")
         
         if missing_categories:
             gap_text.insert(tk.END, f"1. Fehlende Kategorien ergänzen: {', '.join(missing_categories)}\n")
         
+        if any(issue.severity == "error" for issue in issues):
+            gap_text.insert(tk.END, "1. Fehler aus der Konsistenzprüfung beheben\n")
+        
         gap_text.insert(tk.END, "2. Mehr Beispiele und Transferfälle hinzufügen\n")
         gap_text.insert(tk.END, "3. Semantic Gaps dokumentieren\n")
         gap_text.insert(tk.END, "4. Lessons Learned sammeln\n")
     
+    def show_indicator_trends(self):
+        """Zeigt Bewertungsrunden und Trends der Change-Indikatoren"""
+        try:
+            store = self.assistant.get_assessment_store()
+        except (RuntimeError, OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+        
+        trend_window = tk.Toplevel(self.root)
+        trend_window.title("Indikator-Trends")
+        trend_window.geometry("650x450")
+        
+        control_frame = ttk.Frame(trend_window)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        indicator_var = tk.StringVar()
+        indicator_combo = ttk.Combobox(control_frame, textvariable=indicator_var, state="readonly", width=25)
+        indicator_combo.pack(side=tk.LEFT)
+        ttk.Label(control_frame, text="Runden:").pack(side=tk.LEFT, padx=(10, 2))
+        rounds_var = tk.IntVar(value=3)
+        ttk.Spinbox(control_frame, from_=2, to=100, textvariable=rounds_var, width=4).pack(side=tk.LEFT)
+        direction_var = tk.StringVar(value="up")
+        ttk.Radiobutton(control_frame, text="steigend", variable=direction_var, value="up").pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Radiobutton(control_frame, text="fallend", variable=direction_var, value="down").pack(side=tk.LEFT)
+        
+        result_text = scrolledtext.ScrolledText(trend_window, wrap=tk.WORD)
+        result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def refresh_indicators():
+            indicator_combo['values'] = store.indicators
+            if store.indicators and indicator_var.get() not in store.indicators:
+                indicator_var.set(store.indicators[0])
+        
+        def show_trends(event=None):
+            result_text.delete(1.0, tk.END)
+            result_text.insert(tk.END, f"{len(store.projects)} Projekte, {len(store.rounds)} Runden"
+                                       f"{' (' + ', '.join(store.rounds[-5:]) + ')' if store.rounds else ''}\n\n")
+            if not indicator_var.get():
+                result_text.insert(tk.END, "Noch keine Bewertungsrunden erfasst.\n")
+                return
+            try:
+                results = self.assistant.get_indicator_trends(indicator_var.get(), rounds_var.get(),
+                                                              direction_var.get())
+            except (KeyError, tk.TclError) as e:
+                messagebox.showerror("Fehler", str(e))
+                return
+            if not results:
+                result_text.insert(tk.END, "Kein Projekt mit diesem Trend.\n")
+            for result in results:
+                latest = "-" if result["latest"] is None else f"{result['latest']:g}"
+                result_text.insert(tk.END, f"{result['slope']:+.2f}/Runde  {result['project']} (zuletzt {latest})\n")
+        
+        def import_round():
+            file_path = filedialog.askopenfilename(
+                title="Bewertungsrunde importieren (YAML: Projekt → Indikator → Wert)",
+                filetypes=[("YAML files", "*.yaml *.yml"), ("All files", "*.*")]
+            )
+            if not file_path:
+                return
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    assessments = yaml.load(f, Loader=YAML_LOADER)
+                if not isinstance(assessments, dict):
+                    raise ValueError("Erwartet wird eine Zuordnung Projekt → Indikator → Wert")
+                self.assistant.record_assessment_round(Path(file_path).stem, assessments)
+            except (OSError, ValueError, AttributeError, yaml.YAMLError) as e:
+                messagebox.showerror("Fehler", f"Fehler beim Import der Runde: {str(e)}")
+                return
+            refresh_indicators()
+            show_trends()
+            self.update_status(f"Bewertungsrunde '{Path(file_path).stem}' hinzugefügt")
+        
+        ttk.Button(control_frame, text="Anzeigen", command=show_trends).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="Runde importieren", command=import_round).pack(side=tk.RIGHT)
+        indicator_combo.bind('<<ComboboxSelected>>', show_trends)
+        refresh_indicators()
+        show_trends()
+    
+    def show_visualization(self):
+        """Zeigt die Framework-Struktur grafisch an (Layout im Hintergrund)"""
+        vis_window = tk.Toplevel(self.root)
+        vis_window.title("Framework-Visualisierung")
+        vis_window.geometry("1000x700")
+        
+        control_frame = ttk.Frame(vis_window)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        status_var = tk.StringVar(value="Layout wird berechnet...")
+        ttk.Label(control_frame, textvariable=status_var).pack(side=tk.LEFT)
+        
+        def export(fmt):
+            filename = filedialog.asksaveasfilename(
+                parent=vis_window,
+                defaultextension=f".{fmt}",
+                filetypes=[(f"{fmt.upper()} files", f"*.{fmt}"), ("All files", "*.*")]
+            )
+            if filename:
+                export_path = self.assistant.export_framework_visualization(filename, fmt)
+                if export_path:
+                    self.update_status(f"Visualisierung exportiert nach {export_path}")
+                else:
+                    messagebox.showerror("Fehler", "Fehler beim Export", parent=vis_window)
+        
+        ttk.Button(control_frame, text="DOT Export", command=lambda: export("dot")).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text="SVG Export", command=lambda: export("svg")).pack(side=tk.RIGHT, padx=5)
+        
+        vis_canvas = FrameworkCanvas(vis_window)
+        vis_canvas.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        def on_layout(result):
+            if not vis_window.winfo_exists():
+                return
+            if isinstance(result, Exception):
+                status_var.set(f"Fehler beim Layout: {result}")
+                return
+            vis_canvas.set_layout(result)
+            status_var.set(f"{len(result.tree)} Knoten - Ziehen zum Verschieben, Mausrad zum Zoomen")
+        
+        LayoutWorker(self.assistant.framework_data).start().poll(self.root, on_layout)
+    
     def import_file(self):
         """Importiert eine Datei und erstellt automatisch ein Item"""
         file_path = filedialog.askopenfilename(
             title="Datei für Import auswählen",
             filetypes=[
-                ("Alle unterstützten", "*.txt;*.yaml;*.yml;*.py"),
+                ("Alle unterstützten", "*.txt;*.yaml;*.yml;*.py;*.pdf"),
                 ("Text-Dateien", "*.txt"),
                 ("YAML-Dateien", "*.yaml;*.yml"),
                 ("Python-Dateien", "*.py"),
+                ("PDF-Dokumente", "*.pdf"),
                 ("Alle Dateien", "*.*")
             ]
         )
         
-        if file_path:
+        if file_path and Path(file_path).suffix.lower() in PDF_EXTENSIONS:
+            # PDFs lassen sich nicht als ein Item lesen: in Kandidaten zerlegen
+            self.show_document_import_dialog(file_path)
+        elif file_path:
             try:
                 # Datei importieren und analysieren
                 item_data = self.assistant.import_file_content(file_path)
@@ -826,6 +1829,136 @@ priorität: ""
             except Exception as e:
                 messagebox.showerror("Import-Fehler", f"Fehler beim Importieren der Datei:\n{str(e)}")
     
+    def import_document(self):
+        """Zerlegt ein PDF oder einen Textexport (Folien, Dokumente) in Items"""
+        file_path = filedialog.askopenfilename(
+            title="Dokument für Import auswählen",
+            filetypes=[
+                ("Dokumente", "*.pdf;*.txt;*.md"),
+                ("PDF-Dokumente", "*.pdf"),
+                ("Textexporte", "*.txt;*.md"),
+                ("Alle Dateien", "*.*")
+            ]
+        )
+        if file_path:
+            self.show_document_import_dialog(file_path)
+    
+    def show_document_import_dialog(self, file_path: str):
+        """Prüfdialog für den Dokument-Import, füllt sich Seite für Seite"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Dokument-Import: {Path(file_path).name}")
+        dialog.geometry("900x600")
+        
+        ttk.Label(dialog, text="Dokument-Import", font=("Arial", 14, "bold")).pack(pady=10)
+        progress_var = tk.StringVar(value="Extrahiere Seiten …")
+        ttk.Label(dialog, textvariable=progress_var).pack(anchor=tk.W, padx=10)
+        
+        paned = ttk.PanedWindow(dialog, orient=tk.HORIZONTAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        list_frame = ttk.Frame(paned)
+        paned.add(list_frame, weight=1)
+        candidate_listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED)
+        list_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=candidate_listbox.yview)
+        candidate_listbox.configure(yscrollcommand=list_scroll.set)
+        candidate_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        list_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        preview_frame = ttk.Frame(paned)
+        paned.add(preview_frame, weight=1)
+        category_frame = ttk.Frame(preview_frame)
+        category_frame.pack(fill=tk.X)
+        ttk.Label(category_frame, text="Kategorie:").pack(side=tk.LEFT)
+        category_var = tk.StringVar()
+        category_combo = ttk.Combobox(category_frame, textvariable=category_var, width=20)
+        category_combo['values'] = list(self.category_mapping.keys())
+        category_combo.pack(side=tk.LEFT, padx=(5, 0))
+        preview_text = scrolledtext.ScrolledText(preview_frame, wrap=tk.WORD, height=15)
+        preview_text.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        candidates: List[Dict[str, Any]] = []
+        imported: set = set()
+        worker = DocumentImportWorker(file_path)
+        
+        def row_text(position: int) -> str:
+            candidate = candidates[position]
+            marker = "✓ " if position in imported else ""
+            return f"{marker}S. {candidate['page']} | {candidate['title']} → {candidate['suggested_category']}"
+        
+        def on_page(result):
+            if not dialog.winfo_exists():
+                worker.cancel()
+                return
+            if isinstance(result, Exception):
+                progress_var.set(f"Fehler: {result}")
+                messagebox.showerror("Import-Fehler", f"Fehler beim Lesen des Dokuments:\n{result}", parent=dialog)
+                return
+            if result is None:
+                progress_var.set(f"Fertig: {len(candidates)} Kandidaten")
+                return
+            page, page_count, page_candidates = result
+            # Klassifikation im GUI-Thread, der Hintergrund-Thread liefert nur Text
+            self.assistant.classify_document_candidates(page_candidates, Path(file_path).suffix.lower())
+            for candidate in page_candidates:
+                candidates.append(candidate)
+                candidate_listbox.insert(tk.END, row_text(len(candidates) - 1))
+            progress_var.set(f"Seite {page} / {page_count} – {len(candidates)} Kandidaten")
+        
+        def on_select(event=None):
+            selection = candidate_listbox.curselection()
+            if len(selection) != 1:
+                return
+            candidate = candidates[selection[0]]
+            category_var.set(candidate["suggested_category"])
+            preview_text.delete(1.0, tk.END)
+            preview_text.insert(tk.END, f"{candidate['title']}\n\n{candidate['text']}")
+        
+        def on_category_change(event=None):
+            category = self.category_mapping.get(category_var.get(), category_var.get())
+            for position in candidate_listbox.curselection():
+                candidates[position]["suggested_category"] = category
+                candidate_listbox.delete(position)
+                candidate_listbox.insert(position, row_text(position))
+                candidate_listbox.selection_set(position)
+        
+        def import_candidates(positions):
+            positions = [position for position in positions if position not in imported]
+            if not positions:
+                return
+            count_before = len(imported)
+            try:
+                for position in positions:
+                    candidate = candidates[position]
+                    self.assistant.add_item_to_category(candidate["suggested_category"],
+                                                        candidate_item(candidate, file_path))
+                    imported.add(position)
+                    candidate_listbox.delete(position)
+                    candidate_listbox.insert(position, row_text(position))
+            except Exception as e:
+                messagebox.showerror("Fehler", f"Fehler beim Importieren: {str(e)}", parent=dialog)
+            self.refresh_categories()
+            self.refresh_items()
+            self.update_status(f"{len(imported) - count_before} Items aus {Path(file_path).name} importiert")
+        
+        def close():
+            worker.cancel()
+            dialog.destroy()
+        
+        candidate_listbox.bind('<<ListboxSelect>>', on_select)
+        category_combo.bind('<<ComboboxSelected>>', on_category_change)
+        category_combo.bind('<Return>', on_category_change)
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(button_frame, text="Ausgewählte importieren",
+                   command=lambda: import_candidates(candidate_listbox.curselection())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Alle importieren",
+                   command=lambda: import_candidates(range(len(candidates)))).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Schließen", command=close).pack(side=tk.RIGHT, padx=5)
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        
+        worker.start().poll(self.root, on_page)
+    
     def show_import_dialog(self, item_data: Dict[str, Any], suggested_category: str):
         """Zeigt Dialog für Import-Bestätigung"""
         dialog = tk.Toplevel(self.root)
@@ -852,13 +1985,14 @@ priorität: ""
         preview_text = scrolledtext.ScrolledText(dialog, wrap=tk.WORD, height=15)
         preview_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Vorschau befüllen
-        preview_content = yaml.dump(item_data, default_flow_style=False, allow_unicode=True)
+        # Vorschau befüllen (große Felder als Platzhalter)
+        preview_content, large_fields = render_outline(item_data)
         preview_text.insert(tk.END, preview_content)
         
         # Buttons
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.add_large_field_buttons(button_frame, large_fields)
         
         def import_item():
             selected_category = self.category_mapping.get(category_var.get(), category_var.get())
@@ -866,7 +2000,7 @@ priorität: ""
             # Item-Daten aus Vorschau lesen
             try:
                 updated_content = preview_text.get(1.0, tk.END).strip()
-                final_item_data = yaml.safe_load(updated_content)
+                final_item_data = restore_large_fields(yaml.safe_load(updated_content), large_fields)
                 
                 # Item hinzufügen
                 self.assistant.add_item_to_category(selected_category, final_item_data)
@@ -1004,13 +2138,71 @@ semantic_rules:
         grabber_listbox.insert(tk.END, "LIFE Framework Grabber")
         grabber_listbox.insert(tk.END, "Process Grabber")
     
+    def process_external_changes(self):
+        """Übernimmt extern geänderte Daten im GUI-Thread (nur betroffene Listen)"""
+        try:
+            while True:
+                update = self.external_updates.get_nowait()
+                if not self.assistant.apply_external_changes(update):
+                    # Zwischenzeitlich lokal geändert: im Hintergrund neu diffen
+                    threading.Thread(target=self._recheck_external_changes, daemon=True).start()
+                    continue
+                self.refresh_external_changes(update["changes"])
+        except queue.Empty:
+            pass
+        self.root.after(500, self.process_external_changes)
+    
+    def _recheck_external_changes(self):
+        update = self.assistant.check_external_changes()
+        if update is not None:
+            self.external_updates.put(update)
+    
+    def refresh_external_changes(self, changes):
+        """Aktualisiert nur die von externen Änderungen betroffenen Ansichten"""
+        if not changes:
+            return
+        
+        actions = {change.action for change in changes}
+        changed_categories = {change.category for change in changes if change.category}
+        
+        if actions & {"remove_category", "restore_category"}:
+            self.refresh_categories()
+            if self.current_category not in self.assistant.get_framework_categories():
+                self.current_category = None
+                self.current_item_index = None
+                self.item_listbox.delete(0, tk.END)
+                self.detail_view.clear()
+        
+        if self.current_category in changed_categories:
+            touched = {change.index for change in changes if change.category == self.current_category}
+            structural = any(change.action in ("add", "delete", "remove_category", "restore_category")
+                             for change in changes if change.category == self.current_category)
+            self.refresh_items()
+            items = self.assistant.get_category_items(self.current_category)
+            if self.current_item_index is not None:
+                if self.current_item_index >= len(items):
+                    self.current_item_index = None
+                    self.detail_view.clear()
+                elif structural or self.current_item_index in touched:
+                    self.show_item_content()
+        
+        self.update_status(f"Externe Änderungen übernommen ({len(changes)})")
+    
     def update_status(self, message: str):
         """Aktualisiert die Statuszeile"""
         self.status_var.set(f"{message} - {datetime.now().strftime('%H:%M:%S')}")
     
     def run(self):
         """Startet die GUI"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.assistant.close()
+    
+    def on_close(self):
+        """Schreibt ausstehende Änderungen und schließt das Fenster"""
+        self.assistant.close()
+        self.root.destroy()
 
 def main():
     """Hauptfunktion"""
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Merge-Import
+============================
+Führt ein importiertes Framework mit dem aktuellen zusammen, statt es zu
+ersetzen. Items werden pro Kategorie per Hash-Join über ID/Name abgeglichen
+(linear in der Anzahl Items), neue Items ergänzt, geänderte aktualisiert und
+Konflikte (Feld in beiden Ständen mit unterschiedlichem Wert) gemeldet.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Any, Tuple
+
+from codebook_references import item_key
+from codebook_revisions import content_hash
+
+STRATEGY_THEIRS = "theirs"  # Importierter Wert gewinnt bei Konflikten
+STRATEGY_OURS = "ours"      # Aktueller Wert bleibt bei Konflikten erhalten
+
+
+def merge_values(ours: Any, theirs: Any, strategy: str, path: str,
+                 conflicts: List[Tuple[str, Any, Any]]) -> Any:
+    """Führt zwei Werte zusammen; Dicts rekursiv, alles andere atomar"""
+    if isinstance(ours, Mapping) and isinstance(theirs, Mapping):
+        merged = dict(ours)
+        for key, value in theirs.items():
+            child = f"{path}.{key}" if path else str(key)
+            if key not in ours:
+                merged[key] = value
+            elif ours[key] != value:
+                merged[key] = merge_values(ours[key], value, strategy, child, conflicts)
+        return merged
+
+    if ours == theirs:
+        return ours
+    conflicts.append((path, ours, theirs))
+    return theirs if strategy == STRATEGY_THEIRS else ours
+
+
+def merge_category(category: str, current_items: List[Any], imported_items: List[Any],
+                   strategy: str, report: Dict[str, Any]) -> List[Any]:
+    """Hash-Join der Items einer Kategorie über ihren Schlüssel"""
+    merged = list(current_items)
+
+    # Index der aktuellen Items: Schlüssel -> Positionen (Duplikate möglich)
+    by_key: Dict[Any, List[int]] = {}
+    by_hash: Dict[str, List[int]] = {}
+    for i, item in enumerate(current_items):
+        key = item_key(category, item)
+        if key is not None:
+            by_key.setdefault(key, []).append(i)
+        else:
+            by_hash.setdefault(content_hash(item), []).append(i)
+
+    for item in imported_items:
+        key = item_key(category, item)
+        if key is None:
+            # Ohne Schlüssel nur exakte Duplikate erkennen
+            positions = by_hash.get(content_hash(item))
+            if positions:
+                positions.pop(0)
+                report["unchanged"] += 1
+            else:
+                merged.append(item)
+                report["added"].append((category, None))
+            continue
+
+        positions = by_key.get(key)
+        if not positions:
+            merged.append(item)
+            report["added"].append((category, key))
+            continue
+
+        position = positions.pop(0)
+        current = merged[position]
+        if current == item:
+            report["unchanged"] += 1
+            continue
+
+        conflicts: List[Tuple[str, Any, Any]] = []
+        merged[position] = merge_values(current, item, strategy, "", conflicts)
+        if merged[position] != current:
+            report["updated"].append((category, key))
+        else:
+            report["unchanged"] += 1
+        for path, ours, theirs in conflicts:
+            report["conflicts"].append({"category": category, "key": key, "path": path,
+                                        "ours": ours, "theirs": theirs})
+
+    return merged
+
+
+def merge_frameworks(current_data: Dict[str, Any], imported_data: Dict[str, Any],
+                     strategy: str = STRATEGY_THEIRS) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Führt zwei Framework-Stände zusammen
+
+    Gibt (zusammengeführte Daten, Bericht) zurück. Unveränderte Kategorien und
+    Items werden nicht kopiert, sondern mit dem aktuellen Stand geteilt.
+    """
+    if strategy not in (STRATEGY_THEIRS, STRATEGY_OURS):
+        raise ValueError(f"Unbekannte Merge-Strategie: {strategy}")
+
+    current = current_data.get("framework", {}) if isinstance(current_data, dict) else {}
+    imported = imported_data.get("framework", {}) if isinstance(imported_data, dict) else {}
+    report: Dict[str, Any] = {"added": [], "updated": [], "unchanged": 0,
+                              "conflicts": [], "categories_added": [], "meta_updated": []}
+
+    framework = dict(current)
+    for category, items in imported.items():
+        if category == "meta":
+            # Die Metadaten des aktuellen Frameworks bleiben maßgeblich
+            continue
+
+        if category == "category_meta":
+            conflicts: List[Tuple[str, Any, Any]] = []
+            current_meta = current.get("category_meta") or {}
+            framework["category_meta"] = merge_values(current_meta, items or {}, strategy, "", conflicts)
+            report["meta_updated"] = [key for key, value in framework["category_meta"].items()
+                                      if current_meta.get(key) != value]
+            for path, ours, theirs in conflicts:
+                report["conflicts"].append({"category": "category_meta", "key": path.split(".")[0],
+                                            "path": path, "ours": ours, "theirs": theirs})
+            continue
+
+        imported_items = items if isinstance(items, list) else [items]
+        if category not in current:
+            framework[category] = list(imported_items)
+            report["categories_added"].append(category)
+            for item in imported_items:
+                report["added"].append((category, item_key(category, item)))
+            continue
+
+        current_items = current[category] if isinstance(current[category], list) else [current[category]]
+        framework[category] = merge_category(category, current_items, imported_items, strategy, report)
+
+    merged_data = dict(current_data) if isinstance(current_data, dict) else {}
+    merged_data["framework"] = framework
+    return merged_data, report
+
+
+def format_merge_report(report: Dict[str, Any]) -> str:
+    """Lesbare Zusammenfassung eines Merge-Berichts"""
+    lines = [
+        f"Neue Items: {len(report['added'])}",
+        f"Aktualisierte Items: {len(report['updated'])}",
+        f"Unverändert: {report['unchanged']}",
+        f"Konflikte: {len(report['conflicts'])}",
+    ]
+    if report["categories_added"]:
+        lines.append(f"Neue Kategorien: {', '.join(report['categories_added'])}")
+    if report["meta_updated"]:
+        lines.append(f"Geänderte Kategorie-Metadaten: {', '.join(report['meta_updated'])}")
+    if report["conflicts"]:
+        lines.append("")
+        lines.append("Konflikte:")
+        for conflict in report["conflicts"]:
+            lines.append(f"  {conflict['category']}:{conflict['key']} {conflict['path']}: "
+                         f"{conflict['ours']!r} ↔ {conflict['theirs']!r}")
+    return "\n".join(lines)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Kompaktes Item-Modell
+=====================================
+Items werden statt als generische Dicts als ``__slots__``-Objekte gehalten.
+Die Klassen werden aus den Kategorie-Templates erzeugt, Feldnamen und kurze
+Strings werden interniert. Unbekannte Felder landen in einem Overflow-Dict
+und bleiben beim Speichern erhalten.
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping, Sequence
+from typing import Dict, Any, Optional, Tuple
+
+import yaml
+
+# Templates für neue Items (werden auch im Item-Editor verwendet)
+CATEGORY_TEMPLATES = {
+    "prinzipien": """id: ""
+name: ""
+beschreibung: ""
+hauptziele:
+  - ""
+schritte:
+  - ""
+regeln:
+  - id: ""
+    text: ""
+heuristiken:
+  - ""
+narrative_beispiele:
+  - ""
+transferbeispiele:
+  - kontext: ""
+    regel: ""
+    beispiel: ""
+semantic_gaps:
+  - beschreibung: ""
+    schwellenwert: ""
+    lösung: ""
+lessons_learned:
+  - ""
+""",
+    "regeln": """id: ""
+text: ""
+kontext: ""
+beispiel: ""
+""",
+    "heuristiken": """regel: ""
+wann: ""
+beispiel: ""
+""",
+    "rollen": """name: ""
+aufgaben:
+  - ""
+verantwortlichkeiten:
+  - ""
+interaktionen:
+  - ""
+""",
+    "prozesse": """name: ""
+schritte:
+  - ""
+beteiligte:
+  - ""
+ziele:
+  - ""
+""",
+    "beispiele": """name: ""
+ausgangslage: ""
+transformation: ""
+lessons_learned:
+  - ""
+""",
+    "transferbeispiele": """kontext: ""
+regel: ""
+beispiel: ""
+""",
+    "semantic_gaps": """beschreibung: ""
+schwellenwert: ""
+lösung: ""
+""",
+    "lessons_learned": """kategorie: ""
+erfahrung: ""
+empfehlung: ""
+""",
+    "open_questions": """frage: ""
+kontext: ""
+priorität: ""
+"""
+}
+
+DEFAULT_TEMPLATE = "# Neues Item\nname: \"\"\nbeschreibung: \"\"\n"
+
+# Strings bis zu dieser Länge werden interniert (IDs, Namen, Marker-Werte, ...)
+MAX_INTERN_LENGTH = 64
+# Obergrenze für dynamisch erzeugte Klassen (verschachtelte Dicts, eigene Kategorien)
+MAX_SHAPE_CLASSES = 512
+MAX_SHAPE_FIELDS = 32
+
+_MISSING = object()
+
+
+class CompactItem(MutableMapping):
+    """Basisklasse für kompakte Items; verhält sich wie ein Dict"""
+
+    __slots__ = ("_extra",)
+    _fields: Tuple[str, ...] = ()
+    _slot_names: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+    _index_of: Dict[str, int] = {}
+
+    def __init__(self, data: Optional[Mapping] = None):
+        self._extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[sys.intern(key) if isinstance(key, str) else key] = value
+
+    def __delitem__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            if getattr(self, slot, _MISSING) is _MISSING:
+                raise KeyError(key)
+            delattr(self, slot)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for field, slot in zip(self._fields, self._slot_names):
+            if getattr(self, slot, _MISSING) is not _MISSING:
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        count = sum(1 for slot in self._slot_names if getattr(self, slot, _MISSING) is not _MISSING)
+        return count + (len(self._extra) if self._extra is not None else 0)
+
+    def __contains__(self, key):
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            return getattr(self, slot, _MISSING) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __reduce__(self):
+        # Dynamisch erzeugte Klassen sind nicht per Name importierbar,
+        # beim Pickeln (z.B. für Prozess-Pools) wird daher ein Dict übertragen
+        return (dict, (to_plain(self),))
+
+    def copy(self) -> "CompactItem":
+        return type(self)(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wandelt das Item (rekursiv) in ein normales Dict um"""
+        return to_plain(self)
+
+
+def make_item_class(name: str, fields: Tuple[str, ...]) -> type:
+    """Erzeugt eine Item-Klasse mit einem Slot pro Feld"""
+    fields = tuple(sys.intern(field) for field in fields)
+    # Slots werden nummeriert, damit auch Feldnamen wie "do's" möglich sind
+    slot_names = tuple(f"_{i}" for i in range(len(fields)))
+    return type(name, (CompactItem,), {
+        "__module__": __name__,
+        "__slots__": slot_names,
+        "_fields": fields,
+        "_slot_names": slot_names,
+        "_slot_of": dict(zip(fields, slot_names)),
+        "_index_of": {field: i for i, field in enumerate(fields)},
+    })
+
+
+def _template_fields(template: str) -> Tuple[str, ...]:
+    data = yaml.safe_load(template)
+    return tuple(data.keys()) if isinstance(data, dict) else ()
+
+
+CATEGORY_ITEM_CLASSES: Dict[str, type] = {
+    category: make_item_class(f"{category.title().replace('_', '')}Item", _template_fields(template))
+    for category, template in CATEGORY_TEMPLATES.items()
+}
+
+_SHAPE_CLASSES: Dict[Tuple[str, ...], type] = {}
+
+
+def _shape_class(keys: Tuple[Any, ...], name: str = "ShapeItem") -> Optional[type]:
+    """Klasse für Dicts mit wiederkehrender Schlüsselfolge (z.B. regeln: id/text)"""
+    item_class = _SHAPE_CLASSES.get(keys)
+    if item_class is None:
+        if (len(_SHAPE_CLASSES) >= MAX_SHAPE_CLASSES or len(keys) > MAX_SHAPE_FIELDS
+                or not all(isinstance(key, str) for key in keys)):
+            return None
+        item_class = make_item_class(name, keys)
+        _SHAPE_CLASSES[keys] = item_class
+    return item_class
+
+
+def _category_class(category: str, value: Mapping) -> Optional[type]:
+    """Template-Klasse der Kategorie bzw. eine Variante mit der Feldfolge des Items"""
+    item_class = CATEGORY_ITEM_CLASSES.get(category)
+    if item_class is None:
+        return None
+
+    position = -1
+    for key in value.keys():
+        index = item_class._index_of.get(key)
+        if index is None or index < position:
+            break
+        position = index
+    else:
+        return item_class
+
+    # Zusätzliche Felder (z.B. "marker") oder abweichende Reihenfolge: eigene
+    # Slot-Klasse, damit die Feldfolge beim Speichern erhalten bleibt; erst wenn
+    # zu viele Varianten existieren, landen Zusatzfelder im Overflow-Dict
+    return _shape_class(tuple(value.keys()), item_class.__name__) or item_class
+
+
+def compact_value(value: Any, category: Optional[str] = None) -> Any:
+    """Wandelt einen Wert rekursiv in die kompakte Darstellung um"""
+    if isinstance(value, CompactItem):
+        return value
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= MAX_INTERN_LENGTH else value
+    if isinstance(value, list):
+        return [compact_value(entry) for entry in value]
+    if isinstance(value, Mapping):
+        item_class = _category_class(category, value) if category else None
+        if item_class is None:
+            item_class = _shape_class(tuple(value.keys()))
+        converted = item_class() if item_class is not None else {}
+        for key, entry in value.items():
+            converted[sys.intern(key) if isinstance(key, str) else key] = compact_value(entry)
+        return converted
+    return value
+
+
+def compact_framework(framework_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Wandelt alle Items der Framework-Daten um (meta/category_meta bleiben Dicts)"""
+    framework = framework_data.get("framework") if isinstance(framework_data, dict) else None
+    if not isinstance(framework, dict):
+        return framework_data
+
+    for category, items in framework.items():
+        if category in ("meta", "category_meta") or not isinstance(items, list):
+            continue
+        framework[category] = [compact_value(item, category) for item in items]
+    return framework_data
+
+
+def is_item_list(value: Any) -> bool:
+    """Liste von Items (auch die schreibgeschützten Kategorien eines Snapshots)"""
+    return isinstance(value, list) or (isinstance(value, Sequence) and not isinstance(value, (str, bytes)))
+
+
+def to_plain(value: Any) -> Any:
+    """Rekursive Rückwandlung in Dicts und Listen"""
+    if isinstance(value, Mapping):
+        return {key: to_plain(entry) for key, entry in value.items()}
+    if is_item_list(value):
+        return [to_plain(entry) for entry in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """default-Funktion für json.dumps"""
+    if isinstance(value, Mapping):
+        return dict(value.items())
+    return str(value)
+
+
+def _represent_compact_item(dumper, data):
+    return dumper.represent_dict(data)
+
+
+for _dumper in (yaml.Dumper, yaml.SafeDumper):
+    yaml.add_multi_representer(CompactItem, _represent_compact_item, Dumper=_dumper)
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Abfragesprache
+==============================
+Strukturierte Abfragen über Felder und Marker-Werte, z.B.
+
+    prinzipien where team_cohesion >= 4
+    regeln ohne beispiel
+    open_questions wo priorität = hoch
+    prinzipien, regeln where name ~ nutzer und id != R1
+
+Aufbau: ``<Kategorien|*> [where|wo] <Bedingung> [and|und <Bedingung>]...``.
+Bedingungen sind ``feld op wert`` (op: = != < <= > >= ~), ``mit feld`` oder
+``ohne feld``. Felder dürfen verschachtelt sein (``transferbeispiele.kontext``);
+ein unbekanntes Feld wird unter den Markern des Items gesucht.
+
+Für häufige Abfragen lassen sich Sekundärindizes je Kategorie und Feld anlegen
+(Hash für Gleichheit, sortiert für Bereiche); der Planer nutzt den
+selektivsten vorhandenen Index und prüft die übrigen Bedingungen am Item.
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Set, Tuple, NamedTuple
+
+from codebook_model import is_item_list
+from codebook_search import normalize_text
+
+SKIP_CATEGORIES = ("meta", "category_meta")
+KEYWORDS_WHERE = ("where", "wo")
+KEYWORDS_AND = ("and", "und")
+KEYWORDS_WITH = ("with", "mit")
+KEYWORDS_WITHOUT = ("without", "ohne")
+OPERATORS = {"=": "=", "==": "=", "!=": "!=", "<": "<", "<=": "<=", "≤": "<=",
+             ">": ">", ">=": ">=", "≥": ">=", "~": "~"}
+INDEX_HASH = "hash"
+INDEX_SORTED = "sorted"
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(?P<string>"[^"]*"|\'[^\']*\')|(?P<op>==|!=|<=|>=|[=<>~≤≥])'
+                           r'|(?P<comma>,)|(?P<word>[^\s,=!<>~≤≥"\']+))')
+QUERY_PATTERN = re.compile(r'^\s*(\*|[\w,\s]+?)\s+(%s)\b' % "|".join(
+    KEYWORDS_WHERE + KEYWORDS_WITH + KEYWORDS_WITHOUT), re.IGNORECASE)
+
+
+class QueryError(ValueError):
+    """Ungültige Abfrage"""
+
+
+class Predicate(NamedTuple):
+    field: str
+    op: str       # = != < <= > >= ~ with without
+    value: Any
+
+
+class Query(NamedTuple):
+    categories: Optional[List[str]]  # None = alle Kategorien
+    predicates: List[Predicate]
+
+
+# ----------------------------------------------------------------------
+# Parser
+# ----------------------------------------------------------------------
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unerwartetes Zeichen an Position {position}: {text[position:]!r}")
+        position = match.end()
+        if match.group("string") is not None:
+            tokens.append(("value", match.group("string")[1:-1]))
+        elif match.group("op") is not None:
+            tokens.append(("op", OPERATORS[match.group("op")]))
+        elif match.group("comma") is not None:
+            tokens.append(("comma", ","))
+        elif match.group("word") is not None:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+def _literal(token: Tuple[str, Any]) -> Any:
+    kind, text = token
+    if kind == "value":
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def is_query(text: str, categories: Optional[List[str]] = None) -> bool:
+    """Sieht der Text wie eine Abfrage aus (statt wie ein Suchbegriff)?
+
+    Mit ``categories`` zählt er nur als Abfrage, wenn alle Wörter vor dem
+    Schlüsselwort vorhandene Kategorien oder ``*`` sind – "Arbeit mit Team"
+    bleibt so ein Suchbegriff.
+    """
+    match = QUERY_PATTERN.match(text)
+    if match is None:
+        return False
+    if categories is None:
+        return True
+    known = {category.lower() for category in categories} | {"*", "alle", "all"}
+    words = match.group(1).replace(",", " ").split()
+    return bool(words) and all(word.lower() in known for word in words)
+
+
+def parse_query(text: str) -> Query:
+    """Zerlegt eine Abfrage; wirft QueryError bei Syntaxfehlern"""
+    tokens = _tokenize(text)
+    position = 0
+
+    def peek_word() -> Optional[str]:
+        if position < len(tokens) and tokens[position][0] == "word":
+            return tokens[position][1].lower()
+        return None
+
+    # Kategorien bis zum ersten Schlüsselwort
+    categories: Optional[List[str]] = []
+    while position < len(tokens):
+        kind, text_value = tokens[position]
+        word = peek_word()
+        if word in KEYWORDS_WHERE + KEYWORDS_WITH + KEYWORDS_WITHOUT:
+            break
+        if kind == "comma":
+            position += 1
+            continue
+        if kind != "word":
+            raise QueryError(f"Kategorie erwartet, gefunden: {text_value!r}")
+        categories.append(text_value)
+        position += 1
+    if not categories:
+        raise QueryError("Keine Kategorie angegeben (alle Kategorien: *)")
+    if categories in (["*"], ["alle"], ["all"]):
+        categories = None
+
+    if peek_word() in KEYWORDS_WHERE:
+        position += 1
+
+    predicates: List[Predicate] = []
+    while position < len(tokens):
+        word = peek_word()
+        if word in KEYWORDS_WITH + KEYWORDS_WITHOUT:
+            if position + 1 >= len(tokens) or tokens[position + 1][0] != "word":
+                raise QueryError(f"Feldname nach '{word}' erwartet")
+            op = "with" if word in KEYWORDS_WITH else "without"
+            predicates.append(Predicate(tokens[position + 1][1], op, None))
+            position += 2
+        else:
+            if (position + 2 >= len(tokens) or tokens[position][0] != "word"
+                    or tokens[position + 1][0] != "op" or tokens[position + 2][0] not in ("word", "value")):
+                raise QueryError("Bedingung der Form 'feld op wert' erwartet")
+            predicates.append(Predicate(tokens[position][1], tokens[position + 1][1],
+                                        _literal(tokens[position + 2])))
+            position += 3
+
+        if position < len(tokens):
+            if peek_word() not in KEYWORDS_AND:
+                raise QueryError(f"'and' erwartet, gefunden: {tokens[position][1]!r}")
+            position += 1
+            if position >= len(tokens):
+                raise QueryError("Bedingung nach 'and' erwartet")
+
+    if not predicates:
+        raise QueryError("Mindestens eine Bedingung erwartet")
+    return Query(categories, predicates)
+
+
+# ----------------------------------------------------------------------
+# Auswertung
+# ----------------------------------------------------------------------
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def _normalized_name(name: str) -> str:
+    return normalize_text(name)
+
+
+def _child(mapping: Mapping, name: str) -> Any:
+    value = mapping.get(name, _MISSING)
+    if value is not _MISSING:
+        return value
+    target = _normalized_name(name)
+    for key in mapping:
+        if isinstance(key, str) and _normalized_name(key) == target:
+            return mapping[key]
+    return _MISSING
+
+
+def field_values(item: Any, field: str) -> List[Any]:
+    """Alle Werte eines (ggf. verschachtelten) Felds; Listen werden aufgelöst"""
+    values = [item]
+    for part in field.split("."):
+        found = []
+        for value in values:
+            candidates = value if isinstance(value, list) else [value]
+            for candidate in candidates:
+                if isinstance(candidate, Mapping):
+                    child = _child(candidate, part)
+                    if child is not _MISSING:
+                        found.append(child)
+        values = found
+
+    if not values and "." not in field and isinstance(item, Mapping):
+        # Unbekanntes Feld: Marker-Wert gleichen Namens ("team_cohesion")
+        markers = item.get("marker")
+        if markers is not None:
+            values = field_values({"marker": markers}, f"marker.{field}")
+
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(value)
+        else:
+            flat.append(value)
+    return flat
+
+
+def is_empty(value: Any) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, (list, Mapping)):
+        entries = value.values() if isinstance(value, Mapping) else value
+        return all(is_empty(entry) for entry in entries)
+    return False
+
+
+def index_key(value: Any) -> Optional[Tuple[int, Any]]:
+    """Vergleichsschlüssel: (0, Zahl) oder (1, normalisierter Text); None für Verschachteltes"""
+    if isinstance(value, bool):
+        return (1, "true" if value else "false")
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return (0, float(text) if any(char in text for char in ".eE") else int(text))
+        except ValueError:
+            return (1, normalize_text(text))
+    if value is None or isinstance(value, (list, Mapping)):
+        return None
+    return (1, normalize_text(str(value)))
+
+
+def _compare(op: str, actual: Tuple[int, Any], expected: Tuple[int, Any]) -> bool:
+    if op == "~":
+        return actual[0] == 1 and expected[0] == 1 and expected[1] in actual[1]
+    if actual[0] != expected[0]:
+        return False
+    if op == "=":
+        return actual[1] == expected[1]
+    if op == "<":
+        return actual[1] < expected[1]
+    if op == "<=":
+        return actual[1] <= expected[1]
+    if op == ">":
+        return actual[1] > expected[1]
+    return actual[1] >= expected[1]
+
+
+def matches(item: Any, predicate: Predicate) -> bool:
+    """Erfüllt das Item die Bedingung? (Bei mehreren Werten genügt einer)"""
+    values = field_values(item, predicate.field)
+    if predicate.op == "with":
+        return not is_empty(values)
+    if predicate.op == "without":
+        return is_empty(values)
+
+    expected = index_key(predicate.value)
+    if predicate.op == "!=":
+        # Ungleich: kein einziger Wert darf gleich sein (fehlendes Feld zählt als ungleich)
+        return not any(key == expected for key in map(index_key, values) if key is not None)
+    return any(_compare(predicate.op, key, expected)
+               for key in map(index_key, values) if key is not None)
+
+
+# ----------------------------------------------------------------------
+# Sekundärindizes
+# ----------------------------------------------------------------------
+
+class FieldIndex:
+    """Index über ein Feld einer Kategorie (Hash oder sortiert)"""
+
+    def __init__(self, field: str, kind: str = INDEX_HASH):
+        if kind not in (INDEX_HASH, INDEX_SORTED):
+            raise ValueError(f"Unbekannter Index-Typ: {kind}")
+        self.field = field
+        self.kind = kind
+        self._hash: Dict[Tuple[int, Any], Set[int]] = {}
+        # Sortiert: getrennte Listen für Zahlen und Texte (nicht vergleichbar)
+        self._sorted: Tuple[List[Tuple[Any, int]], List[Tuple[Any, int]]] = ([], [])
+
+    def _keys(self, item: Any) -> Set[Tuple[int, Any]]:
+        return {key for key in map(index_key, field_values(item, self.field)) if key is not None}
+
+    def add(self, doc: int, item: Any):
+        for key in self._keys(item):
+            if self.kind == INDEX_HASH:
+                self._hash.setdefault(key, set()).add(doc)
+            else:
+                insort(self._sorted[key[0]], (key[1], doc))
+
+    def add_all(self, docs: List[Tuple[int, Any]]):
+        """Erstbefüllung: sortierte Listen einmal am Ende sortieren statt einzeln einfügen"""
+        if self.kind == INDEX_HASH:
+            for doc, item in docs:
+                self.add(doc, item)
+            return
+        for doc, item in docs:
+            for key in self._keys(item):
+                self._sorted[key[0]].append((key[1], doc))
+        for entries in self._sorted:
+            entries.sort()
+
+    def remove(self, doc: int, item: Any):
+        for key in self._keys(item):
+            if self.kind == INDEX_HASH:
+                docs = self._hash.get(key)
+                if docs is not None:
+                    docs.discard(doc)
+                    if not docs:
+                        del self._hash[key]
+            else:
+                entries = self._sorted[key[0]]
+                position = bisect_left(entries, (key[1], doc))
+                if position < len(entries) and entries[position] == (key[1], doc):
+                    del entries[position]
+
+    def supports(self, op: str) -> bool:
+        if self.kind == INDEX_HASH:
+            return op == "="
+        return op in ("=", "<", "<=", ">", ">=")
+
+    def _range(self, op: str, key: Tuple[int, Any]) -> Tuple[List[Tuple[Any, int]], int, int]:
+        entries = self._sorted[key[0]]
+        # Dokument-IDs sind nicht negativ: (wert, -1) liegt vor allen Einträgen des Werts
+        low_equal = bisect_left(entries, (key[1], -1))
+        high_equal = bisect_right(entries, (key[1], float("inf")))
+        start, end = {"=": (low_equal, high_equal), "<": (0, low_equal), "<=": (0, high_equal),
+                      ">": (high_equal, len(entries)), ">=": (low_equal, len(entries))}[op]
+        return entries, start, end
+
+    def estimate(self, op: str, value: Any) -> int:
+        """Anzahl der Kandidaten, die der Index für die Bedingung liefert"""
+        key = index_key(value)
+        if key is None:
+            return 0
+        if self.kind == INDEX_HASH:
+            return len(self._hash.get(key, ()))
+        _, start, end = self._range(op, key)
+        return max(0, end - start)
+
+    def lookup(self, op: str, value: Any) -> Set[int]:
+        key = index_key(value)
+        if key is None:
+            return set()
+        if self.kind == INDEX_HASH:
+            return set(self._hash.get(key, ()))
+        entries, start, end = self._range(op, key)
+        return {doc for _, doc in entries[start:end]}
+
+
+class QueryEngine:
+    """Plant und beantwortet Abfragen, pflegt die Sekundärindizes"""
+
+    def __init__(self):
+        self._indexes: Dict[str, Dict[str, FieldIndex]] = {}
+        self._category_docs: Dict[str, List[int]] = {}
+        # Dokument → Position je Kategorie; nach Einfügen/Löschen in der Mitte
+        # verworfen und bei der nächsten Abfrage neu aufgebaut
+        self._positions: Dict[str, Dict[int, int]] = {}
+        self._docs: Dict[int, Any] = {}
+        self._next_doc = 0
+
+    # ------------------------------------------------------------------
+    # Indexverwaltung
+    # ------------------------------------------------------------------
+
+    def create_index(self, framework_data: Dict[str, Any], category: str, field: str,
+                     kind: str = INDEX_HASH) -> FieldIndex:
+        index = FieldIndex(field, kind)
+        if category not in self._category_docs:
+            self._track_category(category, _category_items(framework_data, category))
+        index.add_all([(doc, self._docs[doc]) for doc in self._category_docs[category]])
+        self._indexes.setdefault(category, {})[_normalized_name(field)] = index
+        return index
+
+    def drop_index(self, category: str, field: str) -> bool:
+        removed = self._indexes.get(category, {}).pop(_normalized_name(field), None) is not None
+        if category in self._indexes and not self._indexes[category]:
+            del self._indexes[category]
+            self._untrack_category(category)
+        return removed
+
+    def list_indexes(self) -> List[Tuple[str, str, str]]:
+        return [(category, index.field, index.kind)
+                for category, indexes in self._indexes.items() for index in indexes.values()]
+
+    def has_indexes(self) -> bool:
+        return bool(self._indexes)
+
+    def _track_category(self, category: str, items: List[Any]):
+        docs = []
+        for item in items:
+            docs.append(self._new_doc(item))
+        self._category_docs[category] = docs
+        self._positions.pop(category, None)
+
+    def _untrack_category(self, category: str):
+        self._positions.pop(category, None)
+        for doc in self._category_docs.pop(category, []):
+            self._docs.pop(doc, None)
+
+    def _doc_positions(self, category: str) -> Dict[int, int]:
+        positions = self._positions.get(category)
+        if positions is None:
+            positions = {doc: i for i, doc in enumerate(self._category_docs[category])}
+            self._positions[category] = positions
+        return positions
+
+    def _new_doc(self, item: Any) -> int:
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[doc] = item
+        return doc
+
+    def rebuild(self, framework_data: Dict[str, Any]):
+        """Baut alle Indizes nach einem Komplettwechsel der Daten neu auf"""
+        definitions = self.list_indexes()
+        self._indexes.clear()
+        self._category_docs.clear()
+        self._positions.clear()
+        self._docs.clear()
+        for category, field, kind in definitions:
+            self.create_index(framework_data, category, field, kind)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener: pflegt nur Kategorien mit Index"""
+        if category not in self._category_docs:
+            return
+        docs = self._category_docs[category]
+        indexes = self._indexes[category].values()
+        if action == "add":
+            doc = self._new_doc(new_item)
+            docs.insert(index, doc)
+            positions = self._positions.get(category)
+            if positions is not None:
+                # Anhängen verschiebt nichts, Einfügen in der Mitte schon
+                if index == len(docs) - 1:
+                    positions[doc] = index
+                else:
+                    del self._positions[category]
+            for field_index in indexes:
+                field_index.add(doc, new_item)
+        elif action == "update":
+            doc = docs[index]
+            for field_index in indexes:
+                field_index.remove(doc, self._docs[doc])
+                field_index.add(doc, new_item)
+            self._docs[doc] = new_item
+        elif action == "delete":
+            doc = docs.pop(index)
+            positions = self._positions.get(category)
+            if positions is not None:
+                if index == len(docs):
+                    del positions[doc]
+                else:
+                    del self._positions[category]
+            for field_index in indexes:
+                field_index.remove(doc, self._docs.pop(doc))
+        elif action in ("remove_category", "restore_category"):
+            items = new_item[0] if action == "restore_category" else []
+            for doc in docs:
+                self._docs.pop(doc, None)
+            self._track_category(category, items if isinstance(items, list) else [])
+            for field_index in self._indexes[category].values():
+                fresh = FieldIndex(field_index.field, field_index.kind)
+                fresh.add_all([(doc, self._docs[doc]) for doc in self._category_docs[category]])
+                self._indexes[category][_normalized_name(field_index.field)] = fresh
+
+    # ------------------------------------------------------------------
+    # Planung und Ausführung
+    # ------------------------------------------------------------------
+
+    def plan(self, framework_data: Dict[str, Any], query: Query) -> List[Dict[str, Any]]:
+        """Ausführungsplan je Kategorie: Index (mit geschätzter Trefferzahl) oder Scan"""
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        categories = query.categories
+        if categories is None:
+            categories = [c for c, items in framework.items()
+                          if c not in SKIP_CATEGORIES and is_item_list(items)]
+
+        steps = []
+        for category in categories:
+            if category not in framework:
+                raise QueryError(f"Unbekannte Kategorie: {category}")
+            best = None
+            for predicate in query.predicates:
+                field_index = self._indexes.get(category, {}).get(_normalized_name(predicate.field))
+                if field_index is None or not field_index.supports(predicate.op):
+                    continue
+                estimate = field_index.estimate(predicate.op, predicate.value)
+                if best is None or estimate < best["estimate"]:
+                    best = {"category": category, "access": f"index:{field_index.kind}",
+                            "field": field_index.field, "predicate": predicate, "estimate": estimate}
+            steps.append(best or {"category": category, "access": "scan",
+                                  "estimate": len(framework[category] or [])})
+        return steps
+
+    def run(self, framework_data: Dict[str, Any], query: Query) -> List[Dict[str, Any]]:
+        framework = framework_data.get("framework", {})
+        results = []
+        for step in self.plan(framework_data, query):
+            category = step["category"]
+            items = framework[category] or []
+            if step["access"] == "scan":
+                candidates = enumerate(items)
+            else:
+                docs = self._indexes[category][_normalized_name(step["field"])].lookup(
+                    step["predicate"].op, step["predicate"].value)
+                positions = self._doc_positions(category)
+                candidates = sorted((positions[doc], self._docs[doc]) for doc in docs)
+            for position, item in candidates:
+                if all(matches(item, predicate) for predicate in query.predicates):
+                    results.append({"category": category, "index": position, "item": item,
+                                    "match_type": "query"})
+        return results
+
+
+def _category_items(framework_data: Dict[str, Any], category: str) -> List[Any]:
+    framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+    items = framework.get(category)
+    return items if is_item_list(items) else []
+
+
+def format_plan(steps: List[Dict[str, Any]]) -> str:
+    """Lesbare Darstellung eines Ausführungsplans"""
+    lines = []
+    for step in steps:
+        if step["access"] == "scan":
+            lines.append(f"{step['category']}: Scan über {step['estimate']} Items")
+        else:
+            predicate = step["predicate"]
+            lines.append(f"{step['category']}: {step['access']} auf {step['field']} "
+                         f"({predicate.op} {predicate.value!r}, ~{step['estimate']} Kandidaten)")
+    return "\n".join(lines)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Referenz-Graph
+==============================
+Verknüpft Prinzipien, Regeln, Heuristiken, Rollen und Prozesse über ihre
+IDs bzw. Namen und hält Vorwärts- und Rückwärts-Indizes inkrementell aktuell.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable
+
+from codebook_model import is_item_list
+
+# Ein Knoten ist (Kategorie, normalisierter Schlüssel)
+Node = Tuple[str, str]
+
+# Felder, über die ein Item identifiziert wird (in dieser Reihenfolge)
+KEY_FIELDS = {
+    "heuristiken": ("id", "name", "regel"),
+    "transferbeispiele": ("id", "name", "kontext"),
+    "semantic_gaps": ("id", "name", "beschreibung"),
+    "lessons_learned": ("id", "name", "erfahrung"),
+    "open_questions": ("id", "name", "frage"),
+}
+DEFAULT_KEY_FIELDS = ("id", "name")
+
+# (Quell-Kategorie, Feld) -> Ziel-Kategorie
+REFERENCE_FIELDS = {
+    ("prinzipien", "regeln"): "regeln",
+    ("prinzipien", "heuristiken"): "heuristiken",
+    ("prinzipien", "transferbeispiele"): "transferbeispiele",
+    ("prinzipien", "semantic_gaps"): "semantic_gaps",
+    ("prozesse", "beteiligte"): "rollen",
+    ("transferbeispiele", "regel"): "regeln",
+}
+
+
+def normalize_key(value: Any) -> Optional[str]:
+    """Normalisiert eine ID bzw. einen Namen für den Abgleich"""
+    if value is None or isinstance(value, (Mapping, list)):
+        return None
+    key = " ".join(str(value).split()).casefold()
+    return key or None
+
+
+def item_key(category: str, item: Any) -> Optional[str]:
+    """Ermittelt den Schlüssel eines Items (ID, Name oder Kategorie-spezifisches Feld)"""
+    if isinstance(item, Mapping):
+        for field in KEY_FIELDS.get(category, DEFAULT_KEY_FIELDS):
+            key = normalize_key(item.get(field))
+            if key:
+                return key
+        return None
+    return normalize_key(item)
+
+
+def extract_references(category: str, item: Any) -> List[Node]:
+    """Extrahiert alle ausgehenden Referenzen eines Items"""
+    references = []
+    if not isinstance(item, Mapping):
+        return references
+
+    for (source_category, field), target_category in REFERENCE_FIELDS.items():
+        if source_category != category or field not in item:
+            continue
+
+        values = item[field]
+        if not isinstance(values, list):
+            values = [values]
+
+        for value in values:
+            key = item_key(target_category, value)
+            if key:
+                references.append((target_category, key))
+
+    return references
+
+
+class ReferenceGraph:
+    """Referenz-Graph mit inkrementell gepflegten Adjazenz-Indizes"""
+
+    def __init__(self):
+        # Anzahl Items pro Knoten (Duplikate sind möglich)
+        self.nodes: Dict[Node, int] = {}
+        # Kante -> Vielfachheit (ein Item kann mehrfach auf dasselbe Ziel zeigen)
+        self.forward: Dict[Node, Dict[Node, int]] = {}
+        self.reverse: Dict[Node, Dict[Node, int]] = {}
+        # Ziele, die referenziert werden, aber nicht existieren
+        self._dangling: Set[Node] = set()
+
+    @classmethod
+    def from_framework(cls, framework_data: Dict[str, Any]) -> "ReferenceGraph":
+        """Baut den Graphen aus den kompletten Framework-Daten auf"""
+        graph = cls()
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        for category, items in framework.items():
+            if category in ("meta", "category_meta") or not is_item_list(items):
+                continue
+            for item in items:
+                graph.add_item(category, item)
+        return graph
+
+    # ------------------------------------------------------------------
+    # Inkrementelle Pflege
+    # ------------------------------------------------------------------
+
+    def add_item(self, category: str, item: Any):
+        """Nimmt ein Item mit seinen Referenzen in den Graphen auf"""
+        key = item_key(category, item)
+        if key is None:
+            return
+
+        node = (category, key)
+        self.nodes[node] = self.nodes.get(node, 0) + 1
+        if node in self._dangling:
+            self._dangling.discard(node)
+
+        for target in extract_references(category, item):
+            self._add_edge(node, target)
+
+    def remove_item(self, category: str, item: Any):
+        """Entfernt ein Item mit seinen Referenzen aus dem Graphen"""
+        key = item_key(category, item)
+        if key is None or (category, key) not in self.nodes:
+            return
+
+        node = (category, key)
+        for target in extract_references(category, item):
+            self._remove_edge(node, target)
+
+        self.nodes[node] -= 1
+        if self.nodes[node] == 0:
+            del self.nodes[node]
+            if node in self.reverse:
+                self._dangling.add(node)
+
+    def update_item(self, category: str, old_item: Any, new_item: Any):
+        """Ersetzt ein Item im Graphen"""
+        self.remove_item(category, old_item)
+        self.add_item(category, new_item)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener für den CodebookLIFEAssistant"""
+        if action == "add":
+            self.add_item(category, new_item)
+        elif action == "update":
+            self.update_item(category, old_item, new_item)
+        elif action == "delete":
+            self.remove_item(category, old_item)
+        elif action == "remove_category":
+            for item in old_item[0]:
+                self.remove_item(category, item)
+        elif action == "restore_category":
+            for item in new_item[0]:
+                self.add_item(category, item)
+
+    def _add_edge(self, source: Node, target: Node):
+        targets = self.forward.setdefault(source, {})
+        targets[target] = targets.get(target, 0) + 1
+        sources = self.reverse.setdefault(target, {})
+        sources[source] = sources.get(source, 0) + 1
+        if target not in self.nodes:
+            self._dangling.add(target)
+
+    def _remove_edge(self, source: Node, target: Node):
+        targets = self.forward.get(source)
+        if not targets or target not in targets:
+            return
+
+        targets[target] -= 1
+        if targets[target] == 0:
+            del targets[target]
+            if not targets:
+                del self.forward[source]
+
+        sources = self.reverse[target]
+        sources[source] -= 1
+        if sources[source] == 0:
+            del sources[source]
+            if not sources:
+                del self.reverse[target]
+                self._dangling.discard(target)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def references_of(self, category: str, key: str) -> List[Node]:
+        """Gibt alle Ziele zurück, auf die ein Item verweist"""
+        return list(self.forward.get((category, normalize_key(key)), {}))
+
+    def referenced_by(self, category: str, key: str) -> List[Node]:
+        """Gibt alle Items zurück, die auf das angegebene Ziel verweisen"""
+        return list(self.reverse.get((category, normalize_key(key)), {}))
+
+    def dangling_references(self) -> List[Tuple[Node, Node]]:
+        """Gibt alle Kanten (Quelle, Ziel) zurück, deren Ziel nicht existiert"""
+        return [(source, target)
+                for target in self._dangling
+                for source in self.reverse.get(target, {})]
+
+    def impact_of(self, category: str, key: str,
+                  max_depth: Optional[int] = None) -> Dict[Node, int]:
+        """Ermittelt transitiv alle Items, die von einer Änderung betroffen sind
+
+        Gibt ein Mapping Knoten -> Abstand zurück (ohne den Startknoten).
+        """
+        start = (category, normalize_key(key))
+        distances: Dict[Node, int] = {}
+        queue = deque([(start, 0)])
+        seen = {start}
+
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for source in self.reverse.get(node, {}):
+                if source not in seen:
+                    seen.add(source)
+                    distances[source] = depth + 1
+                    queue.append((source, depth + 1))
+
+        return distances
+
+    def stats(self) -> Dict[str, int]:
+        """Kennzahlen des Graphen"""
+        return {
+            "nodes": len(self.nodes),
+            "edges": sum(len(targets) for targets in self.forward.values()),
+            "dangling": len(self._dangling),
+        }
+
+
+def format_nodes(nodes: Iterable[Node]) -> List[str]:
+    """Formatiert Knoten als 'kategorie:schlüssel' für die Anzeige"""
+    return [f"{category}:{key}" for category, key in nodes]
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Revisionen
+==========================
+Inhaltsadressierter Revisionsspeicher: Jedes Item wird unter seinem Hash
+abgelegt, Revisionen sind Manifeste aus Item-Hashes und teilen sich
+unveränderte Items. Der Diff vergleicht zuerst Hashes und lädt nur Items,
+deren Hash sich unterscheidet.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from codebook_model import is_item_list, json_default
+from codebook_references import item_key
+
+SKIP_CATEGORIES = ("meta", "category_meta")
+
+
+def canonical_json(value: Any) -> str:
+    """Deterministische JSON-Darstellung (Grundlage für Hashes)"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=json_default)
+
+
+def content_hash(value: Any) -> str:
+    """SHA-256 über die kanonische Darstellung"""
+    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()
+
+
+def deep_diff(old: Any, new: Any, path: str = "") -> List[Tuple[str, Any, Any]]:
+    """Rekursiver Vergleich zweier Werte, liefert (Pfad, alt, neu)"""
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        changes = []
+        for key in old:
+            child = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append((child, old[key], None))
+            elif old[key] != new[key]:
+                changes.extend(deep_diff(old[key], new[key], child))
+        for key in new:
+            if key not in old:
+                changes.append((f"{path}.{key}" if path else str(key), None, new[key]))
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        for i, (old_value, new_value) in enumerate(zip(old, new)):
+            if old_value != new_value:
+                changes.extend(deep_diff(old_value, new_value, f"{path}[{i}]"))
+        return changes
+
+    return [] if old == new else [(path, old, new)]
+
+
+class RevisionStore:
+    """Speichert Revisionen unter codebook_data/revisions"""
+
+    def __init__(self, codebook_dir: Path):
+        self.root = Path(codebook_dir) / "revisions"
+        self.objects_dir = self.root / "objects"
+        self.log_file = self.root / "log.jsonl"
+        # id(item) -> (item, hash); Items werden ersetzt, nicht verändert
+        self._hash_cache: Dict[int, Tuple[Any, str]] = {}
+
+    # ------------------------------------------------------------------
+    # Objekte
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.json"
+
+    def _item_hash(self, item: Any, cache: Dict[int, Tuple[Any, str]]) -> str:
+        cached = self._hash_cache.get(id(item))
+        if cached is not None and cached[0] is item:
+            digest = cached[1]
+        else:
+            digest = content_hash(item)
+        cache[id(item)] = (item, digest)
+        return digest
+
+    def _write_object(self, digest: str, value: Any):
+        path = self._object_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(canonical_json(value))
+        tmp_path.replace(path)
+
+    def load_object(self, digest: str) -> Any:
+        """Lädt ein Item anhand seines Hashes"""
+        with open(self._object_path(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    # ------------------------------------------------------------------
+    # Manifeste
+    # ------------------------------------------------------------------
+
+    def build_manifest(self, framework_data: Dict[str, Any], store_objects: bool = False) -> Dict[str, Any]:
+        """Erstellt das Manifest (Item-Hashes je Kategorie) eines Framework-Stands"""
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        meta = framework.get("meta", {})
+        cache: Dict[int, Tuple[Any, str]] = {}
+        categories: Dict[str, List[List[Optional[str]]]] = {}
+
+        for category, items in framework.items():
+            if category in SKIP_CATEGORIES:
+                continue
+            entries = []
+            for item in items if is_item_list(items) else [items]:
+                digest = self._item_hash(item, cache)
+                if store_objects:
+                    self._write_object(digest, item)
+                entries.append([digest, item_key(category, item)])
+            categories[category] = entries
+
+        meta_hash = content_hash(meta)
+        category_meta = framework.get("category_meta", {})
+        category_meta_hash = content_hash(category_meta)
+        if store_objects:
+            self._write_object(meta_hash, meta)
+            self._write_object(category_meta_hash, category_meta)
+
+        self._hash_cache = cache
+        return {
+            "meta": meta_hash,
+            "category_meta": category_meta_hash,
+            "version": str(meta.get("version", "")) if isinstance(meta, dict) else "",
+            "stand": str(meta.get("stand", "")) if isinstance(meta, dict) else "",
+            "categories": categories,
+        }
+
+    def commit(self, framework_data: Dict[str, Any], message: str = "") -> Dict[str, Any]:
+        """Legt eine neue Revision an und gibt deren Log-Eintrag zurück"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.build_manifest(framework_data, store_objects=True)
+        revisions = self.list_revisions()
+        manifest["parent"] = revisions[-1]["id"] if revisions else None
+        revision_id = content_hash(manifest)[:12]
+
+        self._write_object(revision_id, manifest)
+        entry = {
+            "id": revision_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "message": message,
+            "version": manifest["version"],
+            "stand": manifest["stand"],
+            "items": sum(len(entries) for entries in manifest["categories"].values()),
+        }
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def list_revisions(self) -> List[Dict[str, Any]]:
+        """Alle Revisionen in zeitlicher Reihenfolge"""
+        if not self.log_file.exists():
+            return []
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def resolve(self, revision_id: str) -> str:
+        """Löst eine (ggf. abgekürzte) Revisions-ID auf"""
+        matches = [entry["id"] for entry in self.list_revisions() if entry["id"].startswith(revision_id)]
+        if len(set(matches)) != 1:
+            raise KeyError(f"Revision nicht eindeutig oder unbekannt: {revision_id}")
+        return matches[0]
+
+    def load_manifest(self, revision_id: str) -> Dict[str, Any]:
+        return self.load_object(self.resolve(revision_id))
+
+    def checkout(self, revision_id: str) -> Dict[str, Any]:
+        """Rekonstruiert die kompletten Framework-Daten einer Revision"""
+        manifest = self.load_manifest(revision_id)
+        framework: Dict[str, Any] = {"meta": self.load_object(manifest["meta"])}
+        for category, entries in manifest["categories"].items():
+            framework[category] = [self.load_object(digest) for digest, _ in entries]
+        category_meta = self.load_object(manifest["category_meta"])
+        if category_meta:
+            framework["category_meta"] = category_meta
+        return {"framework": framework}
+
+    # ------------------------------------------------------------------
+    # Diff
+    # ------------------------------------------------------------------
+
+    def diff_manifests(self, old: Dict[str, Any], new: Dict[str, Any],
+                       new_items: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Vergleicht zwei Manifeste; Items werden nur bei abweichendem Hash geladen
+
+        new_items: Hash -> Item für Manifeste, deren Objekte nicht gespeichert sind
+        (Vergleich mit dem aktuellen Arbeitsstand).
+        """
+        def load(digest):
+            if new_items is not None and digest in new_items:
+                return new_items[digest]
+            return self.load_object(digest)
+
+        diff: Dict[str, Any] = {
+            "categories_added": [c for c in new["categories"] if c not in old["categories"]],
+            "categories_removed": [c for c in old["categories"] if c not in new["categories"]],
+            "added": [], "removed": [], "changed": [], "meta": [],
+        }
+        if old["meta"] != new["meta"]:
+            diff["meta"] = deep_diff(load(old["meta"]), load(new["meta"]))
+
+        for category in set(old["categories"]) | set(new["categories"]):
+            old_entries = old["categories"].get(category, [])
+            new_entries = new["categories"].get(category, [])
+            old_hashes = {digest for digest, _ in old_entries}
+            new_hashes = {digest for digest, _ in new_entries}
+            removed = [(d, k) for d, k in old_entries if d not in new_hashes]
+            added = [(d, k) for d, k in new_entries if d not in old_hashes]
+            if not removed and not added:
+                continue
+
+            # Geänderte Items: gleicher Schlüssel, anderer Hash
+            removed_by_key: Dict[Any, List[str]] = {}
+            for digest, key in removed:
+                removed_by_key.setdefault(key, []).append(digest)
+
+            for digest, key in added:
+                candidates = removed_by_key.get(key) if key is not None else None
+                if candidates:
+                    old_digest = candidates.pop(0)
+                    changes = deep_diff(load(old_digest), load(digest))
+                    diff["changed"].append({"category": category, "key": key, "changes": changes})
+                else:
+                    diff["added"].append({"category": category, "key": key, "item": load(digest)})
+
+            for key, digests in removed_by_key.items():
+                for digest in digests:
+                    diff["removed"].append({"category": category, "key": key, "item": load(digest)})
+
+        return diff
+
+    def diff(self, old_revision: str, new_revision: str) -> Dict[str, Any]:
+        """Diff zwischen zwei gespeicherten Revisionen"""
+        return self.diff_manifests(self.load_manifest(old_revision), self.load_manifest(new_revision))
+
+    def diff_with_working(self, revision_id: str, framework_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Diff zwischen einer Revision und dem aktuellen Arbeitsstand"""
+        manifest = self.build_manifest(framework_data)
+        items = {digest: item for item, digest in self._hash_cache.values()}
+        framework = framework_data.get("framework", {})
+        items[manifest["meta"]] = framework.get("meta", {})
+        items[manifest["category_meta"]] = framework.get("category_meta", {})
+        return self.diff_manifests(self.load_manifest(revision_id), manifest, new_items=items)
+
+
+def format_diff(diff: Dict[str, Any]) -> str:
+    """Lesbare Textdarstellung eines Diffs"""
+    lines = []
+    for category in diff["categories_added"]:
+        lines.append(f"+ Kategorie {category}")
+    for category in diff["categories_removed"]:
+        lines.append(f"- Kategorie {category}")
+    for path, old, new in diff["meta"]:
+        lines.append(f"~ meta.{path}: {old!r} → {new!r}")
+    for entry in diff["added"]:
+        lines.append(f"+ {entry['category']}: {entry['key'] or '(ohne Schlüssel)'}")
+    for entry in diff["removed"]:
+        lines.append(f"- {entry['category']}: {entry['key'] or '(ohne Schlüssel)'}")
+    for entry in diff["changed"]:
+        lines.append(f"~ {entry['category']}: {entry['key']}")
+        for path, old, new in entry["changes"]:
+            lines.append(f"    {path}: {old!r} → {new!r}")
+    return "\n".join(lines) if lines else "Keine Unterschiede"
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Unscharfe Suche
+===============================
+Tippfehler-tolerante Suche über einen Trigramm-Index. Texte werden
+normalisiert (Kleinschreibung, ä→ae, ö→oe, ü→ue, ß→ss, Akzente entfernt),
+Kandidaten kommen aus dem Index und werden anschließend mit einer
+begrenzten Editierdistanz geprüft. Teilwörter in Komposita ("Lösung" in
+"Problemlösung") werden ebenfalls gefunden.
+"""
+
+import re
+import unicodedata
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+UMLAUT_MAP = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STEM_SUFFIXES = ("en", "er", "es", "e", "n", "s")
+
+
+def normalize_text(text: str) -> str:
+    """Kleinschreibung, Umlaute ausschreiben, Akzente entfernen"""
+    text = text.casefold().translate(UMLAUT_MAP)
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Zerlegt normalisierten Text in Wörter"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def stem(token: str) -> str:
+    """Sehr einfache Stammbildung (Lösungen → loesung, Regeln → regel)"""
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[:-len(suffix)]
+    return token
+
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def max_distance_for(token: str) -> int:
+    """Erlaubte Tippfehler abhängig von der Wortlänge (IDs und Zahlen exakt)"""
+    if len(token) <= 3 or any(char.isdigit() for char in token):
+        return 0
+    if len(token) <= 7:
+        return 1
+    return 2
+
+
+def substring_distance(pattern: str, text: str, max_distance: int) -> Optional[int]:
+    """Kleinste Editierdistanz von pattern zu einem beliebigen Teilstring von text
+
+    Vertauschte Nachbarbuchstaben zählen als ein Fehler. Gibt None zurück,
+    wenn die Distanz größer als max_distance ist (Abbruch, sobald keine Zeile
+    mehr unter der Schranke liegt).
+    """
+    if pattern in text:
+        return 0
+    if max_distance == 0:
+        return None
+
+    # Sellers-Algorithmus: Anfang im Text ist frei (erste Zeile = 0)
+    columns = range(1, len(text) + 1)
+    before_previous: List[int] = []
+    previous = [0] * (len(text) + 1)
+    for i, pattern_char in enumerate(pattern, 1):
+        current = [i] + [0] * len(text)
+        row_min = i
+        for j in columns:
+            text_char = text[j - 1]
+            value = previous[j - 1] + (pattern_char != text_char)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (i > 1 and j > 1 and pattern_char == text[j - 2] and pattern[i - 2] == text_char
+                    and before_previous[j - 2] + 1 < value):
+                value = before_previous[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return None
+        before_previous, previous = previous, current
+
+    best = min(previous)
+    return best if best <= max_distance else None
+
+
+def item_texts(value: Any):
+    """Alle String-Werte eines Items (rekursiv)"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, Mapping):
+        for entry in value.values():
+            yield from item_texts(entry)
+    elif isinstance(value, list):
+        for entry in value:
+            yield from item_texts(entry)
+
+
+class FuzzyIndex:
+    """Trigramm-Index über die Wörter aller Items, inkrementell gepflegt"""
+
+    def __init__(self):
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[Optional[str]] = []
+        self._free_token_ids: List[int] = []
+        self._trigram_tokens: Dict[str, Set[int]] = {}
+        self._token_docs: Dict[int, Set[int]] = {}
+        self._doc_tokens: Dict[int, Set[int]] = {}
+        self._docs: Dict[int, Tuple[str, Any]] = {}
+        # Dokument-IDs je Kategorie in Listenreihenfolge (Index = Item-Position)
+        self._category_docs: Dict[str, List[int]] = {}
+        # Dokument → Position je Kategorie; nach Einfügen/Löschen in der Mitte
+        # verworfen und bei der nächsten Suche neu aufgebaut
+        self._positions: Dict[str, Dict[int, int]] = {}
+        self._next_doc = 0
+
+    @classmethod
+    def from_framework(cls, framework_data: Dict[str, Any]) -> "FuzzyIndex":
+        index = cls()
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        for category, items in framework.items():
+            if category in ("meta", "category_meta") or not isinstance(items, list):
+                continue
+            for position, item in enumerate(items):
+                index.add_item(category, position, item)
+        return index
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def add_item(self, category: str, position: int, item: Any):
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[doc] = (category, item)
+        docs = self._category_docs.setdefault(category, [])
+        docs.insert(position, doc)
+        positions = self._positions.get(category)
+        if positions is not None:
+            # Anhängen verschiebt nichts, Einfügen in der Mitte schon
+            if docs[-1] == doc:
+                positions[doc] = len(docs) - 1
+            else:
+                del self._positions[category]
+
+        token_ids = set()
+        for text in item_texts(item):
+            for token in tokenize(text):
+                token_ids.add(self._token_id(token))
+        self._doc_tokens[doc] = token_ids
+        for token_id in token_ids:
+            self._token_docs[token_id].add(doc)
+
+    def remove_item(self, category: str, position: int):
+        docs = self._category_docs.get(category)
+        if not docs or not 0 <= position < len(docs):
+            return
+        doc = docs.pop(position)
+        del self._docs[doc]
+        positions = self._positions.get(category)
+        if positions is not None:
+            if position == len(docs):
+                del positions[doc]
+            else:
+                del self._positions[category]
+        for token_id in self._doc_tokens.pop(doc, ()):
+            postings = self._token_docs[token_id]
+            postings.discard(doc)
+            if not postings:
+                self._drop_token(token_id)
+
+    def update_item(self, category: str, position: int, item: Any):
+        self.remove_item(category, position)
+        self.add_item(category, position, item)
+
+    def remove_category(self, category: str):
+        for position in range(len(self._category_docs.get(category, [])) - 1, -1, -1):
+            self.remove_item(category, position)
+        self._category_docs.pop(category, None)
+        self._positions.pop(category, None)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener für den CodebookLIFEAssistant"""
+        if action == "add":
+            self.add_item(category, index, new_item)
+        elif action == "update":
+            self.update_item(category, index, new_item)
+        elif action == "delete":
+            self.remove_item(category, index)
+        elif action == "remove_category":
+            self.remove_category(category)
+        elif action == "restore_category" and isinstance(new_item[0], list):
+            for position, item in enumerate(new_item[0]):
+                self.add_item(category, position, item)
+
+    def _token_id(self, token: str) -> int:
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            if self._free_token_ids:
+                token_id = self._free_token_ids.pop()
+                self._tokens[token_id] = token
+            else:
+                token_id = len(self._tokens)
+                self._tokens.append(token)
+            self._token_ids[token] = token_id
+            self._token_docs[token_id] = set()
+            for gram in trigrams(token):
+                self._trigram_tokens.setdefault(gram, set()).add(token_id)
+        return token_id
+
+    def _drop_token(self, token_id: int):
+        token = self._tokens[token_id]
+        for gram in trigrams(token):
+            postings = self._trigram_tokens.get(gram)
+            if postings is not None:
+                postings.discard(token_id)
+                if not postings:
+                    del self._trigram_tokens[gram]
+        del self._token_ids[token]
+        del self._token_docs[token_id]
+        self._tokens[token_id] = None
+        self._free_token_ids.append(token_id)
+
+    # ------------------------------------------------------------------
+    # Suche
+    # ------------------------------------------------------------------
+
+    def _matching_tokens(self, query_token: str) -> Dict[int, int]:
+        """Wörter, die query_token (als Teilwort) mit wenigen Tippfehlern enthalten"""
+        matches: Dict[int, int] = {}
+        if len(query_token) < 3:
+            # Zu kurz für Trigramme: direkter Vergleich über das Vokabular
+            for token, token_id in self._token_ids.items():
+                if query_token in token:
+                    matches[token_id] = 0
+            return matches
+
+        max_distance = max_distance_for(query_token)
+        postings = sorted((self._trigram_tokens.get(gram, set()) for gram in trigrams(query_token)), key=len)
+
+        if max_distance == 0:
+            # Exakt: alle Trigramme müssen vorkommen, kleinste Liste zuerst
+            candidates = postings[0].intersection(*postings[1:])
+            for token_id in candidates:
+                if query_token in self._tokens[token_id]:
+                    matches[token_id] = 0
+            return matches
+
+        # q-Gramm-Lemma: jeder Tippfehler zerstört höchstens 3 Trigramme
+        required = max(1, len(postings) - 3 * max_distance)
+        counts: Dict[int, int] = {}
+        for posting in postings:
+            for token_id in posting:
+                counts[token_id] = counts.get(token_id, 0) + 1
+
+        for token_id, count in counts.items():
+            if count < required:
+                continue
+            distance = substring_distance(query_token, self._tokens[token_id], max_distance)
+            if distance is not None:
+                matches[token_id] = distance
+        return matches
+
+    def _token_scores(self, query_token: str) -> Dict[int, float]:
+        """Bestes Ergebnis je Dokument für ein Wort der Anfrage"""
+        by_distance: Dict[int, List[Set[int]]] = {}
+        for token_id, distance in self._matching_tokens(query_token).items():
+            by_distance.setdefault(distance, []).append(self._token_docs[token_id])
+
+        # Schlechteste Treffer zuerst eintragen, bessere überschreiben sie
+        scores: Dict[int, float] = {}
+        for distance in sorted(by_distance, reverse=True):
+            score = 1.0 - distance / (len(query_token) + 1)
+            docs = set().union(*by_distance[distance])
+            scores.update(dict.fromkeys(docs, score))
+        return scores
+
+    def search(self, query: str, max_results: int = 100) -> List[Dict[str, Any]]:
+        """Alle Wörter der Anfrage müssen (unscharf) im Item vorkommen"""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        scores = self._token_scores(query_tokens[0])
+        for query_token in query_tokens[1:]:
+            if not scores:
+                return []
+            token_scores = self._token_scores(query_token)
+            scores = {doc: scores[doc] + token_scores[doc] for doc in scores.keys() & token_scores.keys()}
+
+        ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)[:max_results]
+        results = []
+        for doc, score in ranked:
+            category, item = self._docs[doc]
+            results.append({
+                "category": category,
+                "index": self._doc_position(category, doc),
+                "item": item,
+                "match_type": "fuzzy",
+                "score": round(score / len(query_tokens), 3),
+            })
+        return results
+
+    def _doc_position(self, category: str, doc: int) -> int:
+        positions = self._positions.get(category)
+        if positions is None:
+            positions = {d: i for i, d in enumerate(self._category_docs[category])}
+            self._positions[category] = positions
+        return positions[doc]
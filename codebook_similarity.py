@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Ähnlichkeitssuche
+=================================
+Findet inhaltlich verwandte Items, auch wenn sie andere Worte benutzen.
+Jedes Item wird als gehashter Bag-of-Words-Vektor (Wortstämme, sublineare
+Häufigkeit) in einer NumPy-Matrix gehalten; IDF-Gewichte und Normen werden
+bei Bedarf aus der Matrix berechnet, sodass Änderungen nur eine Zeile
+betreffen. Anfragen werden als Matrixprodukt im Block beantwortet.
+
+numpy ist optional; ohne numpy steht die Ähnlichkeitssuche nicht zur Verfügung.
+"""
+
+import hashlib
+import math
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from codebook_model import is_item_list
+from codebook_search import tokenize, item_texts, stem
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist optional
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+DEFAULT_DIMENSIONS = 1024
+QUERY_BATCH_SIZE = 64
+
+
+def item_text(item: Any) -> str:
+    return " ".join(item_texts(item))
+
+
+def text_key(text: str) -> str:
+    """Schlüssel für gespeicherte Vektoren: der Vektor hängt nur vom Text ab"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Die Ähnlichkeitssuche benötigt numpy (pip install numpy)")
+
+
+class SimilarityIndex:
+    """Vektor-Matrix über alle Items, inkrementell gepflegt"""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        require_numpy()
+        self.dimensions = dimensions
+        self._matrix = np.zeros((64, dimensions), dtype=np.float32)
+        self._document_frequency = np.zeros(dimensions, dtype=np.float64)
+        self._rows: Dict[int, Tuple[str, Any]] = {}
+        self._keys: Dict[int, str] = {}
+        self._free_rows: List[int] = []
+        self._next_row = 0
+        # Zeilen je Kategorie in Listenreihenfolge (Index = Item-Position)
+        self._category_rows: Dict[str, List[int]] = {}
+        self._features: Dict[str, Tuple[int, float]] = {}
+        self._norms: Optional["np.ndarray"] = None
+        self.modified = False
+
+    @classmethod
+    def from_framework(cls, framework_data: Dict[str, Any], dimensions: int = DEFAULT_DIMENSIONS,
+                       cache_file: Optional[Path] = None) -> "SimilarityIndex":
+        """Baut den Index auf; Vektoren unveränderter Items kommen aus cache_file"""
+        index = cls(dimensions)
+        cached = index._load_cache(cache_file) if cache_file else {}
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        entries = [(category, item) for category, items in framework.items()
+                   if category not in ("meta", "category_meta") and is_item_list(items)
+                   for item in items]
+
+        # Matrix in einem Stück anlegen statt zeilenweise wachsen zu lassen
+        index._matrix = np.zeros((max(64, len(entries)), dimensions), dtype=np.float32)
+        reused = 0
+        for row, (category, item) in enumerate(entries):
+            text = item_text(item)
+            key = text_key(text)
+            vector = cached.get(key)
+            if vector is None:
+                vector = index.vectorize_text(text)
+            else:
+                reused += 1
+            index._matrix[row] = vector
+            index._keys[row] = key
+            index._rows[row] = (category, item)
+            index._category_rows.setdefault(category, []).append(row)
+        index._next_row = len(entries)
+        index._document_frequency = (index._matrix[:len(entries)] != 0).sum(axis=0).astype(np.float64)
+        index.modified = reused != len(entries) or reused != len(cached)
+        return index
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ------------------------------------------------------------------
+    # Vektoren
+    # ------------------------------------------------------------------
+
+    def _feature(self, token: str) -> Tuple[int, float]:
+        """Spalte und Vorzeichen eines Worts über seinen Stamm (stabil über Prozesse hinweg)"""
+        feature = self._features.get(token)
+        if feature is None:
+            digest = zlib.crc32(stem(token).encode("utf-8"))
+            # Vorzeichen-Hashing gleicht Kollisionen im Mittel aus
+            feature = (digest % self.dimensions, 1.0 if digest & 0x80000000 else -1.0)
+            self._features[token] = feature
+        return feature
+
+    def vectorize_text(self, text: str) -> "np.ndarray":
+        # Häufigkeiten je Spalte (verschiedene Formen eines Stamms zählen zusammen)
+        counts: Dict[Tuple[int, float], int] = {}
+        for token in tokenize(text):
+            if len(token) > 2:
+                feature = self._feature(token)
+                counts[feature] = counts.get(feature, 0) + 1
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for (column, sign), count in counts.items():
+            vector[column] += sign * (1.0 + math.log(count))
+        return vector
+
+    def vectorize(self, item: Any) -> "np.ndarray":
+        return self.vectorize_text(item_text(item))
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._next_row == len(self._matrix):
+            grown = np.zeros((len(self._matrix) * 2, self.dimensions), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+        self._next_row += 1
+        return self._next_row - 1
+
+    def add_item(self, category: str, position: int, item: Any, vector: Optional["np.ndarray"] = None):
+        row = self._allocate_row()
+        text = item_text(item)
+        self._matrix[row] = self.vectorize_text(text) if vector is None else vector
+        self._keys[row] = text_key(text)
+        self._document_frequency += self._matrix[row] != 0
+        self._rows[row] = (category, item)
+        self._category_rows.setdefault(category, []).insert(position, row)
+        self._norms = None
+        self.modified = True
+
+    def remove_item(self, category: str, position: int):
+        rows = self._category_rows.get(category)
+        if not rows or not 0 <= position < len(rows):
+            return
+        row = rows.pop(position)
+        self._document_frequency -= self._matrix[row] != 0
+        self._matrix[row] = 0
+        del self._rows[row]
+        del self._keys[row]
+        self._free_rows.append(row)
+        self._norms = None
+        self.modified = True
+
+    def update_item(self, category: str, position: int, item: Any):
+        self.remove_item(category, position)
+        self.add_item(category, position, item)
+
+    def remove_category(self, category: str):
+        for position in range(len(self._category_rows.get(category, [])) - 1, -1, -1):
+            self.remove_item(category, position)
+        self._category_rows.pop(category, None)
+
+    def on_change(self, action: str, category: Optional[str], index: Optional[int],
+                  old_item: Any, new_item: Any):
+        """Change-Listener für den CodebookLIFEAssistant"""
+        if action == "add":
+            self.add_item(category, index, new_item)
+        elif action == "update":
+            self.update_item(category, index, new_item)
+        elif action == "delete":
+            self.remove_item(category, index)
+        elif action == "remove_category":
+            self.remove_category(category)
+        elif action == "restore_category" and isinstance(new_item[0], list):
+            for position, item in enumerate(new_item[0]):
+                self.add_item(category, position, item)
+
+    def row_of(self, category: str, position: int) -> int:
+        return self._category_rows[category][position]
+
+    def vectors_of(self, rows: Sequence[int]) -> "np.ndarray":
+        return self._matrix[list(rows)]
+
+    # ------------------------------------------------------------------
+    # Persistenz
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path):
+        """Speichert alle Vektoren mit dem Hash ihres Texts (atomar)"""
+        path = Path(path)
+        rows = sorted(self._rows)
+        hashes = np.array([self._keys[row] for row in rows], dtype="U32")
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, dimensions=np.array(self.dimensions), hashes=hashes, vectors=self._matrix[rows])
+        os.replace(tmp_path, path)
+        self.modified = False
+
+    def _load_cache(self, path: Path) -> Dict[str, "np.ndarray"]:
+        if not Path(path).exists():
+            return {}
+        try:
+            with np.load(path) as data:
+                if int(data["dimensions"]) != self.dimensions:
+                    return {}
+                return dict(zip(data["hashes"].tolist(), data["vectors"]))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Fehler beim Laden der Item-Vektoren: {e}")
+            return {}
+
+    # ------------------------------------------------------------------
+    # Anfragen
+    # ------------------------------------------------------------------
+
+    def _weights(self) -> "np.ndarray":
+        """Quadrierte IDF-Gewichte je Spalte"""
+        idf = np.log((len(self._rows) + 1) / (self._document_frequency + 1)) + 1.0
+        return (idf * idf).astype(np.float32)
+
+    def _row_norms(self, weights: "np.ndarray") -> "np.ndarray":
+        if self._norms is None:
+            norms = np.empty(self._next_row, dtype=np.float32)
+            # Blockweise, damit keine quadrierte Kopie der ganzen Matrix entsteht
+            for start in range(0, self._next_row, 8192):
+                block = self._matrix[start:min(start + 8192, self._next_row)]
+                norms[start:start + len(block)] = np.sqrt((block * block) @ weights)
+            self._norms = norms
+        return self._norms
+
+    def top_k(self, queries: "np.ndarray", k: int = 10, exclude_rows: Optional[Sequence[int]] = None,
+              categories: Optional[Sequence[str]] = None) -> List[List[Tuple[int, float]]]:
+        """Kosinus-Ähnlichkeit mehrerer Anfragevektoren, je Anfrage die k besten Zeilen"""
+        queries = np.atleast_2d(queries).astype(np.float32)
+        weights = self._weights()
+        norms = self._row_norms(weights)
+        matrix = self._matrix[:self._next_row]
+
+        allowed = norms > 0
+        if categories is not None:
+            mask = np.zeros(len(norms), dtype=bool)
+            for category in categories:
+                mask[self._category_rows.get(category, [])] = True
+            allowed &= mask
+        # Gesperrte Zeilen: Faktor 0 und Abzug -inf (keine Division durch 0)
+        inverse_norms = np.where(allowed, 1.0 / np.where(allowed, norms, 1.0), 0.0).astype(np.float32)
+        blocked = np.where(allowed, 0.0, -np.inf).astype(np.float32)
+        count = min(k, len(norms))
+
+        results: List[List[Tuple[int, float]]] = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = queries[start:start + QUERY_BATCH_SIZE]
+            query_norms = np.sqrt((batch * batch) @ weights)
+            query_norms[query_norms == 0] = 1.0
+            scores = (batch * weights) @ matrix.T * inverse_norms / query_norms[:, None] + blocked
+            if exclude_rows is not None:
+                for offset, row in enumerate(exclude_rows[start:start + QUERY_BATCH_SIZE]):
+                    if row is not None:
+                        scores[offset, row] = -np.inf
+
+            if count == 0:
+                results.extend([] for _ in batch)
+                continue
+            best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            for rows, row_scores in zip(best.tolist(), best_scores.tolist()):
+                results.append([(row, score) for row, score in zip(rows, row_scores) if score > 0])
+        return results
+
+    def resolve(self, row: int) -> Tuple[str, int, Any]:
+        """(Kategorie, Position, Item) einer Zeile"""
+        category, item = self._rows[row]
+        return category, self._category_rows[category].index(row), item
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Binärer Snapshot
+================================
+Kompiliert das Framework in eine einzelne Datei für rein lesende Nutzer.
+Die Datei wird per ``mmap`` geöffnet; Items werden erst beim Zugriff direkt
+aus den gemappten Seiten dekodiert, mehrere Prozesse teilen sich die Seiten.
+
+Aufbau (alle Abschnitte auf 8 Byte ausgerichtet)::
+
+    MAGIC, Version, Anzahl Abschnitte, (Offset, Länge) je Abschnitt
+    Stringtabelle     Offsets (Q) + UTF-8-Daten, jeder String genau einmal
+    Werte             kodierte Items (Typ-Byte + Daten, Strings als String-ID)
+    Item-Index        Offset (Q) je Item, Items kategorieweise fortlaufend nummeriert
+    Suchindex         sortiertes Vokabular → Items, Trigramme → Vokabular
+    Katalog           Kategorien (erstes Item, Anzahl), sonstige Abschnitte, Infos
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from codebook_model import is_item_list
+from codebook_search import FuzzyIndex, tokenize, trigrams, item_texts
+
+MAGIC = b"CBLSNAP1"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<QQ")
+
+(S_STRING_OFFSETS, S_STRINGS, S_VALUES, S_ITEM_OFFSETS, S_VOCABULARY, S_TOKEN_DOC_OFFSETS,
+ S_TOKEN_DOCS, S_GRAMS, S_GRAM_TOKEN_OFFSETS, S_GRAM_TOKENS, S_CATALOG) = range(11)
+SECTION_COUNT = 11
+
+# Typ-Bytes der Wertkodierung
+T_NONE, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STR, T_LIST, T_MAP, T_OTHER = range(9)
+INT64 = struct.Struct("<q")
+FLOAT64 = struct.Struct("<d")
+UINT32 = struct.Struct("<I")
+
+SKIP_SECTIONS = ("meta", "category_meta")
+
+
+class SnapshotError(Exception):
+    """Datei ist kein (kompatibler) Snapshot"""
+
+
+# ----------------------------------------------------------------------
+# Kompilieren
+# ----------------------------------------------------------------------
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.offsets = array("Q", [0])
+        self.data = bytearray()
+
+    def add(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = len(self.ids)
+            self.ids[text] = string_id
+            self.data += text.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return string_id
+
+
+def _encode(value: Any, out: bytearray, strings: _StringTable):
+    if value is None:
+        out.append(T_NONE)
+    elif value is False or value is True:
+        out.append(T_TRUE if value else T_FALSE)
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        out.append(T_INT)
+        out += INT64.pack(value)
+    elif isinstance(value, float):
+        out.append(T_FLOAT)
+        out += FLOAT64.pack(value)
+    elif isinstance(value, str):
+        out.append(T_STR)
+        out += UINT32.pack(strings.add(value))
+    elif isinstance(value, Mapping):
+        out.append(T_MAP)
+        out += UINT32.pack(len(value))
+        for key, entry in value.items():
+            out += UINT32.pack(strings.add(str(key)))
+            _encode(entry, out, strings)
+    elif is_item_list(value):
+        out.append(T_LIST)
+        out += UINT32.pack(len(value))
+        for entry in value:
+            _encode(entry, out, strings)
+    else:
+        # Datumswerte u.ä. werden als Text abgelegt
+        out.append(T_OTHER)
+        out += UINT32.pack(strings.add(str(value)))
+
+
+def _postings(keys: List[str], entries: Dict[str, set]) -> Tuple[array, array]:
+    """Offsets und zusammenhängende, sortierte Postings in der Reihenfolge von keys"""
+    offsets = array("Q", [0])
+    pool = array("I")
+    for key in keys:
+        pool.extend(sorted(entries[key]))
+        offsets.append(len(pool))
+    return offsets, pool
+
+
+def compile_snapshot(framework_data: Dict[str, Any], path: Path,
+                     source_signature: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """Schreibt den Snapshot (atomar) und gibt die Katalog-Infos zurück"""
+    framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+    strings = _StringTable()
+    values = bytearray()
+    item_offsets = array("Q")
+    token_docs: Dict[str, set] = {}
+    sections = []
+    doc = 0
+
+    for name, section in framework.items():
+        if name in SKIP_SECTIONS or not is_item_list(section):
+            sections.append({"name": name, "kind": "value", "offset": len(values)})
+            _encode(section, values, strings)
+            continue
+        sections.append({"name": name, "kind": "items", "first": doc, "count": len(section)})
+        for item in section:
+            item_offsets.append(len(values))
+            _encode(item, values, strings)
+            for text in item_texts(item):
+                for token in tokenize(text):
+                    token_docs.setdefault(token, set()).add(doc)
+            doc += 1
+    item_offsets.append(len(values))
+
+    # Suchindex: Vokabular sortiert, Token-ID = Position im Vokabular
+    vocabulary = sorted(token_docs)
+    gram_tokens: Dict[str, set] = {}
+    for token_id, token in enumerate(vocabulary):
+        for gram in trigrams(token):
+            gram_tokens.setdefault(gram, set()).add(token_id)
+    grams = sorted(gram_tokens)
+    token_doc_offsets, token_doc_pool = _postings(vocabulary, token_docs)
+    gram_token_offsets, gram_token_pool = _postings(grams, gram_tokens)
+    vocabulary_ids = array("I", (strings.add(token) for token in vocabulary))
+    gram_ids = array("I", (strings.add(gram) for gram in grams))
+
+    info = {"version": VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+            "items": doc, "tokens": len(vocabulary),
+            "source_signature": list(source_signature) if source_signature else None}
+    catalog = bytearray()
+    _encode({"sections": sections, "info": info}, catalog, strings)
+
+    blobs = [strings.offsets.tobytes(), bytes(strings.data), bytes(values), item_offsets.tobytes(),
+             vocabulary_ids.tobytes(), token_doc_offsets.tobytes(), token_doc_pool.tobytes(),
+             gram_ids.tobytes(), gram_token_offsets.tobytes(), gram_token_pool.tobytes(), bytes(catalog)]
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        position = _align(HEADER.size + SECTION.size * SECTION_COUNT)
+        table = []
+        for blob in blobs:
+            table.append((position, len(blob)))
+            position = _align(position + len(blob))
+        f.write(HEADER.pack(MAGIC, VERSION, SECTION_COUNT))
+        for offset, length in table:
+            f.write(SECTION.pack(offset, length))
+        for (offset, _), blob in zip(table, blobs):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return info
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+# ----------------------------------------------------------------------
+# Lesen
+# ----------------------------------------------------------------------
+
+class Snapshot:
+    """Schreibgeschützter Zugriff auf einen kompilierten Snapshot per mmap"""
+
+    def __init__(self, path: Path):
+        if sys.byteorder != "little":
+            raise SnapshotError("Snapshots werden nur auf Little-Endian-Systemen unterstützt")
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"{self.path} ist leer")
+        try:
+            magic, version, count = HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            magic, version, count = b"", 0, 0
+        if magic != MAGIC or version != VERSION or count != SECTION_COUNT:
+            self._mmap.close()
+            raise SnapshotError(f"{self.path} ist kein Codebook-Snapshot (Version {VERSION})")
+        self._view = memoryview(self._mmap)
+        self._views: List[memoryview] = []
+        self._sections = [SECTION.unpack_from(self._mmap, HEADER.size + SECTION.size * i) for i in range(count)]
+
+        self._string_offsets = self._array(S_STRING_OFFSETS, "Q")
+        self._strings_start = self._sections[S_STRINGS][0]
+        self._values_start = self._sections[S_VALUES][0]
+        self._item_offsets = self._array(S_ITEM_OFFSETS, "Q")
+        self._keys: Dict[int, str] = {}
+
+        catalog, _ = self._decode(self._sections[S_CATALOG][0])
+        self.info: Dict[str, Any] = catalog["info"]
+        self._sections_by_name = {section["name"]: section for section in catalog["sections"]}
+        self._first_docs = [section["first"] for section in catalog["sections"] if section["kind"] == "items"]
+        self._doc_categories = [section["name"] for section in catalog["sections"] if section["kind"] == "items"]
+        self.framework = SnapshotFramework(self)
+
+    def _array(self, section: int, typecode: str) -> memoryview:
+        offset, length = self._sections[section]
+        view = self._view[offset:offset + length].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """Gibt die Abbildung frei (bereits dekodierte Items bleiben gültig)"""
+        for view in self._views:
+            view.release()
+        self.framework = None
+        self._view.release()
+        self._mmap.close()
+
+    def __len__(self):
+        return len(self._item_offsets) - 1
+
+    def is_current(self, source_signature: Optional[Tuple[int, int]]) -> bool:
+        """Entspricht der Snapshot noch dem Stand der Quelldatei?"""
+        stored = self.info.get("source_signature")
+        return stored is not None and source_signature is not None and tuple(stored) == tuple(source_signature)
+
+    # ------------------------------------------------------------------
+    # Dekodierung
+    # ------------------------------------------------------------------
+
+    def string(self, string_id: int) -> str:
+        start = self._strings_start + self._string_offsets[string_id]
+        end = self._strings_start + self._string_offsets[string_id + 1]
+        return str(self._view[start:end], "utf-8")
+
+    def _key(self, string_id: int) -> str:
+        key = self._keys.get(string_id)
+        if key is None:
+            key = self._keys[string_id] = self.string(string_id)
+        return key
+
+    def _decode(self, offset: int) -> Tuple[Any, int]:
+        tag = self._mmap[offset]
+        offset += 1
+        if tag == T_STR or tag == T_OTHER:
+            return self.string(UINT32.unpack_from(self._mmap, offset)[0]), offset + 4
+        if tag == T_MAP:
+            count = UINT32.unpack_from(self._mmap, offset)[0]
+            offset += 4
+            result = {}
+            for _ in range(count):
+                key = self._key(UINT32.unpack_from(self._mmap, offset)[0])
+                result[key], offset = self._decode(offset + 4)
+            return result, offset
+        if tag == T_LIST:
+            count = UINT32.unpack_from(self._mmap, offset)[0]
+            offset += 4
+            result = []
+            for _ in range(count):
+                value, offset = self._decode(offset)
+                result.append(value)
+            return result, offset
+        if tag == T_INT:
+            return INT64.unpack_from(self._mmap, offset)[0], offset + 8
+        if tag == T_FLOAT:
+            return FLOAT64.unpack_from(self._mmap, offset)[0], offset + 8
+        if tag == T_NONE:
+            return None, offset
+        if tag in (T_FALSE, T_TRUE):
+            return tag == T_TRUE, offset
+        raise SnapshotError(f"Unbekannter Typ {tag} an Position {offset - 1}")
+
+    def item(self, doc: int) -> Any:
+        """Item über seine fortlaufende Nummer (neu dekodiert, darf verändert werden)"""
+        return self._decode(self._values_start + self._item_offsets[doc])[0]
+
+    def locate(self, doc: int) -> Tuple[str, int]:
+        """(Kategorie, Position) einer Item-Nummer"""
+        position = bisect_right(self._first_docs, doc) - 1
+        return self._doc_categories[position], doc - self._first_docs[position]
+
+    def section(self, name: str) -> Any:
+        section = self._sections_by_name[name]
+        if section["kind"] == "items":
+            return SnapshotCategory(self, section["first"], section["count"])
+        return self._decode(self._values_start + section["offset"])[0]
+
+    def section_names(self) -> List[str]:
+        return list(self._sections_by_name)
+
+    def search_index(self) -> "SnapshotFuzzyIndex":
+        return SnapshotFuzzyIndex(self)
+
+
+class SnapshotCategory(Sequence):
+    """Items einer Kategorie; dekodiert wird erst beim Zugriff"""
+
+    def __init__(self, snapshot: Snapshot, first: int, count: int):
+        self._snapshot = snapshot
+        self._first = first
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Item-Index außerhalb der Kategorie")
+        return self._snapshot.item(self._first + index)
+
+    def __iter__(self):
+        for doc in range(self._first, self._first + self._count):
+            yield self._snapshot.item(doc)
+
+
+class SnapshotFramework(Mapping):
+    """Abschnitte des Frameworks in Dateireihenfolge (Kategorien lazy)"""
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            self._values[name] = self._snapshot.section(name)
+        return self._values[name]
+
+    def __iter__(self):
+        return iter(self._snapshot.section_names())
+
+    def __len__(self):
+        return len(self._snapshot.section_names())
+
+
+# ----------------------------------------------------------------------
+# Eingebetteter Suchindex
+# ----------------------------------------------------------------------
+
+class _SortedPostings(Mapping):
+    """Sortierte Schlüssel (String-IDs) → Postings, Suche per Bisektion"""
+
+    def __init__(self, snapshot: Snapshot, keys: memoryview, offsets: memoryview, pool: memoryview):
+        self._snapshot = snapshot
+        self._keys = keys
+        self._offsets = offsets
+        self._pool = pool
+
+    def key(self, position: int) -> str:
+        return self._snapshot.string(self._keys[position])
+
+    def find(self, key: str) -> Optional[int]:
+        low, high = 0, len(self._keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < len(self._keys) and self.key(low) == key else None
+
+    def postings(self, position: int) -> set:
+        return set(self._pool[self._offsets[position]:self._offsets[position + 1]])
+
+    def __getitem__(self, key: str) -> set:
+        position = self.find(key)
+        if position is None:
+            raise KeyError(key)
+        return self.postings(position)
+
+    def __iter__(self):
+        return (self.key(position) for position in range(len(self._keys)))
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class _Positional(Sequence):
+    """Liste, deren Einträge erst beim Zugriff berechnet werden"""
+
+    def __init__(self, length: int, getter):
+        self._length = length
+        self._getter = getter
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position: int):
+        if not 0 <= position < self._length:
+            raise IndexError(position)
+        return self._getter(position)
+
+
+class _Vocabulary(Mapping):
+    """Wort → Token-ID (nur für die Vokabular-Suche kurzer Wörter)"""
+
+    def __init__(self, tokens: _SortedPostings):
+        self._tokens = tokens
+
+    def __getitem__(self, token: str) -> int:
+        position = self._tokens.find(token)
+        if position is None:
+            raise KeyError(token)
+        return position
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def items(self):
+        # Ohne Bisektion je Eintrag: Position = Token-ID
+        return ((self._tokens.key(position), position) for position in range(len(self._tokens)))
+
+
+class _Docs(Mapping):
+    """Item-Nummer → (Kategorie, Item)"""
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, doc: int):
+        return self._snapshot.locate(doc)[0], self._snapshot.item(doc)
+
+    def __iter__(self):
+        return iter(range(len(self._snapshot)))
+
+    def __len__(self):
+        return len(self._snapshot)
+
+
+class SnapshotFuzzyIndex(FuzzyIndex):
+    """Die Suche des FuzzyIndex direkt auf dem eingebetteten, gemappten Index
+
+    Nur lesend: Änderungen am Framework gibt es im Snapshot-Modus nicht.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        tokens = _SortedPostings(snapshot, snapshot._array(S_VOCABULARY, "I"),
+                                 snapshot._array(S_TOKEN_DOC_OFFSETS, "Q"), snapshot._array(S_TOKEN_DOCS, "I"))
+        grams = _SortedPostings(snapshot, snapshot._array(S_GRAMS, "I"),
+                                snapshot._array(S_GRAM_TOKEN_OFFSETS, "Q"), snapshot._array(S_GRAM_TOKENS, "I"))
+        self._token_ids = _Vocabulary(tokens)
+        self._tokens = _Positional(len(tokens), tokens.key)
+        self._token_docs = _Positional(len(tokens), tokens.postings)
+        self._trigram_tokens = grams
+        self._docs = _Docs(snapshot)
+        self._category_docs = {section["name"]: range(section["first"], section["first"] + section["count"])
+                               for section in snapshot._sections_by_name.values() if section["kind"] == "items"}
+        self._free_token_ids = []
+        self._doc_tokens = {}
+        self._positions = {}
+        self._next_doc = len(snapshot)
+
+    def add_item(self, category: str, position: int, item: Any):
+        raise RuntimeError("Der Suchindex eines Snapshots ist schreibgeschützt")
+
+    def _doc_position(self, category: str, doc: int) -> int:
+        # Dokumente einer Kategorie liegen im Snapshot zusammenhängend
+        return doc - self._category_docs[category].start
+
+    def remove_item(self, category: str, position: int):
+        raise RuntimeError("Der Suchindex eines Snapshots ist schreibgeschützt")
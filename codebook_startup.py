@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Startzeit-Messung
+=================================
+Misst die Phasen des Programmstarts (Interpreter → Modul-Import → erstes
+Bild → Daten bereit). Bewusst ohne Abhängigkeiten, damit das Modul vor allen
+anderen importiert werden kann.
+"""
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+
+def process_age() -> Optional[float]:
+    """Sekunden seit Prozessstart (nur unter Linux über /proc, sonst None)"""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Feld 22 (starttime); der Programmname in Klammern kann Leerzeichen enthalten
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTimer:
+    """Sammelt Zeitmarken und erstellt daraus einen Bericht"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.interpreter = process_age()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter()))
+
+    def phases(self) -> List[Tuple[str, float]]:
+        """(Phase, Dauer in Sekunden) in zeitlicher Reihenfolge"""
+        phases = []
+        if self.interpreter is not None:
+            phases.append(("Interpreter", self.interpreter))
+        previous = self.started
+        for name, timestamp in self.marks:
+            phases.append((name, timestamp - previous))
+            previous = timestamp
+        return phases
+
+    def report(self) -> str:
+        phases = self.phases()
+        total = sum(duration for _, duration in phases)
+        steps = " → ".join(f"{name} {duration * 1000:.0f} ms" for name, duration in phases)
+        return f"⏱️ Start: {steps} (gesamt {total * 1000:.0f} ms)"
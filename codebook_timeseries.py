@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Indikator-Zeitreihen
+====================================
+Speichert Bewertungsrunden der Change-Indikatoren aus
+``PORJECT_MANAGEMENT_INDICATORS_FORCHANGE.txt`` (meeting_frequency,
+transparency_level, ...) spaltenweise: je Indikator eine numpy-Matrix
+Runden × Projekte (float32, fehlende Werte NaN). Neue Runden werden nur
+angehängt. Gleitende Mittelwerte, Veränderungen und Trends werden für alle
+Projekte auf einmal berechnet.
+"""
+
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence
+
+from codebook_consistency import MarkerScale, load_marker_scales
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist optional
+    np = None
+
+INITIAL_ROUNDS = 8
+INITIAL_PROJECTS = 64
+VALUE_DTYPE = "float32"
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Die Indikator-Zeitreihen benötigen numpy (pip install numpy)")
+
+
+def indicator_value(value: Any, scale: Optional[MarkerScale] = None) -> float:
+    """Wandelt einen Bewertungswert in eine Zahl (ja/nein → 1/0, "2 Tage" → 2)
+
+    Mit Skala wird der Wert vorher geprüft (ValueError außerhalb der Skala).
+    """
+    if scale is not None and not scale.accepts(value):
+        raise ValueError(f"{scale.name} = {value!r} liegt außerhalb der Skala \"{scale.text}\"")
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().casefold()
+    if text in ("ja", "yes"):
+        return 1.0
+    if text in ("nein", "no"):
+        return 0.0
+    try:
+        return float(text.split()[0].replace(",", "."))
+    except (IndexError, ValueError):
+        raise ValueError(f"Kein Zahlenwert: {value!r}")
+
+
+class AssessmentStore:
+    """Bewertungsrunden je Indikator und Projekt (nur anhängen)"""
+
+    def __init__(self, scales: Optional[Dict[str, MarkerScale]] = None):
+        require_numpy()
+        self.scales = load_marker_scales() if scales is None else scales
+        self.projects: List[str] = []
+        self.rounds: List[str] = []
+        self._project_ids: Dict[str, int] = {}
+        # Indikator → Matrix (Runden-Kapazität × Projekt-Kapazität), Reserve ist NaN
+        self._columns: Dict[str, "np.ndarray"] = {}
+        self._round_capacity = INITIAL_ROUNDS
+        self._project_capacity = INITIAL_PROJECTS
+        self.modified = False
+
+    @property
+    def indicators(self) -> List[str]:
+        return list(self._columns)
+
+    # ------------------------------------------------------------------
+    # Erfassung
+    # ------------------------------------------------------------------
+
+    def add_round(self, label: str, assessments: Mapping) -> int:
+        """Hängt eine Runde an: {Projekt: {Indikator: Wert}}; gibt die Rundennummer zurück"""
+        projects = list(assessments)
+        columns: Dict[str, List[float]] = {}
+        for position, project in enumerate(projects):
+            for indicator, value in assessments[project].items():
+                column = columns.setdefault(indicator, [float("nan")] * len(projects))
+                column[position] = indicator_value(value, self.scales.get(indicator))
+        return self.add_round_columns(label, projects, columns, validate=False)
+
+    def add_round_columns(self, label: str, projects: Sequence[str],
+                          columns: Mapping, validate: bool = True) -> int:
+        """Hängt eine Runde spaltenweise an: {Indikator: Werte in der Reihenfolge von projects}"""
+        label = str(label)
+        if label in self.rounds:
+            raise ValueError(f"Runde '{label}' existiert bereits (Runden werden nur angehängt)")
+        values = {}
+        for indicator, column in columns.items():
+            array = np.asarray(column, dtype=np.float64)
+            if array.shape != (len(projects),):
+                raise ValueError(f"{indicator}: {array.shape[0] if array.ndim else 0} Werte "
+                                 f"für {len(projects)} Projekte")
+            if validate:
+                self._validate(indicator, array)
+            values[indicator] = array
+
+        project_ids = np.array([self._project_id(project) for project in projects], dtype=np.int64)
+        self._reserve(len(self.rounds) + 1, len(self.projects))
+        round_number = len(self.rounds)
+        self.rounds.append(label)
+        for indicator, array in values.items():
+            self._column(indicator)[round_number, project_ids] = array
+        self.modified = True
+        return round_number
+
+    def _validate(self, indicator: str, array: "np.ndarray"):
+        scale = self.scales.get(indicator)
+        if scale is None:
+            return
+        present = array[~np.isnan(array)]
+        if scale.minimum is not None:
+            # ja/nein (1/0) zusätzlich zur Zahlenskala erlaubt
+            allowed = (present >= scale.minimum) & (present <= scale.maximum)
+            if scale.choices:
+                allowed |= (present == 0) | (present == 1)
+        elif scale.quantitative:
+            allowed = present >= 0
+        else:
+            return
+        if not allowed.all():
+            raise ValueError(f"{indicator} = {present[~allowed][0]:g} liegt außerhalb der Skala \"{scale.text}\"")
+
+    def _project_id(self, project: str) -> int:
+        project = str(project)
+        project_id = self._project_ids.get(project)
+        if project_id is None:
+            project_id = len(self.projects)
+            self.projects.append(project)
+            self._project_ids[project] = project_id
+        return project_id
+
+    def _reserve(self, rounds: int, projects: int):
+        """Vergrößert alle Matrizen bei Bedarf (Kapazität verdoppelt sich)"""
+        round_capacity, project_capacity = self._round_capacity, self._project_capacity
+        while round_capacity < rounds:
+            round_capacity *= 2
+        while project_capacity < projects:
+            project_capacity *= 2
+        if (round_capacity, project_capacity) == (self._round_capacity, self._project_capacity):
+            return
+        for indicator, matrix in self._columns.items():
+            grown = np.full((round_capacity, project_capacity), np.nan, dtype=VALUE_DTYPE)
+            grown[:matrix.shape[0], :matrix.shape[1]] = matrix
+            self._columns[indicator] = grown
+        self._round_capacity, self._project_capacity = round_capacity, project_capacity
+
+    def _column(self, indicator: str) -> "np.ndarray":
+        if indicator not in self._columns:
+            self._columns[indicator] = np.full((self._round_capacity, self._project_capacity),
+                                               np.nan, dtype=VALUE_DTYPE)
+        return self._columns[indicator]
+
+    # ------------------------------------------------------------------
+    # Abfragen (Ergebnisse: Runden × Projekte)
+    # ------------------------------------------------------------------
+
+    def matrix(self, indicator: str, projects: Optional[Sequence[str]] = None) -> "np.ndarray":
+        """Werte als float64-Matrix Runden × Projekte (NaN = nicht bewertet)"""
+        if indicator not in self._columns:
+            raise KeyError(f"Unbekannter Indikator: {indicator}")
+        values = self._columns[indicator][:len(self.rounds), :len(self.projects)]
+        if projects is not None:
+            values = values[:, [self._project_ids[str(project)] for project in projects]]
+        return values.astype(np.float64)
+
+    def series(self, indicator: str, project: str) -> "np.ndarray":
+        return self.matrix(indicator, [project])[:, 0]
+
+    def rolling_mean(self, indicator: str, window: int = 3,
+                     projects: Optional[Sequence[str]] = None) -> "np.ndarray":
+        """Mittelwert der jeweils letzten `window` Runden (fehlende Werte zählen nicht)"""
+        values = self.matrix(indicator, projects)
+        valid = ~np.isnan(values)
+        sums = np.zeros((values.shape[0] + 1, values.shape[1]))
+        counts = np.zeros_like(sums)
+        np.cumsum(np.where(valid, values, 0.0), axis=0, out=sums[1:])
+        np.cumsum(valid, axis=0, out=counts[1:])
+        start = np.maximum(np.arange(values.shape[0]) + 1 - window, 0)
+        window_sums = sums[1:] - sums[start]
+        window_counts = counts[1:] - counts[start]
+        result = np.full(values.shape, np.nan)
+        np.divide(window_sums, window_counts, out=result, where=window_counts > 0)
+        return result
+
+    def deltas(self, indicator: str, periods: int = 1,
+               projects: Optional[Sequence[str]] = None) -> "np.ndarray":
+        """Veränderung gegenüber `periods` Runden vorher (erste Runden NaN)"""
+        values = self.matrix(indicator, projects)
+        result = np.full(values.shape, np.nan)
+        if periods < values.shape[0]:
+            result[periods:] = values[periods:] - values[:-periods]
+        return result
+
+    def trend(self, indicator: str, window: Optional[int] = None,
+              projects: Optional[Sequence[str]] = None) -> "np.ndarray":
+        """Steigung der Regressionsgeraden je Projekt über die letzten `window` Runden
+
+        NaN, wenn ein Projekt in diesem Zeitraum weniger als zwei Bewertungen hat.
+        """
+        values = self.matrix(indicator, projects)
+        if window is not None:
+            values = values[-window:]
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        times = np.arange(values.shape[0], dtype=np.float64)[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            time_mean = (times * valid).sum(axis=0) / count
+            value_mean = np.where(valid, values, 0.0).sum(axis=0) / count
+            time_offsets = np.where(valid, times - time_mean, 0.0)
+            value_offsets = np.where(valid, values - value_mean, 0.0)
+            variance = (time_offsets * time_offsets).sum(axis=0)
+            slopes = (time_offsets * value_offsets).sum(axis=0) / variance
+        slopes[(count < 2) | (variance == 0)] = np.nan
+        return slopes
+
+    def trend_query(self, indicator: str, window: int = 3, direction: str = "up",
+                    min_slope: float = 0.0, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """Projekte mit dem stärksten Anstieg ("up") bzw. Rückgang ("down")"""
+        slopes = self.trend(indicator, window)
+        signed = slopes if direction == "up" else -slopes
+        candidates = np.flatnonzero(signed > min_slope)
+        order = candidates[np.argsort(-signed[candidates], kind="stable")]
+        if limit is not None:
+            order = order[:limit]
+        latest = self.matrix(indicator)[-1] if self.rounds else np.array([])
+        return [{"project": self.projects[position],
+                 "slope": round(float(slopes[position]), 3),
+                 "latest": None if np.isnan(latest[position]) else float(latest[position])}
+                for position in order.tolist()]
+
+    # ------------------------------------------------------------------
+    # Persistenz
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path):
+        """Speichert alle Runden komprimiert (atomar über eine temporäre Datei)"""
+        path = Path(path)
+        arrays = {f"values_{position}": self._columns[indicator][:len(self.rounds), :len(self.projects)]
+                  for position, indicator in enumerate(self._columns)}
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, projects=np.array(self.projects, dtype=str),
+                                rounds=np.array(self.rounds, dtype=str),
+                                indicators=np.array(self.indicators, dtype=str), **arrays)
+        os.replace(tmp_path, path)
+        self.modified = False
+
+    @classmethod
+    def load(cls, path: Path, scales: Optional[Dict[str, MarkerScale]] = None) -> "AssessmentStore":
+        """Lädt gespeicherte Runden (leerer Speicher, wenn die Datei fehlt)"""
+        store = cls(scales)
+        if not Path(path).exists():
+            return store
+        with np.load(path, allow_pickle=False) as data:
+            store.rounds = data["rounds"].tolist()
+            for project in data["projects"].tolist():
+                store._project_id(project)
+            store._reserve(len(store.rounds), len(store.projects))
+            for position, indicator in enumerate(data["indicators"].tolist()):
+                store._column(indicator)[:len(store.rounds), :len(store.projects)] = data[f"values_{position}"]
+        return store
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Framework-Visualisierung
+========================================
+Grafische Darstellung der Hierarchie Kategorie → Item → verschachteltes Element
+(inkl. Marker-Werte). Das Layout wird in einem Hintergrund-Thread berechnet,
+gezeichnet wird mit Level-of-Detail nur der sichtbare Ausschnitt.
+SVG- und DOT-Export funktionieren ohne GUI.
+"""
+
+import threading
+import queue
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from html import escape
+from typing import Dict, List, Any, Optional, Callable
+
+from codebook_model import is_item_list
+
+# Knotentypen in Hierarchie-Reihenfolge
+KIND_ROOT = "root"
+KIND_CATEGORY = "category"
+KIND_ITEM = "item"
+KIND_ELEMENT = "element"
+KIND_ENTRY = "entry"
+KIND_MARKER = "marker"
+
+KIND_COLORS = {
+    KIND_ROOT: "#2c3e50",
+    KIND_CATEGORY: "#2980b9",
+    KIND_ITEM: "#27ae60",
+    KIND_ELEMENT: "#8e44ad",
+    KIND_ENTRY: "#7f8c8d",
+    KIND_MARKER: "#e67e22",
+}
+
+# Ab welchem Zoom-Faktor ein Knotentyp gezeichnet wird
+KIND_MIN_SCALE = {
+    KIND_ROOT: 0.0,
+    KIND_CATEGORY: 0.0,
+    KIND_ITEM: 0.08,
+    KIND_ELEMENT: 0.3,
+    KIND_ENTRY: 0.45,
+    KIND_MARKER: 0.45,
+}
+
+LABEL_MIN_SCALE = 0.6
+LEVEL_GAP = 220
+ROW_GAP = 22
+MAX_LABEL = 40
+
+
+class FrameworkTree:
+    """Flache Baumdarstellung (parallele Listen statt Knoten-Objekte)"""
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.kinds: List[str] = []
+        self.parents: List[int] = []
+        self.depths: List[int] = []
+        self.children: List[List[int]] = []
+
+    def add(self, label: str, kind: str, parent: int = -1) -> int:
+        """Fügt einen Knoten hinzu und gibt seinen Index zurück"""
+        node = len(self.labels)
+        self.labels.append(_shorten(label))
+        self.kinds.append(kind)
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1 if parent >= 0 else 0)
+        self.children.append([])
+        if parent >= 0:
+            self.children[parent].append(node)
+        return node
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def _shorten(text: Any) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= MAX_LABEL else text[:MAX_LABEL - 1] + "…"
+
+
+def _item_label(item: Any, position: int) -> str:
+    if isinstance(item, Mapping):
+        for field in ("name", "id", "text", "regel", "kontext", "frage", "beschreibung"):
+            if item.get(field) not in (None, ""):
+                return str(item[field])
+        return f"Item {position + 1}"
+    return str(item)
+
+
+def build_tree(framework_data: Dict[str, Any]) -> FrameworkTree:
+    """Baut den Hierarchie-Baum aus den Framework-Daten"""
+    tree = FrameworkTree()
+    framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+    meta = framework.get("meta", {}) if isinstance(framework.get("meta"), dict) else {}
+    root = tree.add(meta.get("name", "Framework"), KIND_ROOT)
+
+    for category, items in framework.items():
+        if category in ("meta", "category_meta"):
+            continue
+        category_node = tree.add(category, KIND_CATEGORY, root)
+        if not is_item_list(items):
+            continue
+
+        for i, item in enumerate(items):
+            item_node = tree.add(_item_label(item, i), KIND_ITEM, category_node)
+            if isinstance(item, Mapping):
+                _add_item_elements(tree, item_node, item)
+
+    return tree
+
+
+def _add_item_elements(tree: FrameworkTree, item_node: int, item: Dict[str, Any]):
+    """Verschachtelte Elemente (Listen/Dicts) und Marker eines Items"""
+    for field, value in item.items():
+        if field == "marker" and isinstance(value, list):
+            marker_node = tree.add(field, KIND_ELEMENT, item_node)
+            for marker in value:
+                if isinstance(marker, Mapping):
+                    for name, marker_value in marker.items():
+                        tree.add(f"{name} = {marker_value}", KIND_MARKER, marker_node)
+                else:
+                    tree.add(marker, KIND_MARKER, marker_node)
+        elif isinstance(value, list) and value:
+            element_node = tree.add(field, KIND_ELEMENT, item_node)
+            for i, entry in enumerate(value):
+                tree.add(_item_label(entry, i), KIND_ENTRY, element_node)
+        elif isinstance(value, Mapping) and value:
+            element_node = tree.add(field, KIND_ELEMENT, item_node)
+            for key, entry in value.items():
+                tree.add(f"{key}: {entry}" if not isinstance(entry, (Mapping, list)) else key,
+                         KIND_ENTRY, element_node)
+
+
+class FrameworkLayout:
+    """Positionen aller Knoten plus Index nach y für Sichtbarkeitsabfragen"""
+
+    def __init__(self, tree: FrameworkTree, xs: List[float], ys: List[float]):
+        self.tree = tree
+        self.xs = xs
+        self.ys = ys
+        self.order = sorted(range(len(ys)), key=ys.__getitem__)
+        self.sorted_ys = [ys[i] for i in self.order]
+        self.width = max(xs) + LEVEL_GAP if xs else 0
+        self.height = max(ys) + ROW_GAP if ys else 0
+
+    def visible_nodes(self, y_min: float, y_max: float) -> List[int]:
+        """Knoten im y-Bereich, O(log n + Ergebnis)"""
+        start = bisect_left(self.sorted_ys, y_min)
+        end = bisect_right(self.sorted_ys, y_max)
+        return self.order[start:end]
+
+
+def compute_layout(tree: FrameworkTree) -> FrameworkLayout:
+    """Horizontales Baum-Layout: Blätter untereinander, Eltern mittig über den Kindern"""
+    count = len(tree)
+    xs = [depth * LEVEL_GAP for depth in tree.depths]
+    ys = [0.0] * count
+    next_row = 0
+
+    # Iterativer Post-Order-Durchlauf (keine Rekursionsgrenze bei großen Codebooks)
+    stack = [(0, False)] if count else []
+    while stack:
+        node, expanded = stack.pop()
+        children = tree.children[node]
+        if not children:
+            ys[node] = next_row * ROW_GAP
+            next_row += 1
+        elif expanded:
+            ys[node] = (ys[children[0]] + ys[children[-1]]) / 2
+        else:
+            stack.append((node, True))
+            for child in reversed(children):
+                stack.append((child, False))
+
+    return FrameworkLayout(tree, xs, ys)
+
+
+class LayoutWorker:
+    """Berechnet Baum und Layout in einem Hintergrund-Thread"""
+
+    def __init__(self, framework_data: Dict[str, Any]):
+        # Flache Kopie der Kategorielisten, damit spätere Änderungen im
+        # GUI-Thread den laufenden Aufbau nicht stören
+        framework = framework_data.get("framework", {}) if isinstance(framework_data, dict) else {}
+        self._snapshot = {"framework": {key: list(value) if isinstance(value, list) else value
+                                        for key, value in framework.items()}}
+        self.results: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "LayoutWorker":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.results.put(compute_layout(build_tree(self._snapshot)))
+        except Exception as e:
+            self.results.put(e)
+
+    def poll(self, root: tk.Misc, callback: Callable[[Any], None], interval: int = 50):
+        """Fragt im Tk-Loop per after() nach dem Ergebnis, ohne zu blockieren"""
+        try:
+            result = self.results.get_nowait()
+        except queue.Empty:
+            root.after(interval, self.poll, root, callback, interval)
+            return
+        callback(result)
+
+
+class FrameworkCanvas:
+    """Tk-Canvas mit Pan/Zoom, das nur den sichtbaren Ausschnitt zeichnet"""
+
+    MAX_DRAWN_NODES = 2500
+
+    def __init__(self, master: tk.Misc):
+        self.canvas = tk.Canvas(master, background="white", highlightthickness=0)
+        self.layout: Optional[FrameworkLayout] = None
+        self.scale = 1.0
+        self.offset_x = -20.0
+        self.offset_y = -20.0
+        self._drag_start = None
+        self._redraw_pending = False
+
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(1.2, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(1 / 1.2, e.x, e.y))
+        self.canvas.bind("<Configure>", lambda e: self.request_redraw())
+
+    def set_layout(self, layout: FrameworkLayout):
+        """Übernimmt ein berechnetes Layout und passt die Ansicht ein"""
+        self.layout = layout
+        height = max(self.canvas.winfo_height(), 1)
+        if layout.height > 0:
+            self.scale = min(1.0, max(0.02, height / (layout.height + 40)))
+        self.request_redraw()
+
+    def zoom(self, factor: float, x: float, y: float):
+        """Zoomt um den Mauspunkt"""
+        world_x = self.offset_x + x / self.scale
+        world_y = self.offset_y + y / self.scale
+        self.scale = min(4.0, max(0.01, self.scale * factor))
+        self.offset_x = world_x - x / self.scale
+        self.offset_y = world_y - y / self.scale
+        self.request_redraw()
+
+    def _on_wheel(self, event):
+        self.zoom(1.2 if event.delta > 0 else 1 / 1.2, event.x, event.y)
+
+    def _on_drag_start(self, event):
+        self._drag_start = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_start:
+            dx = event.x - self._drag_start[0]
+            dy = event.y - self._drag_start[1]
+            self.offset_x -= dx / self.scale
+            self.offset_y -= dy / self.scale
+            self._drag_start = (event.x, event.y)
+            self.request_redraw()
+
+    def request_redraw(self):
+        """Fasst mehrere Pan/Zoom-Events zu einem Neuzeichnen zusammen"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        """Zeichnet den sichtbaren Ausschnitt mit Level-of-Detail"""
+        self._redraw_pending = False
+        self.canvas.delete("all")
+        if not self.layout:
+            return
+
+        layout = self.layout
+        tree = layout.tree
+        scale = self.scale
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        y_min = self.offset_y - ROW_GAP
+        y_max = self.offset_y + height / scale + ROW_GAP
+        x_max = self.offset_x + width / scale
+
+        visible = [node for node in layout.visible_nodes(y_min, y_max)
+                   if scale >= KIND_MIN_SCALE[tree.kinds[node]]
+                   and layout.xs[node] <= x_max]
+
+        # Bei sehr vielen sichtbaren Knoten nur jeden n-ten zeichnen
+        step = max(1, -(-len(visible) // self.MAX_DRAWN_NODES))
+        drawn = visible[::step]
+        show_labels = scale >= LABEL_MIN_SCALE
+        radius = max(1.5, 4 * scale)
+
+        for node in drawn:
+            x = (layout.xs[node] - self.offset_x) * scale
+            y = (layout.ys[node] - self.offset_y) * scale
+            parent = tree.parents[node]
+            if parent >= 0:
+                px = (layout.xs[parent] - self.offset_x) * scale
+                py = (layout.ys[parent] - self.offset_y) * scale
+                self.canvas.create_line(px + radius, py, x - radius, y, fill="#bdc3c7")
+
+            kind = tree.kinds[node]
+            color = KIND_COLORS[kind]
+            self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                    fill=color, outline=color)
+            if show_labels or kind in (KIND_ROOT, KIND_CATEGORY):
+                self.canvas.create_text(x + radius + 4, y, text=tree.labels[node],
+                                        anchor=tk.W, font=("Arial", max(7, int(9 * min(scale, 1.5)))))
+
+
+def export_svg(layout: FrameworkLayout, output_file: str) -> str:
+    """Exportiert das Layout als SVG (ohne GUI)"""
+    tree = layout.tree
+    margin = 20
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{layout.width + 2 * margin:.0f}" '
+        f'height="{layout.height + 2 * margin:.0f}" font-family="Arial" font-size="11">',
+        f'<g transform="translate({margin},{margin})">',
+    ]
+    for node in range(len(tree)):
+        parent = tree.parents[node]
+        if parent >= 0:
+            lines.append(f'<line x1="{layout.xs[parent]:.1f}" y1="{layout.ys[parent]:.1f}" '
+                         f'x2="{layout.xs[node]:.1f}" y2="{layout.ys[node]:.1f}" stroke="#bdc3c7"/>')
+    for node in range(len(tree)):
+        x, y = layout.xs[node], layout.ys[node]
+        color = KIND_COLORS[tree.kinds[node]]
+        lines.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}"/>')
+        lines.append(f'<text x="{x + 8:.1f}" y="{y + 4:.1f}">{escape(tree.labels[node])}</text>')
+    lines.append("</g></svg>")
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+    return output_file
+
+
+def export_dot(tree: FrameworkTree, output_file: str) -> str:
+    """Exportiert den Baum im Graphviz-DOT-Format (ohne GUI)"""
+    def quote(text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    lines = ["digraph framework {", "  rankdir=LR;", "  node [shape=box, style=rounded, fontname=Arial];"]
+    for node in range(len(tree)):
+        lines.append(f"  n{node} [label={quote(tree.labels[node])}, color={quote(KIND_COLORS[tree.kinds[node]])}];")
+    for node in range(len(tree)):
+        if tree.parents[node] >= 0:
+            lines.append(f"  n{tree.parents[node]} -> n{node};")
+    lines.append("}")
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+    return output_file
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Codebook LIFE - Watch-Modus
+===========================
+Erkennt externe Änderungen an der Framework-YAML (git pull, anderer Editor).
+Unter Linux über inotify (per ctypes, ohne Zusatzpaket), sonst über günstiges
+Polling von mtime/Größe. Geänderte Daten werden im Hintergrund geparst und
+gegen den Stand im Speicher gedifft, sodass nur geänderte Kategorien/Items
+übernommen werden.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, NamedTuple, Tuple
+
+from codebook_revisions import content_hash
+
+# inotify-Konstanten (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FileChange(NamedTuple):
+    """Eine Änderung im Format des Change-Listeners"""
+    action: str
+    category: Optional[str]
+    index: Optional[int]
+    old_item: Any
+    new_item: Any
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, Größe) einer Datei oder None, falls sie nicht existiert"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Beobachtet eine Datei in einem Hintergrund-Thread"""
+
+    def __init__(self, path: Path, on_change: Callable[[], None], interval: float = 1.0,
+                 debounce: float = 0.2, use_inotify: bool = True):
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self._libc = _load_inotify() if use_inotify else None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "inotify" if self._libc else "polling"
+
+    def start(self) -> "FileWatcher":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0 and self._libc.inotify_add_watch(
+                    fd, os.fsencode(str(self.path.parent)), WATCH_MASK) >= 0:
+                try:
+                    self._run_inotify(fd)
+                finally:
+                    os.close(fd)
+                return
+            if fd >= 0:
+                os.close(fd)
+            self.mode = "polling"
+        self._run_polling()
+
+    def _run_inotify(self, fd: int):
+        name = os.fsencode(self.path.name)
+        while not self._stop.is_set():
+            readable, _, _ = select.select([fd], [], [], self.interval)
+            if not readable:
+                continue
+            if self._read_events(fd, name):
+                # Editoren schreiben oft in mehreren Schritten: kurz sammeln
+                time.sleep(self.debounce)
+                self._read_events(fd, name)
+                self._notify()
+
+    @staticmethod
+    def _read_events(fd: int, name: bytes) -> bool:
+        try:
+            buffer = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        matched = False
+        while offset + EVENT_HEADER.size <= len(buffer):
+            _, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            event_name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            matched = matched or event_name == name
+            offset += EVENT_HEADER.size + length
+        return matched
+
+    def _run_polling(self):
+        last_signature = file_signature(self.path)
+        while not self._stop.wait(self.interval):
+            signature = file_signature(self.path)
+            if signature != last_signature:
+                last_signature = signature
+                self._notify()
+
+    def _notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Fehler im Datei-Watcher: {e}")
+
+
+def diff_item_lists(category: str, old_items: List[Any], new_items: List[Any]) -> List[FileChange]:
+    """Minimale Änderungsfolge zwischen zwei Item-Listen
+
+    Die Änderungen sind so geordnet, dass sie nacheinander angewendet werden
+    können (Indizes bleiben gültig).
+    """
+    old_hashes = [content_hash(item) for item in old_items]
+    new_hashes = [content_hash(item) for item in new_items]
+    changes: List[FileChange] = []
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+
+    # Von hinten nach vorne, damit Indizes davor unverändert bleiben
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for offset in range(common):
+            changes.append(FileChange("update", category, i1 + offset,
+                                      old_items[i1 + offset], new_items[j1 + offset]))
+        for index in range(i2 - 1, i1 + common - 1, -1):
+            changes.append(FileChange("delete", category, index, old_items[index], None))
+        for offset in range(common, j2 - j1):
+            changes.append(FileChange("add", category, i1 + offset, None, new_items[j1 + offset]))
+    return changes
+
+
+def compute_changes(old_data: Dict[str, Any], new_data: Dict[str, Any]) -> List[FileChange]:
+    """Vergleicht zwei Framework-Stände und liefert nur die geänderten Teile"""
+    old_framework = old_data.get("framework", {}) if isinstance(old_data, dict) else {}
+    new_framework = new_data.get("framework", {}) if isinstance(new_data, dict) else {}
+    changes: List[FileChange] = []
+
+    for key in ("meta", "category_meta"):
+        if old_framework.get(key) != new_framework.get(key):
+            changes.append(FileChange(key, None, None, old_framework.get(key), new_framework.get(key)))
+
+    for category, old_items in old_framework.items():
+        if category in ("meta", "category_meta"):
+            continue
+        if category not in new_framework:
+            changes.append(FileChange("remove_category", category, None, (old_items, None), None))
+
+    for category, new_items in new_framework.items():
+        if category in ("meta", "category_meta"):
+            continue
+        if category not in old_framework:
+            changes.append(FileChange("restore_category", category, None, None, (new_items, None)))
+            continue
+        old_items = old_framework[category]
+        if old_items == new_items:
+            continue
+        if isinstance(old_items, list) and isinstance(new_items, list):
+            changes.extend(diff_item_lists(category, old_items, new_items))
+        else:
+            changes.append(FileChange("remove_category", category, None, (old_items, None), None))
+            changes.append(FileChange("restore_category", category, None, None, (new_items, None)))
+
+    return changes
@@ -17,18 +17,31 @@ sys.path.insert(0, str(current_dir))
 
 def main():
     """Hauptfunktion zum Starten der Codebook LIFE GUI"""
+    from codebook_startup import StartupTimer
+    timer = StartupTimer()
     print("🚀 Starte Codebook LIFE GUI...")
     print("=" * 50)
     
     try:
-        # Importiere und starte die GUI
+        # Fenster zuerst zeigen, erst danach das (größere) GUI-Modul importieren
+        import tkinter as tk
+        root = tk.Tk()
+        root.title("Codebook LIFE")
+        root.geometry("1400x900")
+        splash = tk.Label(root, text="⏳ Codebook LIFE wird geladen...", font=("Arial", 14))
+        splash.pack(expand=True)
+        root.update()
+        timer.mark("Fenster")
+        
         from codebook_life_gui import CodebookLIFEGUI
+        timer.mark("Modul-Import")
         
         print("✅ GUI-Module erfolgreich geladen")
         print("🎯 Initialisiere Codebook LIFE System...")
         
-        # Erstelle und starte die GUI
-        app = CodebookLIFEGUI()
+        # Erstelle und starte die GUI (Framework-Daten werden im Hintergrund geladen)
+        splash.destroy()
+        app = CodebookLIFEGUI(root=root, startup_timer=timer)
         
         print("✅ Codebook LIFE GUI gestartet!")
         print("💡 Verwende die GUI um das LIFE Framework zu verwalten")
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+import yaml
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def _saved_regeln(assistant):
+    with open(assistant.framework_file, encoding='utf-8') as f:
+        return yaml.safe_load(f)['framework']['regeln']
+
+
+def test_autosave_coalesces_writes(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path, autosave_delay=0.2)
+    try:
+        for i in range(50):
+            assistant.add_item_to_category('regeln', {'id': f'R{i}'})
+        assert not assistant.framework_file.exists()  # Nichts blockierend geschrieben
+
+        deadline = time.time() + 5
+        while not assistant.autosave.writes and time.time() < deadline:
+            time.sleep(0.05)
+        assert assistant.autosave.writes == 1
+        assert len(_saved_regeln(assistant)) == 50
+
+        assistant.add_item_to_category('regeln', {'id': 'R50'})
+    finally:
+        assistant.close()  # schreibt ausstehende Änderungen
+    assert len(_saved_regeln(assistant)) == 51
+
+
+def test_recovery_from_last_complete_write(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1'})
+    assistant.add_item_to_category('regeln', {'id': 'R2'})
+
+    # Absturz mitten im Schreiben: halbe temporäre Datei, beschädigte Hauptdatei
+    (tmp_path / 'life_framework.yaml.tmp').write_text('framework: {regeln: [', encoding='utf-8')
+    assistant.framework_file.write_text('framework: {regeln: [', encoding='utf-8')
+
+    recovered = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assert [r['id'] for r in recovered.get_category_items('regeln')] == ['R1']
+    assert not (tmp_path / 'life_framework.yaml.tmp').exists()
+
+
+def test_failed_autosave_write_is_retried(tmp_path, monkeypatch):
+    import codebook_life_gui
+
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path, autosave_delay=60)
+    try:
+        assistant.add_item_to_category('regeln', {'id': 'R1'})
+
+        def disk_full(path, content):
+            raise OSError(28, 'No space left on device')
+
+        original = codebook_life_gui.atomic_write_text
+        monkeypatch.setattr(codebook_life_gui, 'atomic_write_text', disk_full)
+        assistant.flush()
+        assert assistant.autosave.writes == 0 and not assistant.framework_file.exists()
+
+        # Die Änderung bleibt vorgemerkt und wird beim nächsten Versuch geschrieben
+        monkeypatch.setattr(codebook_life_gui, 'atomic_write_text', original)
+        assistant.flush()
+        assert assistant.autosave.writes == 1
+        assert [r['id'] for r in _saved_regeln(assistant)] == ['R1']
+    finally:
+        assistant.close()
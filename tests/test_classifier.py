@@ -0,0 +1,50 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import codebook_classifier
+from codebook_life_gui import CodebookLIFEAssistant
+
+TRAINING = {
+    'rollen': ['Product Owner verantwortet das Backlog', 'Scrum Master begleitet das Team',
+               'Stakeholder bringen Anforderungen ein'],
+    'open_questions': ['Wie messen wir den Erfolg?', 'Wer entscheidet über Prioritäten?',
+                       'Ist die Schnittstelle geklärt?'],
+}
+
+
+def _assistant(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    for category, texts in TRAINING.items():
+        for text in texts:
+            assistant.add_item_to_category(category, {'name': text[:20], 'beschreibung': text})
+    return assistant
+
+
+def test_classifier_learns_from_items(tmp_path, monkeypatch):
+    assistant = _assistant(tmp_path)
+    # Schlüsselwörter würden "Rolle"/"Team" ignorieren und "backlog" nicht kennen
+    assert assistant.analyze_content_for_category('Das Backlog pflegt der Product Owner') == 'rollen'
+    assert assistant.analyze_content_for_category('Wer misst den Erfolg?') == 'open_questions'
+    # Ohne bekannte Wörter greift der Schlüsselwort-Fallback
+    assert assistant.analyze_content_for_category('Ein Tipp mit Trick') == 'heuristiken'
+
+    texts = ['Backlog und Team', 'Prioritäten entscheiden?', 'xyz']
+    batch = assistant.suggest_categories(texts)
+    monkeypatch.setattr(codebook_classifier, 'np', None)
+    assert assistant.suggest_categories(texts) == batch == ['rollen', 'open_questions', 'unknown']
+
+
+def test_incremental_unlearning_and_evaluation(tmp_path):
+    assistant = _assistant(tmp_path)
+    classifier = assistant.get_category_classifier()
+    trained = dict(classifier._token_totals)
+
+    assistant.add_item_to_category('rollen', {'name': 'Coach', 'beschreibung': 'Agile Coach'})
+    assistant.delete_item_from_category('rollen', 3)
+    assert classifier._token_totals == trained
+
+    evaluation = assistant.evaluate_category_classifier(holdout=0.5)
+    assert evaluation['train_size'] + evaluation['test_size'] == 6
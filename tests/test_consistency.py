@@ -0,0 +1,73 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import codebook_consistency
+from codebook_consistency import ConsistencyChecker, ConsistencyRule, load_marker_scales
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def _rules(issues):
+    return {(issue.category, issue.index, issue.rule) for issue in issues}
+
+
+def test_marker_scales_are_read_from_indicator_file():
+    scales = load_marker_scales()
+    assert scales['team_cohesion'].accepts(5) and not scales['team_cohesion'].accepts(7)
+    assert scales['mutual_dependency'].accepts('ja') and scales['mutual_dependency'].accepts(3)
+    assert not scales['mutual_dependency'].accepts('vielleicht')
+    assert scales['decision_speed'].accepts('2 Tage') and not scales['meeting_frequency'].accepts(-1)
+
+
+def test_default_rules_find_inconsistencies(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('prinzipien', {'prinzipien': [{'name': 'Teamarbeit', 'marker': [{'team_cohesion': 9}]}]})
+    assistant.add_item_to_category('prinzipien', {'id': 'R1', 'name': 'Fokus', 'beschreibung': ''})
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Immer testen'})
+    assistant.add_item_to_category('rollen', {'name': 'Product Owner'})
+    assistant.add_item_to_category('prozesse', {'name': 'Review', 'beteiligte': ['Product Owner', 'Scrum Master']})
+
+    found = _rules(assistant.check_consistency())
+    assert ('prinzipien', 0, 'nesting') in found
+    assert ('prinzipien', 0, 'marker_scale') in found
+    assert ('prinzipien', 1, 'empty_field') in found
+    assert {('prinzipien', 1, 'duplicate_id'), ('regeln', 0, 'duplicate_id')} <= found
+    dangling = [issue for issue in assistant.check_consistency() if issue.rule == 'dangling_role']
+    assert [(issue.category, issue.index) for issue in dangling] == [('prozesse', 0)]
+    assert 'scrum master' in dangling[0].message
+
+
+class CountingRule(ConsistencyRule):
+    name = 'counting'
+
+    def check_item(self, category, item):
+        return [('info', 'gesehen')]
+
+
+def test_incremental_mode_rechecks_only_changed_items(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    for i in range(5):
+        assistant.add_item_to_category('regeln', {'id': f'R{i}', 'text': 'Regel'})
+    assistant.check_consistency()
+    checker = assistant._consistency_checker
+    checker.register(CountingRule())
+    assert len(checker.check()) == 5 and checker.checked_items == 5
+
+    assistant.insert_item_into_category('regeln', 0, {'id': 'R4', 'text': 'Doppelt'})
+    assistant.delete_item_from_category('regeln', 3)
+    issues = assistant.check_consistency()
+    assert checker.checked_items == 1
+    assert {(issue.index, issue.rule) for issue in issues if issue.rule == 'duplicate_id'} == {(0, 'duplicate_id'), (4, 'duplicate_id')}
+    assert sorted(issue.index for issue in issues if issue.rule == 'counting') == [0, 1, 2, 3, 4]
+
+
+def test_parallel_check_matches_serial(monkeypatch):
+    monkeypatch.setattr(codebook_consistency, 'PARALLEL_MIN_ITEMS', 1)
+    monkeypatch.setattr(codebook_consistency, 'MIN_CHUNK_SIZE', 10)
+    framework = {'framework': {'regeln': [{'id': f'R{i % 40}', 'text': '' if i % 7 else 'x'} for i in range(100)],
+                               'prozesse': [{'name': 'P', 'beteiligte': ['Niemand']}]}}
+    parallel = ConsistencyChecker(workers=2).check(framework)
+    serial = ConsistencyChecker(workers=1).check(framework)
+    assert parallel == serial and len(serial) > 100
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import yaml
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_detail import FieldStream, TextPager, render_outline, restore_large_fields
+from codebook_model import compact_value
+
+
+def test_outline_replaces_large_fields_and_editing_restores_them():
+    raw = 'Zeile\n' * 5000
+    item = compact_value({'name': 'Import', 'raw_content': raw, 'abschnitte': [{'code': 'x' * 3000}]}, 'beispiele')
+    outline, fields = render_outline(item)
+    assert len(outline) < 500 and 'Import' in outline
+    assert {field.path: field.value for field in fields}['raw_content'] is raw
+    assert sorted(field.path for field in fields) == ['abschnitte[0].code', 'raw_content']
+
+    edited = yaml.safe_load(outline.replace('name: Import', 'name: Umbenannt'))
+    restored = restore_large_fields(edited, fields)
+    assert restored['name'] == 'Umbenannt'
+    assert restored['raw_content'] is raw and restored['abschnitte'][0]['code'] == 'x' * 3000
+
+    # Kommas im Feldnamen bleiben im Platzhalter erhalten
+    _, fields = render_outline({'a,b': raw})
+    assert fields[0].placeholder == '⟪a,b: 30.000 Zeichen⟫'
+
+
+def test_field_stream_delivers_chunks_up_to_limit():
+    _, fields = render_outline({'a': 'abc\n' * 1000, 'b': 'y' * 5000}, limit=100)
+    stream = FieldStream(fields, chunk_chars=1000, limit=3000)
+    chunks = []
+    while not stream.exhausted:
+        chunks.append(stream.next_chunk())
+    kinds = [kind for _, kind, _ in chunks]
+    assert kinds[0] == 'header' and kinds.count('header') == 2 and kinds.count('more') == 2
+    first_field = ''.join(text for number, kind, text in chunks if number == 0 and kind == 'text')
+    assert first_field == ('abc\n' * 1000)[:3000] and all(len(text) <= 1000 for _, _, text in chunks)
+    assert stream.next_chunk() is None
+
+
+def test_pager_pages_cover_text_and_search_wraps():
+    text = ''.join(f'Zeile {i}\n' for i in range(10000))
+    pager = TextPager(text, page_chars=4096)
+    assert ''.join(pager.page(n) for n in range(pager.page_count)) == text
+    assert all(pager.page(n).endswith('\n') for n in range(pager.page_count))
+    position = pager.find('ZEILE 9999')
+    assert text[position:position + 10] == 'Zeile 9999'
+    assert pager.page_of(position) == pager.page_count - 1
+    assert pager.find('Zeile 1\n', start=len(text) - 5) == len('Zeile 0\n')
+    assert TextPager('').page_count == 1
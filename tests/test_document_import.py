@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import codebook_document_import
+from codebook_document_import import DocumentSplitter, candidate_item, iter_pages, split_pages
+from codebook_life_gui import CodebookLIFEAssistant
+
+SLIDES = """--- Folie 1 ---
+# Rollen im LIFE Framework
+Der Product Owner trägt die Verantwortung für das Backlog.
+
+2. Daily Standup
+Ablauf: jeder Schritt im Team wird kurz besprochen.
+1. Was habe ich gestern gemacht
+2. Was mache ich heute
+--- Folie 2 ---
+weiter mit dem Daily: der Workflow endet nach 15 Minuten.
+
+LESSONS LEARNED
+Erfahrung: gelernt haben wir, dass Fehler früh sichtbar werden müssen.
+2
+"""
+
+
+def test_pages_and_headings():
+    assert split_pages("Seite eins\fSeite zwei\f") == ["Seite eins", "Seite zwei"]
+    pages = split_pages(SLIDES)
+    assert len(pages) == 2 and "Folie" not in pages[0]
+
+    splitter = DocumentSplitter("Schulung")
+    first, second = splitter.split(1, pages[0]), splitter.split(2, pages[1])
+    assert [c['title'] for c in first] == ['Rollen im LIFE Framework', 'Daily Standup']
+    # Nummerierte Liste bleibt im Text, kein eigener Kandidat
+    assert '2. Was mache ich heute' in first[1]['text']
+    assert [c['title'] for c in second] == ['Daily Standup (Forts.)', 'Lessons Learned']
+    assert second[0]['continued'] and second[1]['page'] == 2
+    # Seitenzahl im Fußbereich gehört nicht zum Text
+    assert not second[1]['text'].endswith('2')
+
+    untitled = DocumentSplitter("Notizen").split(3, "Nur ein Absatz ohne jede Überschrift darin.")
+    assert untitled[0]['title'] == 'Notizen, Seite 3'
+
+
+def test_parallel_extraction_keeps_page_order(tmp_path, monkeypatch):
+    path = tmp_path / "export.txt"
+    path.write_text("\f".join(f"# Abschnitt {n}\nInhalt der Seite {n} mit genug Text." for n in range(10)),
+                    encoding='utf-8')
+    serial = list(iter_pages(str(path), parallel=False))
+    monkeypatch.setattr(codebook_document_import.TextDocument, 'parallel', True)
+    monkeypatch.setattr(codebook_document_import, 'PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(codebook_document_import, 'PAGES_PER_TASK', 3)
+    assert list(iter_pages(str(path), workers=2)) == serial
+    assert [number for number, _, _ in serial] == list(range(10))
+
+
+def test_assistant_streams_classified_candidates(tmp_path):
+    path = tmp_path / "folien.txt"
+    path.write_text(SLIDES, encoding='utf-8')
+    assistant = CodebookLIFEAssistant(tmp_path / "codebook")
+
+    pages = list(assistant.import_document(str(path), parallel=False))
+    assert [(page, count) for page, count, _ in pages] == [(1, 2), (2, 2)]
+    candidates = [candidate for _, _, page_candidates in pages for candidate in page_candidates]
+    assert all(candidate['suggested_category'] for candidate in candidates)
+    assert candidates[0]['suggested_category'] == 'rollen'
+
+    item = candidate_item(candidates[-1], str(path))
+    assistant.add_item_to_category(candidates[-1]['suggested_category'], item)
+    stored = assistant.get_category_items(candidates[-1]['suggested_category'])[-1]
+    assert stored['name'] == 'Lessons Learned' and stored['original_page'] == 2
+
+
+def test_pdf_requires_pypdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(codebook_document_import, 'PdfReader', None)
+    with pytest.raises(RuntimeError):
+        list(iter_pages(str(tmp_path / "handbuch.pdf")))
@@ -0,0 +1,48 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def test_undo_redo_item_changes(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'alt'})
+    assistant.add_item_to_category('regeln', {'id': 'R2', 'text': 'zwei'})
+    assistant.update_item_in_category('regeln', 0, {'id': 'R1', 'text': 'neu'})
+    assistant.delete_item_from_category('regeln', 0)
+    assert [i['id'] for i in assistant.get_category_items('regeln')] == ['R2']
+
+    assert assistant.undo()  # Löschen rückgängig, Position bleibt erhalten
+    assert assistant.get_category_items('regeln')[0] == {'id': 'R1', 'text': 'neu'}
+    assert assistant.undo()  # Bearbeiten rückgängig
+    assert assistant.get_category_items('regeln')[0]['text'] == 'alt'
+    assert assistant.find_referencing_items('regeln', 'R1') == []
+
+    assert assistant.redo() and assistant.redo()
+    assert [i['id'] for i in assistant.get_category_items('regeln')] == ['R2']
+    assert not assistant.can_redo()
+
+    # Eine neue Änderung verwirft den Redo-Stack
+    assistant.undo()
+    assistant.add_item_to_category('regeln', {'id': 'R3'})
+    assert not assistant.can_redo()
+
+
+def test_undo_depth_and_categories(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path, undo_depth=2)
+    assistant.add_category('Rituale', 'Team-Rituale')
+    assistant.add_item_to_category('rituale', {'name': 'Retro'})
+    assistant.add_item_to_category('rituale', {'name': 'Daily'})
+
+    assert assistant.undo() and assistant.undo()
+    assert not assistant.undo()  # Nur zwei Schritte gespeichert
+    assert 'rituale' in assistant.get_framework_categories()
+
+    assistant.history.set_max_depth(10)
+    assistant.remove_category('rituale')
+    assert 'rituale' not in assistant.get_framework_categories()
+    assert assistant.undo()
+    assert assistant.framework_data['framework']['category_meta']['rituale']['description'] == 'Team-Rituale'
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import yaml
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_merge import merge_frameworks
+
+
+def test_merge_import_reports_conflicts(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Alt', 'kontext': 'Team A'})
+    assistant.add_item_to_category('regeln', {'id': 'R2', 'text': 'Gleich'})
+    assistant.add_category('Rituale', 'Team A')
+
+    imported = {'framework': {
+        'meta': {'name': 'Anderes Team'},
+        'regeln': [{'id': 'R1', 'text': 'Neu', 'beispiel': 'Demo'}, {'id': 'R2', 'text': 'Gleich'},
+                   {'id': 'R3', 'text': 'Zusatz'}],
+        'workshops': [{'name': 'Kickoff'}],
+        'category_meta': {'workshops': {'display_name': 'Workshops', 'custom': True}},
+    }}
+    import_file = tmp_path / 'team_b.yaml'
+    import_file.write_text(yaml.dump(imported, allow_unicode=True), encoding='utf-8')
+
+    report = assistant.merge_framework_from_yaml(str(import_file))
+    assert report['added'] == [('regeln', 'r3'), ('workshops', 'kickoff')]
+    assert report['updated'] == [('regeln', 'r1')]
+    assert report['conflicts'][0]['path'] == 'text'
+    assert assistant.get_category_items('regeln')[0] == {
+        'id': 'R1', 'text': 'Neu', 'kontext': 'Team A', 'beispiel': 'Demo'}
+    category_meta = assistant.framework_data['framework']['category_meta']
+    assert set(category_meta) == {'rituale', 'workshops'}
+    assert assistant.framework_data['framework']['meta']['name'] == 'LIFE'
+
+    # Der Merge ist ein einzelner Undo-Schritt
+    assert assistant.undo()
+    assert len(assistant.get_category_items('regeln')) == 2
+
+
+def test_merge_is_linear():
+    current = {'framework': {'regeln': [{'id': f'R{i}', 'text': 'a'} for i in range(50000)]}}
+    imported = {'framework': {'regeln': [{'id': f'R{i}', 'text': 'b' if i % 10 else 'a'}
+                                         for i in range(25000, 75000)]}}
+    start = time.perf_counter()
+    merged, report = merge_frameworks(current, imported, strategy='ours')
+    assert time.perf_counter() - start < 5
+    assert len(merged['framework']['regeln']) == 75000
+    assert len(report['added']) == 25000
+    assert len(report['conflicts']) == 22500
+
+
+def test_merge_import_applies_category_meta_only_changes(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Alt'})
+
+    import_file = tmp_path / 'meta.yaml'
+    import_file.write_text(yaml.dump({'framework': {
+        'regeln': [{'id': 'R1', 'text': 'Alt'}],
+        'category_meta': {'regeln': {'beschreibung': 'NEU'}},
+    }}, allow_unicode=True), encoding='utf-8')
+
+    report = assistant.merge_framework_from_yaml(str(import_file))
+    assert report['meta_updated'] == ['regeln'] and not report['conflicts']
+    assert assistant.framework_data['framework']['category_meta']['regeln'] == {'beschreibung': 'NEU'}
@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+import tracemalloc
+
+import yaml
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_model import CompactItem, compact_framework, to_plain
+
+
+def test_compact_items_round_trip(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    item = {'id': 'USM', 'name': 'User Story Mapping', 'marker': [{'team_cohesion': 5}],
+            "do's": ['Nutzersicht'], 'regeln': [{'id': 'R1', 'text': '...'}]}
+    assistant.add_item_to_category('prinzipien', item)
+
+    stored = assistant.get_category_items('prinzipien')[0]
+    assert isinstance(stored, CompactItem)
+    assert stored == item and stored['marker'][0]['team_cohesion'] == 5
+    stored['neues_feld'] = 'x'
+    assert stored['neues_feld'] == 'x'
+    del stored['neues_feld']
+
+    reloaded = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assert to_plain(reloaded.get_category_items('prinzipien')[0]) == item
+    assert list(reloaded.get_category_items('prinzipien')[0]) == list(item)
+    with open(tmp_path / 'life_framework.yaml', encoding='utf-8') as f:
+        assert yaml.safe_load(f)['framework']['prinzipien'] == [item]
+
+
+def test_compact_items_use_less_memory():
+    framework = {'framework': {
+        'regeln': [{'id': f'R{i}', 'text': 'Immer aus Nutzersicht', 'kontext': 'Team', 'beispiel': ''}
+                   for i in range(2000)],
+        'prinzipien': [{'id': f'P{i}', 'name': f'Prinzip {i}', 'regeln': [{'id': 'R1', 'text': '...'}],
+                        'marker': [{'team_cohesion': 4}]} for i in range(2000)],
+    }}
+    text = json.dumps(framework)
+
+    sizes = []
+    for compact in (False, True):
+        tracemalloc.start()
+        data = json.loads(text)
+        if compact:
+            compact_framework(data)
+        sizes.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del data
+
+    assert sizes[1] < 0.7 * sizes[0]
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_query import QueryError, is_query
+
+
+def _assistant(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('prinzipien', {'name': 'Teamarbeit', 'marker': [{'team_cohesion': 5}, {'mutual_dependency': 'ja'}]})
+    assistant.add_item_to_category('prinzipien', {'name': 'Einzelarbeit', 'marker': [{'team_cohesion': 2}]})
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Immer testen', 'beispiel': ''})
+    assistant.add_item_to_category('regeln', {'id': 'R2', 'text': 'Klein schneiden', 'beispiel': 'Story Splitting'})
+    assistant.add_item_to_category('open_questions', {'frage': 'Wer entscheidet?', 'priorität': 'Hoch'})
+    return assistant
+
+
+def _names(results):
+    return [(r['category'], r['index']) for r in results]
+
+
+def test_queries_on_fields_and_markers(tmp_path):
+    assistant = _assistant(tmp_path)
+    assert _names(assistant.query_framework('prinzipien where team_cohesion >= 4')) == [('prinzipien', 0)]
+    assert _names(assistant.query_framework('regeln ohne beispiel')) == [('regeln', 0)]
+    assert _names(assistant.query_framework('open_questions wo prioritaet = hoch')) == [('open_questions', 0)]
+    assert _names(assistant.query_framework('* where name ~ arbeit und team_cohesion < 3')) == [('prinzipien', 1)]
+    assert is_query('regeln where id = R1') and not is_query('Teamarbeit')
+    # Freitext mit "mit"/"ohne" bleibt ein Suchbegriff
+    categories = assistant.get_framework_categories()
+    assert is_query('regeln, prinzipien ohne beispiel', categories)
+    assert not is_query('Arbeit mit Team', categories)
+    assert not is_query('Lösung ohne Konflikt', categories)
+    with pytest.raises(QueryError):
+        assistant.query_framework('regeln where id')
+    with pytest.raises(QueryError):
+        assistant.query_framework('unbekannt where id = 1')
+
+
+def test_planner_uses_incrementally_maintained_indexes(tmp_path):
+    assistant = _assistant(tmp_path)
+    assistant.create_query_index('prinzipien', 'team_cohesion', kind='sorted')
+    assistant.create_query_index('regeln', 'id')
+    assert 'index:sorted' in assistant.explain_query('prinzipien where team_cohesion > 3')
+    assert 'index:hash' in assistant.explain_query('regeln where id = r2 and text ~ klein')
+    assert 'Scan' in assistant.explain_query('regeln where text ~ klein')
+
+    assistant.insert_item_into_category('prinzipien', 0, {'name': 'Vertrauen', 'marker': [{'team_cohesion': 4}]})
+    assert _names(assistant.query_framework('prinzipien where team_cohesion > 3')) == [('prinzipien', 0), ('prinzipien', 1)]
+    assistant.update_item_in_category('regeln', 1, {'id': 'R3', 'text': 'Klein schneiden'})
+    assert assistant.query_framework('regeln where id = R2') == []
+    assert _names(assistant.query_framework('regeln where id = r3')) == [('regeln', 1)]
+    assistant.delete_item_from_category('regeln', 0)
+    assert _names(assistant.query_framework('regeln where id = R3')) == [('regeln', 0)]
+
+    assert assistant.drop_query_index('regeln', 'id')
+    assert assistant.list_query_indexes() == [('prinzipien', 'team_cohesion', 'sorted')]
+
+
+def test_index_positions_follow_appends_and_deletes(tmp_path):
+    assistant = _assistant(tmp_path)
+    for i in range(5000):
+        assistant.framework_data['framework']['regeln'].append({'id': f'B{i}', 'stufe': i % 100})
+    assistant.create_query_index('regeln', 'stufe', kind='sorted')
+    assert len(assistant.query_framework('regeln where stufe >= 99')) == 50
+
+    assistant.add_item_to_category('regeln', {'id': 'NEU', 'stufe': 500})
+    last = len(assistant.get_category_items('regeln')) - 1
+    assert _names(assistant.query_framework('regeln where stufe > 100')) == [('regeln', last)]
+    assistant.delete_item_from_category('regeln', 0)
+    assert _names(assistant.query_framework('regeln where stufe > 100')) == [('regeln', last - 1)]
@@ -0,0 +1,45 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def _assistant(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Immer aus Nutzersicht'})
+    assistant.add_item_to_category('prinzipien', {
+        'id': 'USM', 'name': 'User Story Mapping',
+        'regeln': [{'id': 'R1', 'text': '...'}, {'id': 'R2', 'text': '...'}],
+    })
+    assistant.add_item_to_category('prozesse', {'name': 'Refinement', 'beteiligte': ['Product Owner']})
+    return assistant
+
+
+def test_reverse_lookup_and_dangling(tmp_path):
+    assistant = _assistant(tmp_path)
+    assert assistant.find_referencing_items('regeln', 'R1') == [('prinzipien', 'usm')]
+    dangling = set(assistant.find_dangling_references())
+    assert dangling == {(('prinzipien', 'usm'), ('regeln', 'r2')),
+                        (('prozesse', 'refinement'), ('rollen', 'product owner'))}
+
+    # Inkrementelle Pflege: neue Rolle löst die Referenz auf
+    assistant.add_item_to_category('rollen', {'name': 'Product Owner'})
+    assert (('prozesse', 'refinement'), ('rollen', 'product owner')) not in assistant.find_dangling_references()
+
+    assistant.delete_item_from_category('prinzipien', 0)
+    assert assistant.find_referencing_items('regeln', 'R1') == []
+    assert len(assistant.find_dangling_references()) == 0
+
+
+def test_transitive_impact(tmp_path):
+    assistant = _assistant(tmp_path)
+    assistant.add_item_to_category('transferbeispiele', {'kontext': 'Behörde', 'regel': 'R1'})
+    assistant.update_item_in_category('prinzipien', 0, {
+        'id': 'USM', 'regeln': [{'id': 'R1'}], 'transferbeispiele': [{'kontext': 'Behörde'}],
+    })
+    impact = assistant.get_change_impact('regeln', 'R1')
+    assert impact == {('prinzipien', 'usm'): 1, ('transferbeispiele', 'behörde'): 1}
+    assert assistant.get_change_impact('transferbeispiele', 'Behörde') == {('prinzipien', 'usm'): 1}
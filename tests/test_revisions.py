@@ -0,0 +1,45 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def test_revisions_share_unchanged_items(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    for i in range(20):
+        assistant.add_item_to_category('regeln', {'id': f'R{i}', 'text': f'Regel {i}'})
+    first = assistant.create_revision('Start')
+    objects_before = len(list((tmp_path / 'revisions' / 'objects').rglob('*.json')))
+
+    assistant.update_item_in_category('regeln', 3, {'id': 'R3', 'text': 'Regel drei'})
+    assistant.delete_item_from_category('regeln', 0)
+    assistant.add_item_to_category('rollen', {'name': 'Coach'})
+    second = assistant.create_revision('Änderungen')
+    objects_after = len(list((tmp_path / 'revisions' / 'objects').rglob('*.json')))
+    # Nur geänderte/neue Items plus Manifest werden neu abgelegt
+    assert objects_after - objects_before == 3
+
+    diff = assistant.diff_revisions(first['id'], second['id'])
+    assert [(e['category'], e['key']) for e in diff['added']] == [('rollen', 'coach')]
+    assert [(e['category'], e['key']) for e in diff['removed']] == [('regeln', 'r0')]
+    assert diff['changed'] == [{'category': 'regeln', 'key': 'r3',
+                                'changes': [('text', 'Regel 3', 'Regel drei')]}]
+
+
+def test_compare_and_restore(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('prinzipien', {'id': 'USM', 'name': 'User Story Mapping'})
+    revision = assistant.create_revision()
+    assistant.update_item_in_category('prinzipien', 0, {'id': 'USM', 'name': 'Story Mapping'})
+
+    diff = assistant.compare_with_revision(revision['id'][:6])
+    assert diff['changed'][0]['changes'] == [('name', 'User Story Mapping', 'Story Mapping')]
+
+    assistant.restore_revision(revision['id'])
+    assert assistant.get_category_items('prinzipien')[0]['name'] == 'User Story Mapping'
+    assert assistant.compare_with_revision(revision['id'])['changed'] == []
+    assert assistant.undo()
+    assert assistant.get_category_items('prinzipien')[0]['name'] == 'Story Mapping'
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_search import FuzzyIndex, normalize_text, substring_distance
+
+
+def test_normalization_and_distance():
+    assert normalize_text('Übertragung Größe Café') == 'uebertragung groesse cafe'
+    assert substring_distance('loesung', 'problemloesung', 1) == 0
+    assert substring_distance('loesnug', 'loesung', 1) == 1  # Vertauschung
+    assert substring_distance('lasong', 'loesung', 1) is None
+
+
+def test_fuzzy_search_is_incremental(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('prinzipien', {'name': 'Problemlösung', 'beschreibung': 'Gemeinsam lösen'})
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Übertragung in neue Kontexte'})
+
+    assert [r['category'] for r in assistant.fuzzy_search_in_framework('Loesung')] == ['prinzipien']
+    result = assistant.fuzzy_search_in_framework('ubertragnug kontext')
+    assert [(r['category'], r['index']) for r in result] == [('regeln', 0)]
+    assert result[0]['score'] < 1
+
+    assistant.add_item_to_category('regeln', {'id': 'R2', 'text': 'Lösungen dokumentieren'})
+    assert len(assistant.fuzzy_search_in_framework('lösung')) == 2
+    assistant.delete_item_from_category('regeln', 0)
+    assert assistant.fuzzy_search_in_framework('Übertragung') == []
+    assert assistant.fuzzy_search_in_framework('lösungen')[0]['index'] == 0
+
+
+def test_fuzzy_search_latency_on_100k_items():
+    words = ['team', 'arbeit', 'loesung', 'uebertragung', 'kontext', 'prozess', 'rolle', 'regel']
+    index = FuzzyIndex()
+    for i in range(100000):
+        index.add_item('regeln', i, {'id': f'R{i}', 'text': f'{words[i % 8]} {words[(i // 8) % 8]} nummer{i % 1000}'})
+    index.search('team')  # baut die Positionen einmal auf
+
+    # Anhängen und Löschen am Ende halten die Positionen aktuell
+    index.add_item('regeln', 100000, {'id': 'NEU', 'text': 'Übertragung neu'})
+    index.remove_item('regeln', 100000)
+    index.add_item('regeln', 100000, {'id': 'NEU2', 'text': 'Zwischenstand einmalig'})
+
+    durations = []
+    for query in ['Übertragnug', 'team loesung', 'nummer42', 'prozes rolle', 'zwischenstnad']:
+        start = time.perf_counter()
+        results = index.search(query)
+        durations.append(time.perf_counter() - start)
+        assert results
+    assert sorted(durations)[len(durations) // 2] < 0.05
+    assert [(r['index'], r['item']['id']) for r in index.search('zwischenstnad')] == [(100000, 'NEU2')]
+
+    # Einfügen in der Mitte verschiebt die Positionen dahinter
+    index.add_item('regeln', 0, {'id': 'ERST', 'text': 'Anfang'})
+    assert index.search('zwischenstand')[0]['index'] == 100001
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip('numpy')
+
+from codebook_life_gui import CodebookLIFEAssistant
+
+
+def _assistant(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('transferbeispiele', {'kontext': 'Behörde', 'beschreibung': 'Nutzerbedürfnisse im Workshop sammeln und priorisieren'})
+    assistant.add_item_to_category('transferbeispiele', {'kontext': 'Startup', 'beschreibung': 'Finanzierung über Investoren planen'})
+    assistant.add_item_to_category('semantic_gaps', {'beschreibung': 'Priorisieren der Nutzerbedürfnisse bleibt unklar'})
+    return assistant
+
+
+def test_similar_items_and_incremental_updates(tmp_path):
+    assistant = _assistant(tmp_path)
+    results = assistant.find_similar_items('transferbeispiele', 0)
+    assert [(r['category'], r['index']) for r in results] == [('semantic_gaps', 0)]
+
+    assistant.add_item_to_category('transferbeispiele', {'kontext': 'Verein', 'beschreibung': 'Investoren und Finanzierung'})
+    batch = assistant.find_similar_items_batch([('transferbeispiele', 1), ('semantic_gaps', 0)], top_k=1)
+    assert batch[0][0]['item']['kontext'] == 'Verein'
+    assert batch[1][0]['item']['kontext'] == 'Behörde'
+
+    assistant.delete_item_from_category('transferbeispiele', 0)
+    assert assistant.find_similar_items('semantic_gaps', 0) == []
+    assert assistant.find_similar_to_text('Investoren planen', categories=['transferbeispiele'])[0]['index'] == 0
+
+
+def test_vectors_are_persisted(tmp_path):
+    assistant = _assistant(tmp_path)
+    assistant.get_similarity_index()
+    assert assistant.vectors_file.exists()
+
+    reloaded = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assert reloaded.get_similarity_index().modified is False
+    assert reloaded.find_similar_items('semantic_gaps', 0)[0]['item']['kontext'] == 'Behörde'
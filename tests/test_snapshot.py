@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_snapshot import Snapshot, SnapshotError, compile_snapshot
+
+
+def _assistant(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('prinzipien', {'name': 'Teamarbeit', 'marker': [{'team_cohesion': 5}, {'mutual_dependency': 'ja'}],
+                                                  'gewicht': 0.5, 'aktiv': True, 'ersetzt': None})
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Immer testen', 'beispiel': ''})
+    assistant.add_item_to_category('regeln', {'id': 'R2', 'text': 'Lösungen klein schneiden'})
+    return assistant
+
+
+def test_snapshot_round_trips_items_and_sections(tmp_path):
+    framework = {'framework': {'meta': {'name': 'LIFE', 'version': '1.0'},
+                               'regeln': [{'id': 'R1', 'zahl': -3, 'liste': ['a', {'b': [1.5, None]}]}, 'nur Text'],
+                               'leer': []}}
+    path = tmp_path / 'test.snapshot'
+    info = compile_snapshot(framework, path)
+    assert info['items'] == 2
+    snapshot = Snapshot(path)
+    assert list(snapshot.framework) == ['meta', 'regeln', 'leer']
+    assert snapshot.framework['meta'] == {'name': 'LIFE', 'version': '1.0'}
+    assert list(snapshot.framework['regeln']) == framework['framework']['regeln']
+    assert snapshot.framework['regeln'][-1] == 'nur Text' and len(snapshot.framework['leer']) == 0
+    with pytest.raises(IndexError):
+        snapshot.framework['regeln'][2]
+    snapshot.close()
+
+    (tmp_path / 'kaputt.snapshot').write_bytes(b'kein snapshot')
+    with pytest.raises(SnapshotError):
+        Snapshot(tmp_path / 'kaputt.snapshot')
+
+
+def test_read_only_assistant_searches_queries_and_refuses_changes(tmp_path):
+    writer = _assistant(tmp_path)
+    writer.compile_snapshot()
+    assert writer.is_snapshot_current()
+
+    reader = CodebookLIFEAssistant(codebook_directory=tmp_path, snapshot=writer.snapshot_file)
+    assert reader.get_framework_categories() == writer.get_framework_categories()
+    assert reader.get_category_items('prinzipien')[0] == dict(writer.get_category_items('prinzipien')[0])
+    assert [(r['category'], r['index']) for r in reader.fuzzy_search_in_framework('loesung')] == [('regeln', 1)]
+    assert [(r['category'], r['index']) for r in reader.search_in_framework('testen')] == [('regeln', 0)]
+    assert [r['index'] for r in reader.query_framework('prinzipien where team_cohesion >= 4')] == [0]
+    assert reader.analyze_framework_structure()['total_items'] == 3
+    with pytest.raises(RuntimeError):
+        reader.add_item_to_category('regeln', {'id': 'R3'})
+    assert len(reader.get_category_items('regeln')) == 2
+
+    writer.add_item_to_category('regeln', {'id': 'R3', 'text': 'Neu'})
+    assert not reader.is_snapshot_current()
+    reader.close()
+
+
+def test_read_only_assistant_writes_nothing(tmp_path):
+    writer = _assistant(tmp_path)
+    writer.compile_snapshot()
+    writer.create_revision('Start')
+    writer.close()
+    before = sorted(path.relative_to(tmp_path) for path in tmp_path.rglob('*'))
+
+    reader = CodebookLIFEAssistant(codebook_directory=tmp_path, snapshot=writer.snapshot_file)
+    # Kategorien des Snapshots werden als Item-Listen erfasst, nicht als ein Item
+    assert reader.revisions.build_manifest(reader.framework_data) == writer.revisions.build_manifest(writer.framework_data)
+    assert reader.compare_with_revision(writer.list_revisions()[-1]['id'])['changed'] == []
+    with pytest.raises(RuntimeError):
+        reader.start_watching()
+    if importlib.util.find_spec('numpy') is not None:
+        reader.find_similar_to_text('Lösungen schneiden')
+    reader.close()
+    assert sorted(path.relative_to(tmp_path) for path in tmp_path.rglob('*')) == before
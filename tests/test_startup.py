@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_startup import StartupTimer
+
+
+def test_deferred_loading_by_section(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1', 'text': 'Übertragung prüfen'})
+
+    deferred = CodebookLIFEAssistant(codebook_directory=tmp_path, load=False)
+    assert not deferred.loaded and deferred.get_framework_categories() == []
+    # Ein vor dem Laden gebauter Index erfährt über die Listener von den Abschnitten
+    assert deferred.fuzzy_search_in_framework('Übertragung') == []
+
+    sections = list(deferred.iter_framework_file())
+    assert sections[0][0] == 'meta' and deferred.get_framework_categories() == []
+    for name, value in sections:
+        deferred.apply_loaded_section(name, value)
+    assert not deferred.undo()
+    deferred.finish_loading()
+
+    assert deferred.framework_data == assistant.framework_data
+    assert deferred.fuzzy_search_in_framework('Übertragung')[0]['category'] == 'regeln'
+    assert not deferred.can_undo()
+
+
+def test_startup_report():
+    timer = StartupTimer()
+    timer.mark('Modul-Import')
+    timer.mark('Daten bereit')
+    assert [name for name, _ in timer.phases()][-2:] == ['Modul-Import', 'Daten bereit']
+    assert timer.report().startswith('⏱️ Start: ')
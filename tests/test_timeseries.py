@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip('numpy')
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_timeseries import AssessmentStore
+
+
+def test_rounds_are_appended_and_validated():
+    store = AssessmentStore()
+    store.add_round('2025-Q1', {'Alpha': {'transparency_level': 2, 'mutual_dependency': 'ja'},
+                                'Beta': {'transparency_level': 4, 'decision_speed': '3 Tage'}})
+    store.add_round('2025-Q2', {'Gamma': {'transparency_level': 5}})
+    assert store.projects == ['Alpha', 'Beta', 'Gamma'] and store.rounds == ['2025-Q1', '2025-Q2']
+    assert np.isnan(store.series('transparency_level', 'Gamma')[0])
+    assert store.series('mutual_dependency', 'Alpha')[0] == 1.0
+    assert store.series('decision_speed', 'Beta')[0] == 3.0
+    with pytest.raises(ValueError):
+        store.add_round('2025-Q3', {'Alpha': {'transparency_level': 9}})
+    with pytest.raises(ValueError):
+        store.add_round('2025-Q2', {'Alpha': {'transparency_level': 3}})
+    with pytest.raises(ValueError):
+        store.add_round_columns('2025-Q3', ['Alpha'], {'transparency_level': [1, 2]})
+    assert store.rounds == ['2025-Q1', '2025-Q2']
+
+
+def test_rolling_means_deltas_and_trends():
+    store = AssessmentStore()
+    projects = [f'P{i}' for i in range(200)]
+    for round_number in range(6):
+        values = np.full(200, 3.0)
+        values[0] = 1 + round_number * 0.5           # steigt
+        values[1] = 5 - round_number * 0.5           # fällt
+        if round_number == 2:
+            values[2] = np.nan                       # fehlt in einer Runde
+        store.add_round_columns(f'R{round_number}', projects, {'autonomy_degree': values})
+
+    means = store.rolling_mean('autonomy_degree', window=3, projects=['P0', 'P2'])
+    assert means[:, 0].tolist() == pytest.approx([1.0, 1.25, 1.5, 2.0, 2.5, 3.0])
+    assert means[3, 1] == 3.0
+    deltas = store.deltas('autonomy_degree', projects=['P0', 'P2'])
+    assert np.isnan(deltas[0]).all() and deltas[1, 0] == 0.5 and np.isnan(deltas[3, 1])
+    slopes = store.trend('autonomy_degree', window=4)
+    assert slopes[0] == pytest.approx(0.5) and slopes[1] == pytest.approx(-0.5) and slopes[5] == 0
+    assert [r['project'] for r in store.trend_query('autonomy_degree', window=4)] == ['P0']
+    assert store.trend_query('autonomy_degree', window=4, direction='down')[0] == \
+        {'project': 'P1', 'slope': -0.5, 'latest': 2.5}
+
+
+def test_rounds_are_persisted_in_codebook_data(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.record_assessment_round('R1', {'Alpha': {'meeting_frequency': 2}, 'Beta': {'meeting_frequency': 4}})
+    assistant.record_assessment_round('R2', {'Alpha': {'meeting_frequency': 3}})
+    assert (tmp_path / 'assessments.npz').exists()
+
+    reopened = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    store = reopened.get_assessment_store()
+    assert store.rounds == ['R1', 'R2'] and store.projects == ['Alpha', 'Beta']
+    assert store.matrix('meeting_frequency')[1].tolist()[0] == 3.0
+    assert reopened.get_indicator_trends('meeting_frequency', window=2)[0]['project'] == 'Alpha'
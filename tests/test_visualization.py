@@ -0,0 +1,42 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_visualization import build_tree, compute_layout, LayoutWorker
+
+
+def _framework():
+    return {'framework': {
+        'meta': {'name': 'LIFE'},
+        'prinzipien': [{'name': 'Teamarbeit', 'marker': [{'team_cohesion': 5}],
+                        'regeln': [{'id': 'R1', 'text': '...'}]}],
+        'rollen': [],
+    }}
+
+
+def test_tree_and_layout():
+    tree = build_tree(_framework())
+    assert 'team_cohesion = 5' in tree.labels
+    layout = compute_layout(tree)
+    # Eltern liegen mittig über ihren Kindern, Blätter auf eigenen Zeilen
+    for node, children in enumerate(tree.children):
+        if children:
+            assert layout.ys[node] == (layout.ys[children[0]] + layout.ys[children[-1]]) / 2
+    assert set(layout.visible_nodes(-1, layout.height)) == set(range(len(tree)))
+
+
+def test_headless_export_and_worker(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.framework_data = _framework()
+    svg = assistant.export_framework_visualization('structure.svg')
+    dot = assistant.export_framework_visualization('structure.dot', fmt='dot')
+    assert '<svg' in Path(svg).read_text(encoding='utf-8')
+    assert 'digraph' in Path(dot).read_text(encoding='utf-8')
+
+    worker = LayoutWorker(assistant.framework_data).start()
+    layout = worker.results.get(timeout=5)
+    assert len(layout.tree) == len(build_tree(assistant.framework_data))
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+import yaml
+
+# Ensure repository root is on PYTHONPATH for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codebook_life_gui import CodebookLIFEAssistant
+from codebook_watch import FileWatcher
+
+
+def _write_external(assistant, mutate):
+    with open(assistant.framework_file, encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    mutate(data['framework'])
+    time.sleep(0.01)  # mtime muss sich vom letzten Speichern unterscheiden
+    with open(assistant.framework_file, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+
+def test_external_changes_are_applied_incrementally(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    for i in range(5):
+        assistant.add_item_to_category('regeln', {'id': f'R{i}', 'text': 'x'})
+    assistant.add_item_to_category('prinzipien', {'id': 'USM', 'regeln': [{'id': 'R9'}]})
+    assert assistant.check_external_changes() is None  # Eigenes Speichern wird ignoriert
+    untouched = assistant.get_category_items('regeln')[4]
+
+    def mutate(framework):
+        framework['regeln'].insert(0, {'id': 'R9', 'text': 'neu'})
+        framework['regeln'][2]['text'] = 'geändert'
+        del framework['regeln'][4]
+        framework['rollen'].append({'name': 'Coach'})
+
+    _write_external(assistant, mutate)
+    update = assistant.check_external_changes()
+    assert sorted(c.action for c in update['changes']) == ['add', 'add', 'delete', 'update']
+    assert assistant.apply_external_changes(update)
+
+    regeln = assistant.get_category_items('regeln')
+    assert [r['id'] for r in regeln] == ['R9', 'R0', 'R1', 'R2', 'R4']
+    assert regeln[2]['text'] == 'geändert'
+    assert regeln[4] is untouched  # Unveränderte Items bleiben dieselben Objekte
+    assert assistant.find_dangling_references() == []
+    assert assistant.check_external_changes() is None
+
+
+def test_stale_update_is_rejected(tmp_path):
+    assistant = CodebookLIFEAssistant(codebook_directory=tmp_path)
+    assistant.add_item_to_category('regeln', {'id': 'R1'})
+    _write_external(assistant, lambda framework: framework['regeln'].append({'id': 'R2'}))
+    update = assistant.check_external_changes()
+    assistant.framework_data['framework']['rollen'] = []
+    assistant.add_item_to_category('rollen', {'name': 'PO'})  # lokale Änderung dazwischen
+    assert not assistant.apply_external_changes(update)
+
+
+def test_polling_watcher_detects_change(tmp_path):
+    target = tmp_path / 'watched.yaml'
+    target.write_text('a: 1\n', encoding='utf-8')
+    events = []
+    watcher = FileWatcher(target, lambda: events.append(1), interval=0.05, use_inotify=False).start()
+    try:
+        time.sleep(0.1)
+        target.write_text('a: 22\n', encoding='utf-8')
+        deadline = time.time() + 3
+        while not events and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    assert events